@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark for ANSI escape sequence removal in captured output.
+
+Compares the previous behaviour (regex substitution on every fragment), the
+ESC fast path in front of the precompiled regex (what LogCapture uses), and a
+hand-written scanner for CSI/Fe sequences that was evaluated as an alternative
+engine. Every candidate is checked for equivalence with the regex first.
+
+Usage:
+    python benchmarks/bench_ansi_strip.py [--iterations N]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the package to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simple_global_logging.capture import ANSI_ESCAPE, remove_ansi_codes
+
+
+def scan_ansi_codes(text):
+    """Hand-written scanner equivalent to ANSI_ESCAPE.sub('', text)."""
+    i = text.find('\x1b')
+    if i < 0:
+        return text
+    parts = []
+    start = 0
+    n = len(text)
+    while i >= 0:
+        j = i + 1
+        if j < n:
+            c = text[j]
+            if c == '[':
+                k = j + 1
+                while k < n and '0' <= text[k] <= '?':
+                    k += 1
+                while k < n and ' ' <= text[k] <= '/':
+                    k += 1
+                if k < n and '@' <= text[k] <= '~':
+                    parts.append(text[start:i])
+                    start = k + 1
+                    i = text.find('\x1b', start)
+                    continue
+            elif '@' <= c <= 'Z' or '\\' <= c <= '_':
+                parts.append(text[start:i])
+                start = j + 1
+                i = text.find('\x1b', start)
+                continue
+        i = text.find('\x1b', i + 1)
+    parts.append(text[start:])
+    return ''.join(parts)
+
+
+CANDIDATES = [
+    ("before: regex on every write", lambda text: ANSI_ESCAPE.sub('', text)),
+    ("after: ESC fast path + regex", remove_ansi_codes),
+    ("candidate: ESC fast path + scanner", scan_ansi_codes),
+]
+
+INPUTS = {
+    "plain": "worker heartbeat 1234 status=ok elapsed=0.53s queue=17\n",
+    "colourised": "\x1b[32mINFO\x1b[0m worker \x1b[1;31mERROR\x1b[0m status=\x1b[33mok\x1b[0m\n",
+    "progress bar": "".join(f"\r\x1b[K[{'#' * i}{'.' * (40 - i)}] {i * 2.5:.0f}%" for i in range(41)),
+}
+
+
+def check_equivalence(samples=20000):
+    """Check every candidate against the regex on the inputs and random escape-heavy text."""
+    rng = random.Random(0)
+    alphabet = ['\x1b', '[', ']', '0', '1', ';', '?', ' ', '/', '@', 'A', 'm', 'K', '\\', '_', '~', 'x', '\n']
+    texts = list(INPUTS.values())
+    texts += [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30))) for _ in range(samples)]
+    for label, func in CANDIDATES:
+        for text in texts:
+            expected = ANSI_ESCAPE.sub('', text)
+            if func(text) != expected:
+                raise AssertionError(f"{label} differs from the regex for {text!r}")
+
+
+def main():
+    """Run the ANSI removal benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200_000, help="Calls per input and candidate")
+    args = parser.parse_args()
+    
+    check_equivalence()
+    print("All candidates are equivalent to the regex\n")
+    
+    for name, text in INPUTS.items():
+        print(f"{name}:")
+        for label, func in CANDIDATES:
+            start = time.perf_counter()
+            for _ in range(args.iterations):
+                func(text)
+            per_call_ns = (time.perf_counter() - start) / args.iterations * 1e9
+            print(f"  {label:36s} {per_call_ns:8.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
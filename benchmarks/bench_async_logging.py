@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark for caller-side logging latency with direct and queued handlers.
+
+Measures how long logger.info() blocks the calling thread with setup_logging()
+(console and file handlers run in the caller) and with async_mode=True (the
+caller only enqueues the record), for 1, 8 and 32 logging threads. The console
+stream is redirected to os.devnull so terminal speed does not dominate.
+
+Without --fsync both modes are bound by the GIL, so the queue mostly moves the
+work rather than removing it. With --fsync every file write is synced to disk,
+which is where the queued mode keeps slow I/O out of the calling threads.
+
+Usage:
+    python benchmarks/bench_async_logging.py [--records N] [--threads 1,8,32] [--fsync]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add the package to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import simple_global_logging
+
+
+def percentile(sorted_values, fraction):
+    """Return the value at the given fraction of a sorted list."""
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def sync_file_writes(handlers):
+    """Make every FileHandler fsync after each record to simulate a slow disk."""
+    for handler in handlers:
+        if isinstance(handler, logging.FileHandler):
+            def flush(handler=handler, flush=handler.flush):
+                flush()
+                if handler.stream is not None:
+                    os.fsync(handler.stream.fileno())
+            handler.flush = flush
+
+
+def run(base_dir, async_mode, threads, records, fsync):
+    """Log records from several threads and return per-call latencies in microseconds and total seconds."""
+    simple_global_logging.setup_logging(base_dir=base_dir, async_mode=async_mode)
+    if fsync:
+        listener = simple_global_logging.core._queue_listener
+        sync_file_writes(listener.handlers if listener else logging.getLogger().handlers)
+    logger = simple_global_logging.get_logger("bench")
+    per_thread = records // threads
+    latencies = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads)
+    
+    def worker(samples):
+        barrier.wait()
+        clock = time.perf_counter
+        for i in range(per_thread):
+            start = clock()
+            logger.info("request handled id=%d status=ok elapsed=%.3f", i, 0.25)
+            samples.append((clock() - start) * 1e6)
+    
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(samples,)) for samples in latencies]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    simple_global_logging.flush_logging()
+    elapsed = time.perf_counter() - start
+    simple_global_logging.stop_logging()
+    
+    for handler in logging.getLogger().handlers[:]:
+        handler.close()
+        logging.getLogger().removeHandler(handler)
+    return sorted(sample for samples in latencies for sample in samples), elapsed
+
+
+def main():
+    """Run the async logging benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=50_000, help="Records per run, split across threads")
+    parser.add_argument("--threads", default="1,8,32", help="Comma-separated thread counts")
+    parser.add_argument("--fsync", action="store_true", help="Sync the log file after every record")
+    args = parser.parse_args()
+    
+    original_stderr = sys.stderr
+    with tempfile.TemporaryDirectory() as base_dir, open(os.devnull, 'w') as devnull:
+        for threads in (int(t) for t in args.threads.split(",")):
+            print(f"{threads} thread(s):", file=original_stderr)
+            for label, async_mode in (("before: direct handlers", False), ("after: async_mode=True", True)):
+                sys.stderr = devnull
+                try:
+                    latencies, elapsed = run(base_dir, async_mode, threads, args.records, args.fsync)
+                finally:
+                    sys.stderr = original_stderr
+                print(f"  {label:26s} p50 {percentile(latencies, 0.5):7.1f} us  "
+                      f"p99 {percentile(latencies, 0.99):8.1f} us  "
+                      f"total {len(latencies) / elapsed:9.0f} records/sec", file=original_stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the log file formats written by setup_logging.
+
+Logs the same records through a logger whose only handler writes the file in
+the "text" format (FileHandler + FastFormatter), the "jsonl" format and the
+"binary" format, and reports records/sec and bytes per record. Each handler
+flushes after every record, as setup_logging configures them.
+
+"logger" times logger.info() calls, "handler" only handler.handle() of records
+created beforehand, i.e. the cost of formatting and writing. The logger creates
+the same LogRecord for every format, which takes most of the time per call.
+
+Usage:
+    python benchmarks/bench_binary_log.py [--records N] [--repeat N]
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from datetime import timezone, timedelta
+from pathlib import Path
+
+# Add the package to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simple_global_logging.binary import BinaryLogHandler
+from simple_global_logging.formatters import FastFormatter, JsonLinesFormatter
+
+TZ = timezone(timedelta(hours=9))
+
+
+def text_handler(path):
+    """FileHandler with the verbose format, as in setup_logging(file_format="text")."""
+    handler = logging.FileHandler(path, encoding='utf-8')
+    handler.setFormatter(FastFormatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+                                       datefmt='%Y-%m-%d %H:%M:%S', tz=TZ))
+    return handler
+
+
+def jsonl_handler(path):
+    """FileHandler with JSON Lines, as in setup_logging(file_format="jsonl")."""
+    handler = logging.FileHandler(path, encoding='utf-8')
+    handler.setFormatter(JsonLinesFormatter(tz=TZ))
+    return handler
+
+
+def binary_handler(path):
+    """BinaryLogHandler, as in setup_logging(file_format="binary")."""
+    return BinaryLogHandler(path, tz=TZ)
+
+
+def run(make_handler, count):
+    """Log count records through a fresh handler; return records/sec and bytes/record."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.log"
+        handler = make_handler(path)
+        logger = logging.Logger("service.api")
+        logger.addHandler(handler)
+        start = time.perf_counter()
+        for i in range(count):
+            logger.info("request %d handled in %.3fs for user %s", i, 0.25, "alice")
+        elapsed = time.perf_counter() - start
+        handler.close()
+        return count / elapsed, path.stat().st_size / count
+
+
+def run_handler(make_handler, count):
+    """Pass count prepared records to a fresh handler; return records/sec."""
+    records = [logging.LogRecord("service.api", logging.INFO, __file__, 1,
+                                 "request %d handled in %.3fs for user %s", (i, 0.25, "alice"), None)
+               for i in range(count)]
+    with tempfile.TemporaryDirectory() as directory:
+        handler = make_handler(Path(directory) / "bench.log")
+        start = time.perf_counter()
+        for record in records:
+            handler.handle(record)
+        elapsed = time.perf_counter() - start
+        handler.close()
+        return count / elapsed
+
+
+def main():
+    """Run the log file format benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=50_000, help="Records per run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per format; the best is reported")
+    args = parser.parse_args()
+    
+    baseline = None
+    for label, make_handler in (("text", text_handler), ("jsonl", jsonl_handler), ("binary", binary_handler)):
+        rate, size = max(run(make_handler, args.records) for _ in range(args.repeat))
+        handler_rate = max(run_handler(make_handler, args.records) for _ in range(args.repeat))
+        baseline = baseline or (rate, handler_rate, size)
+        print(f"{label:8s} logger {rate:10,.0f} records/sec ({rate / baseline[0]:4.2f}x)  "
+              f"handler {handler_rate:10,.0f} records/sec ({handler_rate / baseline[1]:4.2f}x)  "
+              f"{size:6.1f} bytes/record ({size / baseline[2]:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark for captured print() throughput.
+
+Compares the previous LogCapture behaviour (open/write/close of the log file
+for every captured write) with the long-lived buffered writer, for each
+flush policy.
+
+Usage:
+    python benchmarks/bench_capture_write.py [--lines N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add the package to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simple_global_logging.capture import LogCapture
+
+
+class ReopeningCapture(LogCapture):
+    """LogCapture variant reproducing the previous open-per-write behaviour."""
+    
+    def write(self, text):
+        result = self.original_stream.write(text)
+        self.original_stream.flush()
+        if text.strip():
+            clean_text = self._remove_ansi_codes(text)
+            with self.lock:
+                with open(self.log_file_path, 'a', encoding='utf-8') as f:
+                    timestamp = datetime.now(self.timezone).strftime("%Y-%m-%d %H:%M:%S")
+                    f.write(f"[{timestamp}] STDOUT: {clean_text}")
+                    if not clean_text.endswith('\n'):
+                        f.write('\n')
+        return result
+
+
+def run(capture, lines):
+    """Print `lines` lines through `capture` and return prints per second."""
+    start = time.perf_counter()
+    for i in range(lines):
+        print("worker heartbeat", i, "status=ok", file=capture)
+    capture.close_log()
+    return lines / (time.perf_counter() - start)
+
+
+def main():
+    """Run the capture write benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000, help="Number of print() calls per case")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as temp_dir, open(os.devnull, 'w') as devnull:
+        cases = [
+            ("before: reopen per write", lambda path: ReopeningCapture(devnull, path, tz=timezone.utc)),
+            ("after: flush_policy=line", lambda path: LogCapture(devnull, path, tz=timezone.utc)),
+            ("after: flush_policy=interval", lambda path: LogCapture(devnull, path, tz=timezone.utc, flush_policy="interval")),
+            ("after: flush_policy=size", lambda path: LogCapture(devnull, path, tz=timezone.utc, flush_policy="size")),
+            ("after: async_capture=True", lambda path: LogCapture(devnull, path, tz=timezone.utc, async_capture=True)),
+        ]
+        baseline = None
+        for i, (label, factory) in enumerate(cases):
+            rate = run(factory(Path(temp_dir) / f"bench-{i}.log"), args.lines)
+            baseline = baseline or rate
+            print(f"{label:32s} {rate:12,.0f} prints/sec  ({rate / baseline:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark for multiprocess logging with and without the collector.
+
+Starts N worker processes (16 by default) that each log the same number of
+records, and reports total records/sec from the start signal until every record
+is in the log file:
+    - shared file: every worker appends to the same file with its own
+      logging.FileHandler, as when each worker calls setup_logging(filename=...)
+    - collector: the parent runs setup_logging(collector=True) and the workers'
+      setup_logging() forwards records in batches to it
+The file is checked for lost or torn lines afterwards. The collector moves
+formatting and writing into one process, so it needs spare cores for the
+workers to pay off in throughput.
+
+Usage:
+    python benchmarks/bench_collector.py [--workers N] [--records N] [--start-method fork|spawn|forkserver]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the package to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import simple_global_logging
+from simple_global_logging import core
+from simple_global_logging.formatters import FastFormatter
+
+LINE = re.compile(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d - INFO - worker\d+ - request \d+ handled in 0\.250s for user alice\Z")
+
+
+def shared_file_worker(path, index, count, ready, start):
+    """Worker appending to the shared log file directly."""
+    handler = logging.FileHandler(path, encoding='utf-8')
+    handler.setFormatter(FastFormatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+                                       datefmt='%Y-%m-%d %H:%M:%S'))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(logging.INFO)
+    log(index, count, ready, start)
+    handler.close()
+
+
+def collector_worker(path, index, count, ready, start):
+    """Worker forwarding to the parent's collector."""
+    simple_global_logging.setup_logging()
+    log(index, count, ready, start)
+    simple_global_logging.flush_logging()
+
+
+def log(index, count, ready, start):
+    """Log count records once the parent gives the start signal."""
+    logger = logging.getLogger(f"worker{index}")
+    ready.release()
+    start.wait()
+    for i in range(count):
+        logger.info("request %d handled in %.3fs for user %s", i, 0.25, "alice")
+
+
+def run(context, target, path, workers, count, done=None):
+    """Run the workers; return the seconds from the start signal until done() or the workers exit."""
+    ready = context.Semaphore(0)
+    start = context.Event()
+    processes = [context.Process(target=target, args=(path, index, count, ready, start)) for index in range(workers)]
+    for process in processes:
+        process.start()
+    for _ in processes:
+        ready.acquire()
+    
+    began = time.perf_counter()
+    start.set()
+    for process in processes:
+        process.join()
+    while done is not None and not done():
+        time.sleep(0.001)
+    return time.perf_counter() - began
+
+
+def check(path, expected):
+    """Count intact and torn lines in the log file."""
+    intact = torn = 0
+    for line in Path(path).read_text(encoding='utf-8', errors='replace').splitlines():
+        if LINE.match(line):
+            intact += 1
+        elif "worker" in line:
+            torn += 1
+    return f"{intact:,} of {expected:,} lines intact, {torn} torn"
+
+
+def main():
+    """Run the multiprocess logging benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=16, help="Worker processes")
+    parser.add_argument("--records", type=int, default=20_000, help="Records per worker")
+    parser.add_argument("--start-method", default=None, help="multiprocessing start method (default: platform default)")
+    args = parser.parse_args()
+    context = multiprocessing.get_context(args.start_method)
+    expected = args.workers * args.records
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "shared.log"
+        elapsed = run(context, shared_file_worker, path, args.workers, args.records)
+        print(f"shared file {expected / elapsed:10,.0f} records/sec  ({check(path, expected)})")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        # Keep the parent's console quiet; the collector writes the file
+        simple_global_logging.setup_logging(base_dir=directory, collector=True)
+        core._console_handler.setLevel(logging.CRITICAL)
+        received = core._collector.received_records
+        elapsed = run(context, collector_worker, None, args.workers, args.records,
+                      done=lambda: core._collector.received_records >= received + expected)
+        path = simple_global_logging.get_current_log_file()
+        core._collector.stop()
+        logging.shutdown()
+        print(f"collector   {expected / elapsed:10,.0f} records/sec  ({check(path, expected)})")
+
+
+if __name__ == "__main__":
+    main()
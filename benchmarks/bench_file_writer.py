@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the log file writers selectable with setup_logging(file_writer=...).
+
+Logs the same records through a logger whose only handler writes the verbose
+text format with logging.FileHandler (file_writer="stream") or with
+LogFileHandler over a preallocated memory-mapped file (file_writer="mmap"), and
+reports records/sec and the p50/p99/max latency of a logging call. FileHandler
+flushes, and so issues a write() system call, after every record; the mmap
+writer copies the record into the mapping.
+
+Usage:
+    python benchmarks/bench_file_writer.py [--records N] [--repeat N]
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from datetime import timezone, timedelta
+from pathlib import Path
+
+# Add the package to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simple_global_logging.formatters import FastFormatter
+from simple_global_logging.handlers import LogFileHandler
+
+TZ = timezone(timedelta(hours=9))
+
+
+def formatter():
+    """Verbose formatter used by setup_logging."""
+    return FastFormatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+                         datefmt='%Y-%m-%d %H:%M:%S', tz=TZ)
+
+
+def stream_handler(path):
+    """logging.FileHandler, as in setup_logging(file_writer="stream")."""
+    handler = logging.FileHandler(path, encoding='utf-8')
+    handler.setFormatter(formatter())
+    return handler
+
+
+def mmap_handler(path):
+    """LogFileHandler over a memory-mapped file, as in setup_logging(file_writer="mmap")."""
+    handler = LogFileHandler(path, file_writer="mmap")
+    handler.setFormatter(formatter())
+    return handler
+
+
+def run(make_handler, count):
+    """Log count records through a fresh handler; return records/sec and sorted call latencies."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.log"
+        handler = make_handler(path)
+        logger = logging.Logger("service.api")
+        logger.addHandler(handler)
+        latencies = [0.0] * count
+        clock = time.perf_counter
+        start = clock()
+        for i in range(count):
+            before = clock()
+            logger.info("request %d handled in %.3fs for user %s", i, 0.25, "alice")
+            latencies[i] = clock() - before
+        elapsed = clock() - start
+        handler.close()
+        assert path.read_bytes().count(b"\n") == count
+        latencies.sort()
+        return count / elapsed, latencies
+
+
+def main():
+    """Run the file writer benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000, help="Records per run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per writer; the best is reported")
+    args = parser.parse_args()
+    
+    baseline = None
+    for label, make_handler in (("stream", stream_handler), ("mmap", mmap_handler)):
+        rate, latencies = max((run(make_handler, args.records) for _ in range(args.repeat)), key=lambda r: r[0])
+        baseline = baseline or rate
+        p50 = latencies[len(latencies) // 2] * 1e6
+        p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+        print(f"{label:8s} {rate:10,.0f} records/sec ({rate / baseline:4.2f}x)  "
+              f"p50 {p50:5.1f}us  p99 {p99:5.1f}us  max {latencies[-1] * 1e6:8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark for formatting log records with the built-in verbose format.
+
+Compares TimezoneFormatter (logging.Formatter's generic %-interpolation, the
+previous setup_logging formatter) with FastFormatter (compiled format string,
+per-record memo). In verbose mode setup_logging shares one formatter between
+the console and file handlers, so each record is formatted twice. For
+file_format="jsonl", compares building a dict and calling json.dumps() per
+record with JsonLinesFormatter.
+
+Each case reports the best of --repeat runs.
+
+Usage:
+    python benchmarks/bench_formatter.py [--records N] [--repeat N]
+"""
+
+import argparse
+import io
+import json
+import logging
+import sys
+import time
+from datetime import timezone, timedelta
+from pathlib import Path
+
+# Add the package to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simple_global_logging.formatters import FastFormatter, JsonLinesFormatter, TimezoneFormatter
+
+VERBOSE_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+DATEFMT = '%Y-%m-%d %H:%M:%S'
+
+
+def make_records(count):
+    """Create records spread over one second, as a busy service would produce."""
+    base = time.time()
+    records = []
+    for i in range(count):
+        record = logging.LogRecord("app.worker", logging.INFO, __file__, 1, "request %d handled in %.3fs", (i, 0.25), None)
+        record.created = base + i / count
+        records.append(record)
+    return records
+
+
+def format_twice(formatter_class, records):
+    """Format every record for a console and a file handler sharing one formatter; return records/sec."""
+    formatter = formatter_class(VERBOSE_FORMAT, datefmt=DATEFMT, tz=timezone(timedelta(hours=9)))
+    start = time.perf_counter()
+    for record in records:
+        formatter.format(record)
+        formatter.format(record)
+    return len(records) / (time.perf_counter() - start)
+
+
+class JsonDumpsFormatter(logging.Formatter):
+    """Straightforward JSON formatter: a dict per record passed to json.dumps()."""
+    
+    def __init__(self, tz):
+        super().__init__()
+        self.timestamps = TimezoneFormatter(datefmt=DATEFMT, tz=tz)
+    
+    def format(self, record):
+        return json.dumps({
+            "time": self.timestamps.formatTime(record, DATEFMT),
+            "level": record.levelname,
+            "logger": record.name,
+            "stream": "log",
+            "message": record.getMessage(),
+        }, ensure_ascii=False)
+
+
+def format_json(formatter_class, records):
+    """Format every record as a JSON line; return records/sec."""
+    formatter = formatter_class(tz=timezone(timedelta(hours=9)))
+    start = time.perf_counter()
+    for record in records:
+        formatter.format(record)
+    return len(records) / (time.perf_counter() - start)
+
+
+def log_through_handlers(formatter_class, count):
+    """Log through a logger with two in-memory stream handlers; return records/sec."""
+    formatter = formatter_class(VERBOSE_FORMAT, datefmt=DATEFMT, tz=timezone(timedelta(hours=9)))
+    logger = logging.Logger("bench")
+    for _ in range(2):
+        handler = logging.StreamHandler(io.StringIO())
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    start = time.perf_counter()
+    for i in range(count):
+        logger.info("request %d handled in %.3fs", i, 0.25)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    """Run the formatter benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000, help="Number of records")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the best is reported")
+    args = parser.parse_args()
+    
+    cases = [
+        ("format() for console + file", lambda cls: format_twice(cls, make_records(args.records))),
+        ("logger.info() with two handlers", lambda cls: log_through_handlers(cls, args.records)),
+    ]
+    for name, run in cases:
+        compare(name, run, TimezoneFormatter, FastFormatter, args.repeat)
+    compare("JSON Lines", lambda cls: format_json(cls, make_records(args.records)),
+            JsonDumpsFormatter, JsonLinesFormatter, args.repeat)
+
+
+def compare(name, run, before_class, after_class, repeat):
+    """Print the best records/sec of two formatter classes for a case."""
+    print(f"{name}:")
+    before = after = 0.0
+    for _ in range(repeat):
+        before = max(before, run(before_class))
+        after = max(after, run(after_class))
+    print(f"  before: {before_class.__name__:18s} {before:12,.0f} records/sec")
+    print(f"  after: {after_class.__name__:19s} {after:12,.0f} records/sec")
+    print(f"  speedup {'':18s} {after / before:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
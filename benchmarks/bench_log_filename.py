@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark for log file name allocation in directories with many log files.
+
+Fills a directory with N of today's log files (10,000 and 100,000 by default)
+and times one name allocation with:
+    - scan: the previous implementation, which globbed YYYYMMDD-*.log and
+      matched a regex against every name to find the highest serial
+    - counter: generate_log_filename() reading the serial counter file and
+      claiming the next file with O_CREAT|O_EXCL
+    - recovery: generate_log_filename() without a counter file, which falls
+      back to one scan of the directory
+The scan time grows with the directory; the counter time does not. Created
+files are removed between calls, so every call sees the same directory.
+
+Usage:
+    python benchmarks/bench_log_filename.py [--files N [N ...]] [--repeat N]
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add the package to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simple_global_logging.utils import SERIAL_FILE, generate_log_filename
+
+
+def scan_log_filename(base_dir, tz=None):
+    """Previous generate_log_filename: glob today's files and take the highest serial plus one."""
+    if tz is None:
+        tz = timezone.utc
+    today = datetime.now(tz).strftime("%Y%m%d")
+    output_dir = Path(base_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    existing_files = glob.glob(str(output_dir / f"{today}-*.log"))
+    serial_numbers = []
+    for file_path in existing_files:
+        match = re.search(rf"{today}-(\d{{7}})\.log", Path(file_path).name)
+        if match:
+            serial_numbers.append(int(match.group(1)))
+    next_serial = max(serial_numbers) + 1 if serial_numbers else 1
+    return output_dir / f"{today}-{next_serial:07d}.log"
+
+
+def fill(directory, count):
+    """Create count empty log files of today."""
+    today = datetime.now(timezone.utc).strftime("%Y%m%d")
+    for serial in range(1, count + 1):
+        os.close(os.open(os.path.join(directory, f"{today}-{serial:07d}.log"), os.O_WRONLY | os.O_CREAT, 0o644))
+
+
+def measure(function, repeat, reset):
+    """Best seconds of repeat calls; reset() restores the directory after each call."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        path = function()
+        best = min(best, time.perf_counter() - start)
+        reset(path)
+    return best
+
+
+def main():
+    """Run the log file name allocation benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, nargs="+", default=[10_000, 100_000], help="Existing log files")
+    parser.add_argument("--repeat", type=int, default=20, help="Calls per method; the best is reported")
+    args = parser.parse_args()
+    
+    today = datetime.now(timezone.utc).strftime("%Y%m%d")
+    for count in args.files:
+        with tempfile.TemporaryDirectory() as directory:
+            fill(directory, count)
+            counter = Path(directory) / SERIAL_FILE
+            
+            def forget(path):
+                """Remove the claimed file and the counter."""
+                path.unlink()
+                counter.unlink()
+            
+            def unclaim(path):
+                """Remove the claimed file and set the counter back to the last existing file."""
+                path.unlink()
+                counter.write_text(f"{today}-{count:07d}\n")
+            
+            results = [("scan", measure(lambda: scan_log_filename(directory), args.repeat, lambda path: None))]
+            results.append(("recovery", measure(lambda: generate_log_filename(directory), args.repeat, forget)))
+            counter.write_text(f"{today}-{count:07d}\n")
+            results.insert(1, ("counter", measure(lambda: generate_log_filename(directory), args.repeat, unclaim)))
+            
+            baseline = results[0][1]
+            for label, seconds in results:
+                print(f"{count:>8,} files  {label:9s} {seconds * 1e3:9.3f} ms  ({baseline / seconds:7.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
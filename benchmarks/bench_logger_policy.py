@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark for child logger normalisation with a huge logger registry.
+
+Builds a registry of N loggers (50,000 by default) in packages of 100 modules,
+one in ten with a handler of its own, and times applying the policy at setup:
+    - previous: the former setup_logging loop, logging.getLogger() on every
+      registry name (turning placeholders into loggers) and clearing handlers
+    - eager: LoggerPolicy("eager"), which walks the existing loggers only
+    - lazy: LoggerPolicy("lazy"), which walks no loggers: it sets the manager's
+      logger class and fixes existing loggers on their first record or
+      addHandler() call; what remains is the level cache clear of setLevel()
+      for the "urllib3" override
+It also times creating N new loggers after setup, with the lazy policy's
+class and with the plain logging.Logger.
+
+Usage:
+    python benchmarks/bench_logger_policy.py [--loggers N] [--repeat N]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add the package to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simple_global_logging.loggers import LoggerPolicy
+
+
+def build(count):
+    """Create a registry of its own with count module loggers.
+    
+    Returns:
+        Tuple of the manager and the logger names
+    """
+    manager = logging.Manager(logging.RootLogger(logging.WARNING))
+    names = [f"company.package{index // 100}.module{index}" for index in range(count)]
+    for index, name in enumerate(names):
+        logger = manager.getLogger(name)
+        if index % 10 == 0:
+            logger.addHandler(logging.NullHandler())
+            logger.propagate = False
+    return manager, names
+
+
+def previous_policy(manager):
+    """The former setup_logging loop over the registry."""
+    for name in manager.loggerDict:
+        logger = manager.getLogger(name)
+        if name == "urllib3":
+            logger.setLevel(logging.INFO)
+            continue
+        logger.propagate = True
+        logger.handlers.clear()
+
+
+def timed(function):
+    """Seconds taken by one call of function."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the logger policy benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--loggers", type=int, default=50_000, help="Loggers in the registry")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per method; the best is reported")
+    args = parser.parse_args()
+    
+    results = {}
+    for _ in range(args.repeat):
+        measurements = {}
+        manager, names = build(args.loggers)
+        measurements["previous"] = timed(lambda: previous_policy(manager))
+        manager, names = build(args.loggers)
+        measurements["eager"] = timed(lambda: LoggerPolicy("eager").apply(manager))
+        manager, names = build(args.loggers)
+        policy = LoggerPolicy("lazy")
+        measurements["lazy"] = timed(lambda: policy.apply(manager))
+        new_names = [f"{name}.child" for name in names]
+        measurements["lazy policy class"] = timed(lambda: [manager.getLogger(name) for name in new_names])
+        policy.remove()
+        new_names = [f"{name}.other" for name in names]
+        measurements["logging.Logger"] = timed(lambda: [manager.getLogger(name) for name in new_names])
+        for label, seconds in measurements.items():
+            results[label] = min(results.get(label, float("inf")), seconds)
+    
+    print(f"{args.loggers:,} loggers, setup:")
+    baseline = results["previous"]
+    for label in ("previous", "eager", "lazy"):
+        print(f"  {label:22s} {results[label] * 1e3:9.3f} ms  ({baseline / results[label]:9.1f}x)")
+    print(f"{args.loggers:,} new loggers created after setup:")
+    for label in ("lazy policy class", "logging.Logger"):
+        print(f"  {label:22s} {results[label] * 1e3:9.3f} ms  ({results[label] / args.loggers * 1e9:5.0f} ns/logger)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the cost of records dropped by the rate limit filter.
+
+Logs N records (200,000 by default) from one hot call site to a file handler
+with the library's format, and times:
+    - unlimited: every record formatted and written
+    - limited: RateLimitFilter with a small burst, so nearly every record is
+      suppressed before formatting
+    - logger level: the records below the logger's level, the cheapest drop
+      logging offers, for reference
+The record itself is still created by the logger before any handler filter
+runs, so "limited" cannot get down to "logger level".
+
+Usage:
+    python benchmarks/bench_rate_limit.py [--records N] [--repeat N]
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the package to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simple_global_logging.ratelimit import RateLimit, RateLimitFilter
+
+FORMAT = "[%(asctime)s] - %(levelname)s - %(name)s - %(message)s"
+
+
+def run(path, count, rate_filter=None, level=logging.DEBUG):
+    """Seconds taken to log count records through a file handler of its own."""
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter(FORMAT))
+    if rate_filter is not None:
+        handler.addFilter(rate_filter)
+    logger = logging.Logger("bench.hot", level)
+    logger.addHandler(handler)
+    start = time.perf_counter()
+    for i in range(count):
+        logger.info("Request %d failed, retrying", i)
+    seconds = time.perf_counter() - start
+    handler.close()
+    return seconds
+
+
+def main():
+    """Run the rate limit benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=200_000, help="Records logged per run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per method; the best is reported")
+    args = parser.parse_args()
+    
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "bench.log"
+        for _ in range(args.repeat):
+            measurements = {
+                "unlimited": run(path, args.records),
+                "limited": run(path, args.records,
+                               RateLimitFilter([RateLimit(rate=10, burst=10, level="INFO")], summary_interval=0)),
+                "logger level": run(path, args.records, level=logging.WARNING),
+            }
+            for label, seconds in measurements.items():
+                results[label] = min(results.get(label, float("inf")), seconds)
+    
+    print(f"{args.records:,} records from one call site:")
+    baseline = results["unlimited"]
+    for label, seconds in results.items():
+        print(f"  {label:14s} {seconds * 1e3:9.1f} ms  {seconds / args.records * 1e9:6.0f} ns/record"
+              f"  ({baseline / seconds:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for per-record timestamp formatting.
+
+Compares building and formatting a fresh datetime for every record (previous
+capture and formatter behaviour) with the shared per-second TimestampCache, for
+a stream of 100k records spread over one second. Also compares the previous
+datetime.now() converter lambda with TimezoneConverter for a fixed-offset and a
+zoneinfo timezone.
+
+Usage:
+    python benchmarks/bench_timestamps.py [--records N]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+# Add the package to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from simple_global_logging.formatters import TimezoneFormatter
+from simple_global_logging.timestamps import TimestampCache, TimezoneConverter
+
+DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+
+def measure(label, func, items):
+    """Run func over items and print nanoseconds per record and CPU cost at 100k records/sec."""
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    elapsed = time.perf_counter() - start
+    per_record_ns = elapsed / len(items) * 1e9
+    print(f"{label:44s} {per_record_ns:8.0f} ns/record  {per_record_ns * 100_000 / 1e6:7.1f} ms CPU per 100k records")
+    return per_record_ns
+
+
+def main():
+    """Run the timestamp microbenchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000, help="Number of records (spread over one second)")
+    args = parser.parse_args()
+    
+    tz = timezone(timedelta(hours=9))
+    base = time.time()
+    created = [base + i / args.records for i in range(args.records)]
+    
+    print("Capture timestamps:")
+    before = measure("before: datetime.now(tz).strftime", lambda _: datetime.now(tz).strftime(DATEFMT), created)
+    cache = TimestampCache(tz)
+    after = measure("after: TimestampCache.format", cache.format, created)
+    print(f"{'saving':44s} {before - after:8.0f} ns/record\n")
+    
+    records = []
+    for c in created:
+        record = logging.LogRecord("bench", logging.INFO, __file__, 1, "message", None, None)
+        record.created = c
+        records.append(record)
+    
+    print("Formatter asctime:")
+    legacy = logging.Formatter('%(asctime)s - %(message)s', datefmt=DATEFMT)
+    legacy.converter = lambda *args: datetime.now(tz).timetuple()
+    before = measure("before: Formatter.formatTime + now() converter", lambda r: legacy.formatTime(r, DATEFMT), records)
+    cached = TimezoneFormatter('%(asctime)s - %(message)s', datefmt=DATEFMT, tz=tz)
+    after = measure("after: TimezoneFormatter.formatTime", lambda r: cached.formatTime(r, DATEFMT), records)
+    print(f"{'saving':44s} {before - after:8.0f} ns/record")
+    
+    for zone in (tz, ZoneInfo("America/New_York")):
+        print(f"\nFormatter converter ({zone}):")
+        before = measure("before: lambda: datetime.now(tz).timetuple()", lambda _: datetime.now(zone).timetuple(), created)
+        after = measure("after: TimezoneConverter(record.created)", TimezoneConverter(zone), created)
+        print(f"{'saving':44s} {before - after:8.0f} ns/record")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,29 @@
 """
 Simple Global Logging Library
 
-A simple Python logging wrapper library that enables global logging configuration 
+A simple Python logging wrapper library that enables global logging configuration
 across your entire project with automatic file output and stdout capture capabilities.
 """
 
-from simple_global_logging.core import (
-    setup_logging,
-    setup_logging_with_stdout_capture,
-    get_logger,
-    restore_stdout,
-    get_current_log_file,
-    get_current_timezone
-)
+# typing.TYPE_CHECKING, without importing typing
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from simple_global_logging.core import (
+        setup_logging,
+        setup_logging_with_stdout_capture,
+        get_logger,
+        restore_stdout,
+        get_current_log_file,
+        get_current_timezone,
+        get_capture_stats,
+        get_compression_stats,
+        get_rate_limit_stats,
+        flush_logging,
+        stop_logging
+    )
+    from simple_global_logging.options import CaptureOptions, RetentionOptions, RotationOptions
+    from simple_global_logging.ratelimit import RateLimit, RateLimitFilter
+    from simple_global_logging.retention import prune
 
 # Version will be set during build process
 __version__ = "None"
@@ -20,10 +31,45 @@ __version__ = "None"
 # Convenience exports
 __all__ = [
     'setup_logging',
-    'setup_logging_with_stdout_capture', 
+    'setup_logging_with_stdout_capture',
     'get_logger',
     'restore_stdout',
     'get_current_log_file',
     'get_current_timezone',
+    'get_capture_stats',
+    'get_compression_stats',
+    'get_rate_limit_stats',
+    'flush_logging',
+    'stop_logging',
+    'prune',
+    'CaptureOptions',
+    'RotationOptions',
+    'RetentionOptions',
+    'RateLimit',
+    'RateLimitFilter',
     '__version__'
-] 
\ No newline at end of file
+]
+
+# Module each export is imported from on first access, so that importing the
+# package costs almost nothing for programs that exit before logging anything
+_EXPORTS = {name: 'simple_global_logging.core' for name in __all__ if name != '__version__'}
+_EXPORTS['prune'] = 'simple_global_logging.retention'
+_EXPORTS['RateLimit'] = _EXPORTS['RateLimitFilter'] = 'simple_global_logging.ratelimit'
+for _name in ('CaptureOptions', 'RotationOptions', 'RetentionOptions'):
+    _EXPORTS[_name] = 'simple_global_logging.options'
+
+
+def __getattr__(name):
+    """Import an exported function on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Unlike importlib.import_module(), __import__ shows up in -X importtime
+    value = getattr(__import__(module_name, fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List the exports along with the module's own attributes."""
+    return sorted(set(globals()) | set(__all__))
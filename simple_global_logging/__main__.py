@@ -0,0 +1,61 @@
+"""
+Command line tools for simple_global_logging.
+
+Usage:
+    python -m simple_global_logging decode FILE [FILE ...] [--tz TZ] [-o OUTPUT]
+"""
+
+from pathlib import Path
+import argparse
+import sys
+
+from simple_global_logging.binary import decode_to_text, parse_timezone
+
+
+def main(argv=None) -> int:
+    """Run the command line interface.
+    
+    Args:
+        argv: Command line arguments (default: sys.argv[1:])
+    
+    Returns:
+        Exit status
+    """
+    parser = argparse.ArgumentParser(prog="python -m simple_global_logging", description="simple_global_logging tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    decode = commands.add_parser("decode", help="Render binary log files in the text log format")
+    decode.add_argument("files", nargs="+", type=Path, help="Binary log files written with file_format=\"binary\"")
+    decode.add_argument("--tz", help="Timezone for timestamps, e.g. UTC, +09:00 or Asia/Tokyo "
+                                     "(default: the timezone recorded in the file)")
+    decode.add_argument("-o", "--output", type=Path, help="Write to this file instead of stdout")
+    
+    args = parser.parse_args(argv)
+    
+    try:
+        tz = parse_timezone(args.tz) if args.tz else None
+    except ValueError as e:
+        parser.error(str(e))
+    
+    status = 0
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for path in args.files:
+            def report(offset: int, error: ValueError) -> None:
+                nonlocal status
+                status = 1
+                print(f"{path}: corrupt record at byte {offset} skipped: {error}", file=sys.stderr)
+            
+            try:
+                decode_to_text(path, output, tz, on_error=report)
+            except (OSError, ValueError) as e:
+                print(f"{path}: {e}", file=sys.stderr)
+                return 1
+    finally:
+        if args.output:
+            output.close()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,676 @@
+"""
+Compact binary log format for simple_global_logging.
+
+A binary log file is a sequence of length-prefixed records:
+
+    record  := varint(len(payload)) payload
+    payload := type byte, then the fields of that type
+
+Record types:
+
+    HEADER   b"SGLB", format version, timezone of the writer (UTF-8). Written
+             whenever a BinaryLogHandler opens the file, and once at the start of
+             every file created by rotation; resets the string table and the
+             timestamp base.
+    TEMPLATE varint id, varint levelno, then level name, logger name and message
+             template as length-prefixed UTF-8. Defines an interned template;
+             always written in the same write as the first record using it.
+    LOG      flags, zigzag varint microseconds since the previous LOG record,
+             template ref, then optionally exception text and stack text (each
+             length-prefixed UTF-8) and the message arguments (see below) filling
+             the rest of the payload.
+    CAPTURE  varint microseconds since the epoch, inline stream label, captured
+             bytes. Captured records do not use the template table, so the capture
+             sink can write them without coordinating with the logging handler.
+
+Files created by rotation start with a HEADER record written by the rotator, so
+they decode on their own even if captured output reaches them first.
+
+A template ref is varint(id + 1) for an interned template, or 0 followed by the
+template fields inline once the table is full. Message arguments are a sequence
+of tagged values:
+
+    None, False, True  the tag alone
+    int                zigzag varint, for values that fit in 64 bits
+    float              IEEE 754 double, little-endian
+    str, bytes         varint length, then the UTF-8 text or the bytes
+
+Messages with any other argument (exact types only) are rendered when written.
+The decoder only ever builds these values; a record that does not parse raises
+ValueError, or is reported to iter_records()'s on_error callback and skipped.
+"""
+
+from datetime import datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+import logging
+import re
+import struct
+
+from simple_global_logging.timestamps import TimestampCache
+from simple_global_logging.writers import BufferedLogWriter, DEFAULT_BUFFER_SIZE
+
+if TYPE_CHECKING:
+    from simple_global_logging.rotation import LogRotator
+
+
+MAGIC = b"SGLB"
+FORMAT_VERSION = 2
+
+RECORD_HEADER = 0
+RECORD_TEMPLATE = 1
+RECORD_LOG = 2
+RECORD_CAPTURE = 3
+
+_HEADER_PREFIX = bytes((RECORD_HEADER,)) + MAGIC
+
+# LOG record flags
+_FLAG_ARGS = 1
+_FLAG_EXCEPTION = 2
+_FLAG_STACK = 4
+
+# Message argument tags
+_ARG_NONE = 0
+_ARG_FALSE = 1
+_ARG_TRUE = 2
+_ARG_INT = 3
+_ARG_FLOAT = 4
+_ARG_STR = 5
+_ARG_BYTES = 6
+
+_ARG_TAGS = [bytes((tag,)) for tag in range(7)]
+_ARG_CONSTANTS = {None: _ARG_TAGS[_ARG_NONE], False: _ARG_TAGS[_ARG_FALSE], True: _ARG_TAGS[_ARG_TRUE]}
+_DOUBLE = struct.Struct('<d')
+_pack_float = struct.Struct('<Bd').pack
+# Tag and varint of small ints and of the length of short strings, by value
+_SMALL_INT_ARGS = [bytes((_ARG_INT, zigzag)) for zigzag in range(0x80)]
+_STR_PREFIXES = [bytes((_ARG_STR, size)) for size in range(0x80)]
+# Zigzag values of 64-bit ints
+_ZIGZAG_LIMIT = 1 << 64
+
+# Longest varint the decoder accepts: 64-bit values and lengths
+_MAX_VARINT_BYTES = 10
+
+# Templates interned per file before new templates are written inline
+MAX_TEMPLATES = 16384
+
+_SMALL_VARINTS = [bytes((i,)) for i in range(0x80)]
+_OFFSET_SPEC = re.compile(r'([+-])(\d{2}):(\d{2})(?::(\d{2}))?\Z')
+
+# Text rendering, matching the verbose formatter used by setup_logging
+_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+
+def encode_varint(value: int) -> bytes:
+    """Encode a non-negative integer as a little-endian base-128 varint."""
+    if value < 0x80:
+        return _SMALL_VARINTS[value]
+    if value < 0x4000:
+        return bytes(((value & 0x7F) | 0x80, value >> 7))
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _frame(payload: bytes) -> bytes:
+    """Prefix a payload with its length."""
+    return encode_varint(len(payload)) + payload
+
+
+def describe_timezone(tz: tzinfo) -> str:
+    """Describe a timezone for the file header.
+    
+    Args:
+        tz: Timezone
+    
+    Returns:
+        IANA key for zoneinfo timezones, otherwise the current UTC offset as "+HH:MM"
+    """
+    key = getattr(tz, 'key', None)
+    if isinstance(key, str):
+        return key
+    offset = datetime.now(tz).utcoffset() or timedelta(0)
+    seconds = int(offset.total_seconds())
+    sign = '-' if seconds < 0 else '+'
+    hours, remainder = divmod(abs(seconds), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{sign}{hours:02d}:{minutes:02d}" + (f":{seconds:02d}" if seconds else "")
+
+
+def parse_timezone(spec: str) -> tzinfo:
+    """Parse a timezone written by describe_timezone() or given on the command line.
+    
+    Args:
+        spec: "UTC", an offset such as "+09:00", or an IANA name such as "Asia/Tokyo"
+    
+    Returns:
+        Timezone
+    """
+    if spec.upper() in ("UTC", "Z", "+00:00"):
+        return timezone.utc
+    match = _OFFSET_SPEC.match(spec)
+    if match:
+        sign, hours, minutes, seconds = match.groups()
+        offset = timedelta(hours=int(hours), minutes=int(minutes), seconds=int(seconds or 0))
+        return timezone(-offset if sign == '-' else offset)
+    
+    import zoneinfo
+    try:
+        return zoneinfo.ZoneInfo(spec)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"Unknown timezone {spec!r}") from e
+
+
+class BinaryLogEncoder:
+    """Encodes log records into the binary format.
+    
+    Each distinct (message template, logger name, level) is written once as a
+    template; later records refer to it by number. Messages whose arguments are
+    builtin values (numbers, strings, bytes, and tuples, lists or dicts of them)
+    are stored as template and arguments, so the %-formatting happens only when
+    the file is decoded. Set arguments may render in a different order.
+    
+    Not thread-safe; BinaryLogHandler serialises calls with the handler lock.
+    """
+    
+    def __init__(self, tz: Optional[tzinfo] = None, max_templates: int = MAX_TEMPLATES):
+        """Initialize BinaryLogEncoder.
+        
+        Args:
+            tz: Timezone recorded in the header for decoding (default: UTC)
+            max_templates: Templates interned before new templates are written inline (default: 16384)
+        """
+        self.tz = tz if tz is not None else timezone.utc
+        self.max_templates = max_templates
+        self._templates: Dict[Tuple[str, str, int, str], bytes] = {}
+        self._last_created = 0
+        self._exception_formatter = logging.Formatter()
+    
+    def header(self) -> bytes:
+        """Get a header record and reset the template table and timestamp base.
+        
+        Returns:
+            Framed header record
+        """
+        self.reset()
+        return header_record(self.tz)
+    
+    def reset(self) -> None:
+        """Reset the template table and timestamp base for a file whose header is already written."""
+        self._templates.clear()
+        self._last_created = 0
+    
+    def _template_ref(self, key: Tuple[str, str, int, str]) -> Tuple[bytes, bytes]:
+        """Get the reference to a new template and its definition record (or b'' if written inline)."""
+        msg, name, levelno, levelname = key
+        fields = b''.join([encode_varint(max(levelno, 0)), _inline_str(levelname), _inline_str(name), _inline_str(msg)])
+        if len(self._templates) >= self.max_templates:
+            return _SMALL_VARINTS[0] + fields, b''
+        index = len(self._templates)
+        ref = self._templates[key] = encode_varint(index + 1)
+        return ref, _frame(bytes((RECORD_TEMPLATE,)) + encode_varint(index) + fields)
+    
+    def encode_record(self, record: logging.LogRecord) -> bytes:
+        """Encode a log record, preceded by the definition of its template if new.
+        
+        Args:
+            record: Log record
+        
+        Returns:
+            Framed records to write with a single write
+        """
+        created = int(record.created * 1_000_000)
+        delta = created - self._last_created
+        self._last_created = created
+        
+        msg, args = record.msg, record.args
+        flags = 0
+        arguments = b''
+        if type(msg) is not str or (args and type(args) is not tuple):
+            msg = record.getMessage()
+        elif args:
+            encoded = _encode_args(args)
+            if encoded is None:
+                # Not a value the format stores: keep what str()/repr() give now
+                msg = record.getMessage()
+            else:
+                arguments = encoded
+                flags = _FLAG_ARGS
+        
+        key = (msg, record.name, record.levelno, record.levelname)
+        ref = self._templates.get(key)
+        definition = b''
+        if ref is None:
+            ref, definition = self._template_ref(key)
+        
+        tail = b''
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+        if record.exc_text:
+            flags |= _FLAG_EXCEPTION
+            tail = _inline_str(record.exc_text)
+        if record.stack_info:
+            flags |= _FLAG_STACK
+            tail += _inline_str(record.stack_info)
+        
+        # Zigzag encoding keeps small negative deltas (records from other threads) short
+        payload = (_LOG_HEADERS[flags] + encode_varint(delta * 2 if delta >= 0 else -delta * 2 - 1)
+                   + ref + tail + arguments)
+        return definition + encode_varint(len(payload)) + payload
+
+
+# Record type and flags byte of LOG records, by flags
+_LOG_HEADERS = [bytes((RECORD_LOG, flags)) for flags in range(8)]
+
+
+def header_record(tz: Optional[tzinfo] = None) -> bytes:
+    """Get a framed header record.
+    
+    Args:
+        tz: Timezone the decoder renders timestamps in by default (default: UTC)
+    
+    Returns:
+        Framed header record
+    """
+    return _frame(_HEADER_PREFIX + bytes((FORMAT_VERSION,))
+                  + describe_timezone(tz if tz is not None else timezone.utc).encode('utf-8'))
+
+
+def _encode_args(args: tuple) -> Optional[bytes]:
+    """Encode message arguments as tagged values.
+    
+    Returns:
+        Encoded arguments, or None if any of them has a type the format does not store
+    """
+    parts = []
+    append = parts.append
+    try:
+        for arg in args:
+            kind = type(arg)
+            if kind is str:
+                data = arg.encode('utf-8')
+                size = len(data)
+                append(_STR_PREFIXES[size] if size < 0x80 else _ARG_TAGS[_ARG_STR] + encode_varint(size))
+                append(data)
+            elif kind is int:
+                zigzag = arg * 2 if arg >= 0 else -arg * 2 - 1
+                if zigzag < 0x80:
+                    append(_SMALL_INT_ARGS[zigzag])
+                elif zigzag < _ZIGZAG_LIMIT:
+                    append(_ARG_TAGS[_ARG_INT] + encode_varint(zigzag))
+                else:
+                    return None
+            elif kind is float:
+                append(_pack_float(_ARG_FLOAT, arg))
+            elif arg is None or kind is bool:
+                append(_ARG_CONSTANTS[arg])
+            elif kind is bytes:
+                append(_ARG_TAGS[_ARG_BYTES] + encode_varint(len(arg)))
+                append(arg)
+            else:
+                return None
+    except UnicodeEncodeError:
+        # Lone surrogates
+        return None
+    return b''.join(parts)
+
+
+def _inline_str(text: str) -> bytes:
+    """Encode a length-prefixed UTF-8 string."""
+    data = text.encode('utf-8', errors='surrogatepass')
+    return encode_varint(len(data)) + data
+
+
+def encode_capture(created: float, stream: str, payload: Union[str, bytes, bytearray, memoryview]) -> bytes:
+    """Encode a captured output record.
+    
+    Args:
+        created: Capture time in seconds since the epoch
+        stream: Stream label, e.g. "STDOUT"
+        payload: Captured text without a trailing newline, or raw bytes
+    
+    Returns:
+        Framed record
+    """
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8', errors='surrogatepass')
+    return _frame(b''.join([
+        _SMALL_VARINTS[RECORD_CAPTURE],
+        encode_varint(round(created * 1_000_000)),
+        _inline_str(stream),
+        payload
+    ]))
+
+
+class BinaryLogHandler(logging.Handler):
+    """logging.Handler writing records to a file in the binary format.
+    
+    Each record, together with the definitions of strings it introduces, goes to
+    the file in one write, so output from the capture sink appended to the same
+    file never splits a record.
+    """
+    
+    def __init__(self, path: Union[str, Path], tz: Optional[tzinfo] = None,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE, flush_policy: str = "line",
+                 rotator: Optional["LogRotator"] = None):
+        """Initialize BinaryLogHandler and write the file header.
+        
+        Args:
+            path: Path to the log file (opened in append mode)
+            tz: Timezone the decoder renders timestamps in by default (default: UTC)
+            buffer_size: Size of the file buffer in bytes (default: 64 KiB)
+            flush_policy: When to flush, as for BufferedLogWriter (default: "line")
+            rotator: Optional LogRotator; its preamble should be header_record(tz)
+        """
+        super().__init__()
+        self.encoder = BinaryLogEncoder(tz)
+        self.writer = BufferedLogWriter(path, buffer_size=buffer_size, flush_policy=flush_policy,
+                                        rotator=rotator, lock=self.lock)
+        self.writer.write(self.encoder.header())
+    
+    @property
+    def path(self) -> Path:
+        """Path of the file currently written to."""
+        return self.writer.path
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Encode and write a record.
+        
+        Args:
+            record: Log record
+        """
+        try:
+            writer = self.writer
+            if writer.rotation_pending and writer.rotate():
+                # The template table and timestamp base start over in every file; the
+                # rotator's preamble already wrote the header, unless it has none
+                if writer.rotator.preamble is not None:
+                    self.encoder.reset()
+                    writer.write(self.encoder.encode_record(record))
+                else:
+                    writer.writelines((self.encoder.header(), self.encoder.encode_record(record)))
+            else:
+                writer.write(self.encoder.encode_record(record))
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self) -> None:
+        """Flush buffered records to the file."""
+        with self.lock:
+            self.writer.flush()
+    
+    def reset_after_fork(self, path: Union[str, Path]) -> None:
+        """Start a new file in a child created with os.fork().
+        
+        Records of the child cannot be appended to the parent's file: both
+        processes would define templates under the same ids.
+        
+        Args:
+            path: File for the child's records; it starts with a header
+        """
+        self.writer.reset_after_fork(path)
+        self.writer.write(self.encoder.header())
+    
+    def close(self) -> None:
+        """Flush and close the file."""
+        with self.lock:
+            self.writer.close()
+        super().close()
+
+
+class _Reader:
+    """Cursor over a record payload; reading past its end raises ValueError."""
+    
+    def __init__(self, data: memoryview):
+        self.data = data
+        self.position = 0
+    
+    def varint(self) -> int:
+        """Read a varint of at most _MAX_VARINT_BYTES bytes."""
+        data = self.data
+        result = shift = 0
+        for position in range(self.position, min(self.position + _MAX_VARINT_BYTES, len(data))):
+            byte = data[position]
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                self.position = position + 1
+                return result
+            shift += 7
+        raise ValueError("Varint runs past the end of the record or is too long")
+    
+    def zigzag(self) -> int:
+        """Read a zigzag-encoded signed varint."""
+        value = self.varint()
+        return value >> 1 if not value & 1 else -(value >> 1) - 1
+    
+    def take(self, length: int) -> bytes:
+        """Read the given number of bytes."""
+        start = self.position
+        if length > len(self.data) - start:
+            raise ValueError("Field runs past the end of the record")
+        self.position += length
+        return bytes(self.data[start:self.position])
+    
+    def text(self, length: int) -> str:
+        """Read UTF-8 text of the given length in bytes."""
+        return self.take(length).decode('utf-8', errors='replace')
+    
+    def rest(self) -> bytes:
+        """Read the remaining bytes of the payload."""
+        start, self.position = self.position, len(self.data)
+        return bytes(self.data[start:])
+    
+    def args(self) -> tuple:
+        """Read tagged message arguments up to the end of the payload."""
+        values = []
+        while self.position < len(self.data):
+            tag = self.data[self.position]
+            self.position += 1
+            if tag == _ARG_STR:
+                values.append(self.take(self.varint()).decode('utf-8', errors='replace'))
+            elif tag == _ARG_INT:
+                values.append(self.zigzag())
+            elif tag == _ARG_FLOAT:
+                values.append(_DOUBLE.unpack(self.take(_DOUBLE.size))[0])
+            elif tag == _ARG_NONE:
+                values.append(None)
+            elif tag == _ARG_FALSE or tag == _ARG_TRUE:
+                values.append(tag == _ARG_TRUE)
+            elif tag == _ARG_BYTES:
+                values.append(self.take(self.varint()))
+            else:
+                raise ValueError(f"Unknown argument tag {tag}")
+        return tuple(values)
+
+
+class DecodedRecord:
+    """Log or captured output record read from a binary log file."""
+    
+    __slots__ = ('created', 'levelno', 'levelname', 'name', 'message', 'exc_text', 'stack_info', 'stream', 'tz')
+    
+    def __init__(self, created: float, tz: tzinfo, message: str, stream: Optional[str] = None,
+                 levelno: int = 0, levelname: str = "", name: str = "",
+                 exc_text: Optional[str] = None, stack_info: Optional[str] = None):
+        self.created = created
+        self.tz = tz
+        self.message = message
+        self.stream = stream
+        self.levelno = levelno
+        self.levelname = levelname
+        self.name = name
+        self.exc_text = exc_text
+        self.stack_info = stack_info
+
+
+def iter_records(data: Union[bytes, bytearray, memoryview], tz: Optional[tzinfo] = None,
+                 on_error: Optional[Callable[[int, ValueError], None]] = None) -> Iterator[DecodedRecord]:
+    """Decode the records of a binary log file.
+    
+    Args:
+        data: File contents
+        tz: Timezone attached to the records (default: the timezone in the file header)
+        on_error: Called with the byte offset and the error of each record that does not
+                  parse, after which decoding goes on with the next record (default: raise
+                  the error)
+    
+    Yields:
+        Decoded log and captured output records in file order. A record cut short at
+        the end of the data (e.g. by a crash during a write) is ignored.
+    
+    Raises:
+        ValueError: If the data is not a binary log file of this format version, or
+                    a record does not parse and on_error is None
+    """
+    view = memoryview(data)
+    templates: List[Tuple[int, str, str, str]] = []
+    last_created = 0
+    current_tz = tz or timezone.utc
+    position = 0
+    first = True
+    
+    while position < len(view):
+        offset = position
+        reader = _Reader(view)
+        reader.position = position
+        try:
+            length = reader.varint()
+        except ValueError:
+            return
+        start = reader.position
+        position = start + length
+        if first:
+            if bytes(view[start:start + len(_HEADER_PREFIX)]) != _HEADER_PREFIX:
+                raise ValueError("Not a simple_global_logging binary log file")
+            if length <= len(_HEADER_PREFIX) or view[start + len(_HEADER_PREFIX)] != FORMAT_VERSION:
+                raise ValueError(f"Unsupported binary log format version, expected {FORMAT_VERSION}")
+        first = False
+        if position > len(view):
+            return
+        
+        record = None
+        try:
+            payload = _Reader(view[start:position])
+            record_type = payload.data[0] if length else -1
+            payload.position = 1
+            
+            if record_type == RECORD_HEADER:
+                templates = []
+                last_created = 0
+                if payload.take(len(MAGIC)) != MAGIC or payload.take(1)[0] != FORMAT_VERSION:
+                    raise ValueError(f"Unsupported binary log format version, expected {FORMAT_VERSION}")
+                if tz is None:
+                    current_tz = parse_timezone(payload.rest().decode('utf-8', errors='replace'))
+            elif record_type == RECORD_TEMPLATE:
+                index = payload.varint()
+                if index == len(templates):
+                    templates.append(_read_template(payload))
+            elif record_type == RECORD_LOG:
+                flags = payload.take(1)[0]
+                last_created += payload.zigzag()
+                ref = payload.varint()
+                if ref == 0:
+                    template = _read_template(payload)
+                elif ref <= len(templates):
+                    template = templates[ref - 1]
+                else:
+                    template = (0, "", "", f"<template {ref - 1}>")
+                levelno, levelname, name, message = template
+                exc_text = payload.text(payload.varint()) if flags & _FLAG_EXCEPTION else None
+                stack_info = payload.text(payload.varint()) if flags & _FLAG_STACK else None
+                if flags & _FLAG_ARGS:
+                    message = _render_message(message, payload.args())
+                record = DecodedRecord(
+                    last_created / 1_000_000, current_tz, message,
+                    levelno=levelno, levelname=levelname, name=name, exc_text=exc_text, stack_info=stack_info
+                )
+            elif record_type == RECORD_CAPTURE:
+                created = payload.varint()
+                stream = payload.text(payload.varint())
+                text = payload.rest().decode('utf-8', errors='replace')
+                if text.endswith('\n'):
+                    text = text[:-1]
+                record = DecodedRecord(created / 1_000_000, current_tz, text, stream=stream)
+            # Unknown record types are skipped for forward compatibility
+        except ValueError as e:
+            if on_error is None:
+                raise ValueError(f"Corrupt record at byte {offset}: {e}") from e
+            on_error(offset, e)
+            continue
+        if record is not None:
+            yield record
+
+
+def _read_template(reader: _Reader) -> Tuple[int, str, str, str]:
+    """Read the levelno, level name, logger name and message template of a template."""
+    levelno = reader.varint()
+    return levelno, reader.text(reader.varint()), reader.text(reader.varint()), reader.text(reader.varint())
+
+
+def _render_message(template: str, args: tuple) -> str:
+    """Apply the arguments to the template the way LogRecord.getMessage() does."""
+    if not args:
+        return template
+    try:
+        return template % args
+    except Exception:
+        # The original call failed to format as well; keep everything that was logged
+        return f"{template} {args!r}"
+
+
+def render_text(record: DecodedRecord, timestamps: TimestampCache) -> str:
+    """Render a decoded record in the text log file format.
+    
+    Args:
+        record: Decoded record
+        timestamps: Timestamp cache for the record's timezone
+    
+    Returns:
+        Text as written by the text file handler or capture sink, without a trailing newline
+    """
+    if record.stream is not None:
+        return f"[{timestamps.format(record.created)}] {record.stream}: {record.message}"
+    
+    text = f"{timestamps.format(record.created)} - {record.levelname} - {record.name} - {record.message}"
+    if record.exc_text:
+        if text[-1:] != "\n":
+            text += "\n"
+        text += record.exc_text
+    if record.stack_info:
+        if text[-1:] != "\n":
+            text += "\n"
+        text += record.stack_info
+    return text
+
+
+def decode_to_text(path: Union[str, Path], output: TextIO, tz: Optional[tzinfo] = None,
+                   on_error: Optional[Callable[[int, ValueError], None]] = None) -> int:
+    """Render a binary log file in the text format.
+    
+    Args:
+        path: Binary log file
+        output: Text stream receiving one line (or more, for tracebacks) per record
+        tz: Timezone for timestamps (default: the timezone in the file header)
+        on_error: Called with the byte offset and the error of each corrupt record,
+                  which is skipped (default: raise the error)
+    
+    Returns:
+        Number of records written
+    
+    Raises:
+        ValueError: If the file is not a binary log file, or a record is corrupt and
+                    on_error is None
+    """
+    data = Path(path).read_bytes()
+    caches: Dict[tzinfo, TimestampCache] = {}
+    count = 0
+    for record in iter_records(data, tz, on_error):
+        timestamps = caches.get(record.tz)
+        if timestamps is None:
+            timestamps = caches[record.tz] = TimestampCache(record.tz, _DATEFMT)
+        output.write(render_text(record, timestamps))
+        output.write("\n")
+        count += 1
+    return count
@@ -3,49 +3,535 @@ Standard output capture functionality for simple_global_logging.
 """
 
 from pathlib import Path
-from datetime import datetime, timezone, timedelta
-from typing import TextIO, Optional
+from datetime import timezone, timedelta
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, Mapping, TextIO, Optional, Tuple, Union
+import atexit
 import threading
+import time
 import re
 
+from simple_global_logging.writers import (
+    AsyncLogWriter,
+    BufferedLogWriter,
+    DEFAULT_BUFFER_SIZE,
+    DEFAULT_FLUSH_INTERVAL,
+    DEFAULT_QUEUE_BYTES,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_SAMPLE_RATE,
+    DEFAULT_SUMMARY_INTERVAL,
+    schedule_idle_flush
+)
+from simple_global_logging.formatters import FILE_FORMATS, JsonLinesEncoder
+from simple_global_logging.timestamps import get_timestamp_cache
 
-class LogCapture:
-    """Captures stdout/stderr and redirects to both original stream and log file."""
+if TYPE_CHECKING:
+    from simple_global_logging.rotation import LogRotator
+
+DEFAULT_PARTIAL_LINE_TIMEOUT = 1.0
+
+# Flush policies for the original stream supported by LogCapture
+STREAM_FLUSH_POLICIES = ("always", "tty", "newline", "interval")
+DEFAULT_STREAM_FLUSH_INTERVAL = 0.5
+
+# Regex patterns, compiled on first use by _pattern(). ANSI_ESCAPE and
+# ANSI_ESCAPE_BYTES remove ANSI escape sequences (color codes) and can still be
+# imported from this module, see __getattr__
+_PATTERNS = {
+    "ANSI_ESCAPE": r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])',
+    "ANSI_ESCAPE_BYTES": rb'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])',
+    "_ESC_BYTES": b'\x1b',
+    "_BLANK_BYTES": rb'\s*\Z',
+}
+_compiled: Dict[str, "re.Pattern"] = {}
+
+# Captured text, or bytes written through LogCapture.buffer
+Payload = Union[str, bytes, bytearray, memoryview]
+
+
+def _pattern(name: str) -> "re.Pattern":
+    """Get a compiled pattern of _PATTERNS, compiling it on first use."""
+    pattern = _compiled.get(name)
+    if pattern is None:
+        pattern = _compiled[name] = re.compile(_PATTERNS[name])
+    return pattern
+
+
+def __getattr__(name: str) -> Any:
+    """Compile ANSI_ESCAPE and ANSI_ESCAPE_BYTES when they are first imported."""
+    if name in ("ANSI_ESCAPE", "ANSI_ESCAPE_BYTES"):
+        return _pattern(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def remove_ansi_codes(text: str) -> str:
+    """Remove ANSI escape sequences from text.
     
-    def __init__(self, original_stream: TextIO, log_file_path: Path, remove_ansi: bool = True, tz: Optional[timezone] = None):
-        """Initialize LogCapture.
+    Most captured output has no escape sequences at all, so the regex only runs
+    when the ESC character is present.
+    
+    Args:
+        text: Text that may contain ANSI escape sequences
+    
+    Returns:
+        Text with ANSI escape sequences removed
+    """
+    if '\x1b' not in text:
+        return text
+    return _pattern("ANSI_ESCAPE").sub('', text)
+
+
+class CaptureSink:
+    """Shared destination for captured stdout/stderr output.
+    
+    Both streams write through one sink, so captured output uses a single lock,
+    file handle and buffer, and every record is tagged with its stream label.
+    Partial writes are assembled per stream into complete lines, and each line
+    becomes one timestamped record.
+    """
+    
+    def __init__(self, log_file_path: Path, tz: Optional[timezone] = None,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE, flush_policy: str = "line",
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, flush_threshold: Optional[int] = None,
+                 async_capture: bool = False, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 partial_line_timeout: float = DEFAULT_PARTIAL_LINE_TIMEOUT, overload: str = "block",
+                 max_queue_bytes: Optional[int] = DEFAULT_QUEUE_BYTES, sample_rate: int = DEFAULT_SAMPLE_RATE,
+                 drop_summary_interval: float = DEFAULT_SUMMARY_INTERVAL, file_format: str = "text",
+                 context: Optional[Mapping[str, Any]] = None, rotator: Optional["LogRotator"] = None,
+                 file_writer: str = "stream"):
+        """Initialize CaptureSink.
         
         Args:
-            original_stream: Original stdout/stderr stream
             log_file_path: Path to log file for writing captured output
-            remove_ansi: Whether to remove ANSI escape sequences from log file (default: True)
             tz: Timezone for timestamps (default: UTC)
+            buffer_size: Size of the log file buffer in bytes (default: 64 KiB)
+            flush_policy: When to flush the log file: "line", "interval" or "size" (default: "line")
+            flush_interval: Seconds between flushes for the "interval" policy (default: 1.0)
+            flush_threshold: Pending characters that trigger a flush for the "size" policy (default: buffer_size)
+            async_capture: Write the log file from a background thread; emit() only enqueues (default: False)
+            queue_size: Maximum number of records queued in async mode (default: 10000)
+            partial_line_timeout: Seconds after which an unterminated line is written as its own
+                                  record (default: 1.0). Checked on every write and, in async mode,
+                                  by the writer thread while idle.
+            overload: What to do when the async queue is full: "block", "drop-oldest",
+                      "drop-newest" or "sample" (default: "block"). Any policy other than
+                      "block" enables async_capture.
+            max_queue_bytes: Byte budget of the async queue, or None for no budget (default: 16 MiB)
+            sample_rate: Keep 1 in sample_rate records while overloaded with "sample" (default: 10)
+            drop_summary_interval: Minimum seconds between "dropped N lines" summary records (default: 60.0)
+            file_format: "text" for "[time] STREAM: line" records, "jsonl" for one JSON object
+                         per line with stream set to "stdout"/"stderr", or "binary" for
+                         binary capture records (default: "text")
+            context: Fields written under "context" on every JSON line (default: none)
+            rotator: Optional LogRotator; captured output follows its rollovers (default: none)
+            file_writer: "stream" or "mmap", as for BufferedLogWriter (default: "stream")
         """
-        self.original_stream = original_stream
-        self.log_file_path = log_file_path
-        self.remove_ansi = remove_ansi
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"file_format must be one of {FILE_FORMATS}, got {file_format!r}")
+        self.overload = overload
+        self.written_records = 0
+        self.write_errors = 0
+        self.partial_line_timeout = partial_line_timeout
         self.lock = threading.Lock()
         
+        # Unterminated line per stream: stream label -> (time of first fragment, fragments)
+        self._partial: Dict[str, Tuple[float, List[str]]] = {}
+        self._partial_flush_scheduled = False
+        
         # Default to UTC if no timezone specified
         if tz is None:
             tz = timezone.utc
         self.timezone = tz
+        self._timestamps = get_timestamp_cache(tz)
+        self.file_format = file_format
+        self._json = JsonLinesEncoder(tz, context) if file_format == "jsonl" else None
+        self._encode_binary = None
+        if file_format == "binary":
+            from simple_global_logging.binary import encode_capture
+            self._encode_binary = encode_capture
+        
+        # In async mode the background thread owns the writer; emit() only enqueues
+        # Dropping records needs a queue to drop from, so drop policies imply async mode
+        async_capture = async_capture or overload != "block"
+        
+        # Long-lived writer for the log file, closed by close() or at interpreter exit
+        self.writer = BufferedLogWriter(
+            log_file_path,
+            buffer_size=buffer_size,
+            flush_policy=flush_policy,
+            flush_interval=flush_interval,
+            flush_threshold=flush_threshold,
+            rotator=rotator,
+            file_writer=file_writer,
+            lock=None if async_capture else self.lock
+        )
+        atexit.register(self.close)
+        
+        self.async_writer = None
+        if async_capture:
+            self.async_writer = AsyncLogWriter(
+                self.writer,
+                self._format_record,
+                max_queue_size=queue_size,
+                idle_callback=self._take_stale_partials,
+                idle_interval=partial_line_timeout,
+                overload=overload,
+                max_queue_bytes=max_queue_bytes,
+                sample_rate=sample_rate,
+                summary_record=self._drop_summary_record,
+                summary_interval=drop_summary_interval
+            )
+    
+    def _format_record(self, record: Tuple[float, str, Payload]) -> List[bytes]:
+        """Format a captured record as a log file line.
+        
+        Args:
+            record: Tuple of capture time (seconds since the epoch), stream label and captured
+                    text or bytes
+        
+        Returns:
+            The timestamped log line as a single chunk; binary payloads are copied in as-is
+        """
+        created, stream, payload = record
+        if self._encode_binary is not None:
+            return [self._encode_binary(created, stream, payload)]
+        if self._json is not None:
+            if not isinstance(payload, str):
+                payload = bytes(payload).decode('utf-8', errors='replace')
+                if payload.endswith('\n'):
+                    payload = payload[:-1]
+            return [(self._json.encode_capture(created, stream, payload) + '\n').encode('utf-8')]
+        
+        # Add timestamp for stdout/stderr captures using specified timezone
+        if isinstance(payload, str):
+            return [f"[{self._timestamps.format(created)}] {stream}: {payload}\n".encode('utf-8')]
+        
+        # One chunk per line: a write of its own, which other processes appending cannot split
+        prefix = f"[{self._timestamps.format(created)}] {stream}: ".encode('utf-8')
+        if payload[-1:] == b'\n':
+            return [b''.join((prefix, payload))]
+        return [b''.join((prefix, payload, b'\n'))]
+    
+    def _drop_summary_record(self, dropped_records: int, dropped_bytes: int, seconds: float) -> Tuple[float, str, str]:
+        """Build the record reporting output dropped by the overload policy."""
+        text = (f"dropped {dropped_records} lines ({dropped_bytes} bytes) of captured output "
+                f"in the last {seconds:.0f}s (overload policy: {self.overload})")
+        return (time.time(), "CAPTURE", text)
+    
+    def stats(self) -> dict:
+        """Get capture counters.
+        
+        Returns:
+            Dictionary with queued_records, queued_bytes, written_records, dropped_records,
+            dropped_bytes and write_errors. Queue and drop counters are always 0 in sync mode.
+        """
+        if self.async_writer is not None:
+            return self.async_writer.stats()
+        return {
+            "queued_records": 0,
+            "queued_bytes": 0,
+            "written_records": self.written_records,
+            "dropped_records": 0,
+            "dropped_bytes": 0,
+            "write_errors": self.write_errors,
+        }
+    
+    def _take_partials(self, max_created: Optional[float] = None) -> List[Tuple[float, str, str]]:
+        """Remove unterminated lines from the line buffers and return them as records.
+        
+        Must be called with the lock held.
+        
+        Args:
+            max_created: Only take lines started at or before this time (default: take all)
+        
+        Returns:
+            Records for the non-blank lines taken
+        """
+        records = []
+        for stream, (created, fragments) in list(self._partial.items()):
+            if max_created is None or created <= max_created:
+                del self._partial[stream]
+                line = "".join(fragments)
+                if line.strip():
+                    records.append((created, stream, line))
+        return records
+    
+    def _take_stale_partials(self) -> List[Tuple[float, str, str]]:
+        """Take unterminated lines older than partial_line_timeout (async writer idle callback)."""
+        # Never wait for the lock here: its holder may be blocked on a full queue
+        if not self._partial or not self.lock.acquire(blocking=False):
+            return []
+        try:
+            return self._take_partials(time.time() - self.partial_line_timeout)
+        finally:
+            self.lock.release()
+    
+    def _idle_flush(self) -> Optional[float]:
+        """Write unterminated lines older than partial_line_timeout (sync mode timer).
+        
+        Called by the writers' idle flusher thread with the lock held.
+        
+        Returns:
+            Seconds until the oldest remaining line is due, or None if there is none left
+        """
+        self._partial_flush_scheduled = False
+        if not self._partial:
+            return None
+        now = time.time()
+        records = self._take_partials(now - self.partial_line_timeout)
+        if records:
+            self._write_records(records)
+        if not self._partial:
+            return None
+        self._partial_flush_scheduled = True
+        return max(0.0, min(created for created, _ in self._partial.values()) + self.partial_line_timeout - now)
+    
+    def write(self, stream: str, text: str) -> None:
+        """Assemble captured text into lines and write one record per complete line.
+        
+        Args:
+            stream: Stream label written in front of each line, e.g. "STDOUT" or "STDERR"
+            text: Captured text, possibly a fragment of a line
+        """
+        if not text:
+            return
+        now = time.time()
+        
+        with self.lock:
+            # Lines left unterminated for too long are written on their own
+            records = self._take_partials(now - self.partial_line_timeout) if self._partial else []
+            
+            lines = text.split('\n')
+            partial = self._partial.pop(stream, None)
+            if partial is not None:
+                created, fragments = partial
+                fragments.append(lines[0])
+            else:
+                created, fragments = now, [lines[0]]
+            
+            if len(lines) == 1:
+                self._partial[stream] = (created, fragments)
+            else:
+                first = "".join(fragments)
+                if first.strip():
+                    records.append((created, stream, first))
+                for line in lines[1:-1]:
+                    if line.strip():
+                        records.append((now, stream, line))
+                if lines[-1]:
+                    self._partial[stream] = (now, [lines[-1]])
+            
+            if records:
+                self._write_records(records)
+            
+            # In async mode the writer thread's idle callback takes stale lines instead
+            if self._partial and self.async_writer is None and not self._partial_flush_scheduled:
+                self._partial_flush_scheduled = True
+                schedule_idle_flush(self, self.partial_line_timeout)
+    
+    def emit(self, stream: str, text: str, created: Optional[float] = None) -> None:
+        """Write a complete record to the log file, bypassing line assembly.
+        
+        Args:
+            stream: Stream label written in front of the text, e.g. "STDOUT" or "STDERR"
+            text: Captured line without a trailing newline
+            created: Capture time in seconds since the epoch (default: now)
+        """
+        record = (created if created is not None else time.time(), stream, text)
+        with self.lock:
+            self._write_records([record])
+    
+    def write_bytes(self, stream: str, data: Union[bytes, bytearray, memoryview]) -> None:
+        """Write binary output to the log file as one record, without decoding it.
+        
+        Any unterminated text line of the same stream is written first to keep the order.
+        
+        Args:
+            stream: Stream label written in front of the data, e.g. "STDOUT" or "STDERR"
+            data: Bytes-like object
+        """
+        if _pattern("_BLANK_BYTES").match(data):
+            return
+        if self.async_writer is not None:
+            # The caller may reuse its buffer once we return
+            data = bytes(data)
+        now = time.time()
+        
+        with self.lock:
+            records = []
+            partial = self._partial.pop(stream, None)
+            if partial is not None:
+                created, fragments = partial
+                line = "".join(fragments)
+                if line.strip():
+                    records.append((created, stream, line))
+            records.append((now, stream, data))
+            self._write_records(records)
+    
+    def _write_records(self, records: List[Tuple[float, str, Payload]]) -> None:
+        """Queue or write records. Must be called with the lock held."""
+        if self.async_writer is not None:
+            submit = self.async_writer.submit
+            for record in records:
+                payload = record[2]
+                submit(record, len(payload) if isinstance(payload, str) else memoryview(payload).nbytes)
+            return
+        
+        try:
+            self.writer.writelines([chunk for record in records for chunk in self._format_record(record)])
+            self.written_records += len(records)
+        except Exception:
+            # If we can't write to log file, don't crash the application
+            self.write_errors += 1
+    
+    def flush(self) -> None:
+        """Write any unterminated lines and flush buffered log output.
+        
+        In async mode the log file is flushed by the writer thread, so this does not wait for it.
+        """
+        with self.lock:
+            if self._partial:
+                self._write_records(self._take_partials())
+            if self.async_writer is not None:
+                return
+            try:
+                self.writer.flush()
+            except Exception:
+                pass
+    
+    def close(self) -> None:
+        """Write any unterminated lines, then flush and close the log file writer.
+        
+        Further captured output is discarded. In async mode all records queued so far
+        are written before the file is closed.
+        """
+        with self.lock:
+            if self._partial:
+                self._write_records(self._take_partials())
+        if self.async_writer is not None:
+            self.async_writer.close()
+        with self.lock:
+            try:
+                self.writer.close()
+            except Exception:
+                pass
+        atexit.unregister(self.close)
+    
+    def reset_after_fork(self, path: Optional[Path] = None) -> None:
+        """Start over in a child created with os.fork().
+        
+        The lock is replaced in case a parent thread held it, unterminated lines
+        and buffered output are left for the parent to write, and the async
+        writer thread is restarted.
+        
+        Args:
+            path: Log file to write from now on (default: the same file)
+        """
+        self.lock = threading.Lock()
+        self._partial = {}
+        self._partial_flush_scheduled = False
+        self.written_records = 0
+        self.write_errors = 0
+        self.writer.reset_after_fork(path)
+        if self.writer.lock is not None:
+            self.writer.lock = self.lock
+        if self.async_writer is not None:
+            self.async_writer.reset_after_fork()
+    
+    @property
+    def log_file_path(self) -> Path:
+        """Path of the log file currently written to; changes on rotation."""
+        return self.writer.path
+    
+    @property
+    def closed(self) -> bool:
+        """Check if the sink has been closed."""
+        return self.writer.closed
+
+
+class LogCapture:
+    """Captures stdout/stderr and redirects to both original stream and log file."""
+    
+    def __init__(self, original_stream: TextIO, log_file_path: Optional[Path] = None, remove_ansi: bool = True, tz: Optional[timezone] = None,
+                 stream_name: str = "STDOUT", sink: Optional[CaptureSink] = None, stream_flush: str = "tty",
+                 stream_flush_interval: float = DEFAULT_STREAM_FLUSH_INTERVAL, **sink_options):
+        """Initialize LogCapture.
+        
+        Args:
+            original_stream: Original stdout/stderr stream
+            log_file_path: Path to log file for writing captured output. Ignored if sink is given.
+            remove_ansi: Whether to remove ANSI escape sequences from log file (default: True)
+            tz: Timezone for timestamps (default: UTC). Ignored if sink is given.
+            stream_name: Label for captured records, e.g. "STDOUT" or "STDERR" (default: "STDOUT")
+            sink: Shared CaptureSink to write through. If not provided, a private sink is created
+                  for log_file_path.
+            stream_flush: When to flush the original stream after a write (default: "tty")
+                - "always": after every write
+                - "tty": after every write if the original stream is a TTY, otherwise leave
+                         flushing to the stream's own buffering
+                - "newline": when the written text contains a newline
+                - "interval": at most once per stream_flush_interval seconds
+            stream_flush_interval: Seconds between flushes for the "interval" policy (default: 0.5)
+            **sink_options: Additional CaptureSink options used when creating a private sink
+                            (buffer_size, flush_policy, flush_interval, flush_threshold,
+                            async_capture, queue_size)
+        """
+        if stream_flush not in STREAM_FLUSH_POLICIES:
+            raise ValueError(f"stream_flush must be one of {STREAM_FLUSH_POLICIES}, got {stream_flush!r}")
+        if sink is None:
+            if log_file_path is None:
+                raise ValueError("Either log_file_path or sink must be provided")
+            sink = CaptureSink(log_file_path, tz=tz, **sink_options)
+        
+        self.original_stream = original_stream
+        self.sink = sink
+        self.timezone = sink.timezone
+        self.stream_name = stream_name
+        self.remove_ansi = remove_ansi
+        
+        # Resolve the "tty" policy once: interactive streams flush on every write,
+        # redirected ones (pipes, files) keep the interpreter's buffering
+        if stream_flush == "tty":
+            stream_flush = "always" if self.isatty() else None
+        self.stream_flush = stream_flush
+        self.stream_flush_interval = stream_flush_interval
+        self._last_stream_flush = time.monotonic()
+        self._buffer = None
         
         # Regex pattern to remove ANSI escape sequences (color codes)
         if self.remove_ansi:
-            self.ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+            self.ansi_escape = _pattern("ANSI_ESCAPE")
+    
+    @property
+    def log_file_path(self) -> Path:
+        """Path of the log file currently written to; changes on rotation."""
+        return self.sink.log_file_path
+    
+    @property
+    def lock(self) -> threading.Lock:
+        """Lock of the shared sink guarding the log file."""
+        return self.sink.lock
+    
+    @property
+    def writer(self) -> BufferedLogWriter:
+        """Log file writer of the shared sink."""
+        return self.sink.writer
+    
+    @property
+    def async_writer(self) -> Optional[AsyncLogWriter]:
+        """Background writer of the shared sink, if async capture is enabled."""
+        return self.sink.async_writer
     
     def _remove_ansi_codes(self, text: str) -> str:
         """Remove ANSI escape sequences from text.
         
         Args:
             text: Text that may contain ANSI escape sequences
-            
+        
         Returns:
             Text with ANSI escape sequences removed
         """
-        if self.remove_ansi and hasattr(self, 'ansi_escape'):
-            return self.ansi_escape.sub('', text)
+        if self.remove_ansi:
+            return remove_ansi_codes(text)
         return text
     
     def write(self, text: str) -> int:
@@ -53,36 +539,56 @@ class LogCapture:
         
         Args:
             text: Text to write
-            
+        
         Returns:
             Number of characters written to original stream
         """
         # Write to original stream (with color codes)
         result = self.original_stream.write(text)
-        self.original_stream.flush()
+        self._flush_original(self.original_stream, '\n' in text)
         
-        # Write to log file if text is not just whitespace
-        if text.strip():
-            # Remove ANSI escape sequences for log file if enabled
-            clean_text = self._remove_ansi_codes(text)
-            
-            with self.lock:
-                try:
-                    with open(self.log_file_path, 'a', encoding='utf-8') as f:
-                        # Add timestamp for stdout/stderr captures using specified timezone
-                        timestamp = datetime.now(self.timezone).strftime("%Y-%m-%d %H:%M:%S")
-                        f.write(f"[{timestamp}] STDOUT: {clean_text}")
-                        if not clean_text.endswith('\n'):
-                            f.write('\n')
-                except Exception:
-                    # If we can't write to log file, don't crash the application
-                    pass
+        # Assemble into lines for the log file, removing ANSI escape sequences if enabled
+        self.sink.write(self.stream_name, self._remove_ansi_codes(text))
         
         return result
     
+    def _flush_original(self, stream, newline: bool) -> None:
+        """Flush the original stream (or its binary buffer) according to the stream flush policy.
+        
+        Args:
+            stream: Original text stream or its binary buffer
+            newline: Whether the written data contained a newline
+        """
+        stream_flush = self.stream_flush
+        if stream_flush == "always":
+            stream.flush()
+        elif stream_flush == "newline":
+            if newline:
+                stream.flush()
+        elif stream_flush == "interval":
+            now = time.monotonic()
+            if now - self._last_stream_flush >= self.stream_flush_interval:
+                self._last_stream_flush = now
+                stream.flush()
+    
+    @property
+    def buffer(self) -> "CaptureBuffer":
+        """Binary layer of the captured stream, like sys.stdout.buffer.
+        
+        Raises AttributeError if the original stream has no binary buffer.
+        """
+        if self._buffer is None:
+            self._buffer = CaptureBuffer(self, self.original_stream.buffer)
+        return self._buffer
+    
     def flush(self):
-        """Flush the original stream."""
+        """Flush the original stream and any buffered log output."""
         self.original_stream.flush()
+        self.sink.flush()
+    
+    def close_log(self):
+        """Close the log sink. Further output is only written to the original stream."""
+        self.sink.close()
     
     def fileno(self):
         """Get file descriptor of original stream."""
@@ -131,4 +637,56 @@ class LogCapture:
     
     def __getattr__(self, name):
         """Delegate any other attribute access to the original stream."""
-        return getattr(self.original_stream, name) 
\ No newline at end of file
+        return getattr(self.original_stream, name)
+
+
+class CaptureBuffer:
+    """Binary layer of a LogCapture, exposed as LogCapture.buffer.
+    
+    Accepts bytes, bytearray and memoryview and writes them to both the original
+    stream's binary buffer and the log file without converting them to str.
+    """
+    
+    def __init__(self, capture: LogCapture, original_buffer: BinaryIO):
+        """Initialize CaptureBuffer.
+        
+        Args:
+            capture: LogCapture this buffer belongs to
+            original_buffer: Binary buffer of the original stream
+        """
+        self.capture = capture
+        self.original_buffer = original_buffer
+    
+    def write(self, data: Union[bytes, bytearray, memoryview]) -> int:
+        """Write bytes to both the original binary buffer and the log file.
+        
+        Each call is logged as one record; ANSI escape sequences are removed if enabled.
+        
+        Args:
+            data: Bytes-like object to write
+        
+        Returns:
+            Number of bytes written to the original buffer
+        """
+        capture = self.capture
+        result = self.original_buffer.write(data)
+        capture._flush_original(self.original_buffer, True)
+        
+        if capture.remove_ansi and _pattern("_ESC_BYTES").search(data):
+            data = _pattern("ANSI_ESCAPE_BYTES").sub(b'', data)
+        capture.sink.write_bytes(capture.stream_name, data)
+        
+        return result
+    
+    def flush(self):
+        """Flush the original buffer and any buffered log output."""
+        self.original_buffer.flush()
+        self.capture.sink.flush()
+    
+    def writable(self) -> bool:
+        """Check if the original buffer is writable."""
+        return self.original_buffer.writable()
+    
+    def __getattr__(self, name):
+        """Delegate any other attribute access to the original buffer."""
+        return getattr(self.original_buffer, name)
\ No newline at end of file
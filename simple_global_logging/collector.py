@@ -0,0 +1,461 @@
+"""
+Multiprocess log collection for simple_global_logging.
+
+The process that calls setup_logging(collector=True) starts a LogCollector: a
+thread listening on a local socket that hands records received from other
+processes to the root logger's handlers, so a single writer produces the log
+file. The collector's address is published in the SIMPLE_GLOBAL_LOGGING_COLLECTOR
+environment variable, which child processes inherit. When a child calls
+setup_logging, it installs a CollectorHandler that forwards its records in
+batches instead of opening a log file of its own.
+
+Each connection starts with a random token from the environment variable, so
+other local users cannot inject records. Frames are a 4-byte big-endian length
+followed by a pickled list of LogRecord attribute dicts.
+"""
+
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import atexit
+import hmac
+import json
+import logging
+import os
+import pickle
+import secrets
+import selectors
+import shutil
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+from simple_global_logging.formatters import _RECORD_ATTRIBUTES, RATE_LIMIT_ATTRIBUTE
+from simple_global_logging.utils import COLLECTOR_ENV
+
+
+DEFAULT_BATCH_SIZE = 512
+DEFAULT_BATCH_INTERVAL = 0.05
+
+_LENGTH = struct.Struct(">I")
+_MAX_FRAME = 64 * 1024 * 1024
+_PORTABLE_TYPES = frozenset((str, int, float, bool, type(None), bytes))
+
+
+def collector_config() -> Optional[Dict[str, Any]]:
+    """Get the configuration of a collector run by another process.
+    
+    Returns:
+        Dictionary with address, token, pid and log_file, or None if no collector
+        was published to this process
+    """
+    value = os.environ.get(COLLECTOR_ENV)
+    if not value:
+        return None
+    try:
+        config = json.loads(value)
+    except ValueError:
+        return None
+    if config.get("pid") == os.getpid():
+        return None
+    return config
+
+
+def _connect(address: str) -> socket.socket:
+    """Connect to a collector address ("unix:PATH" or "tcp:HOST:PORT")."""
+    kind, _, target = address.partition(":")
+    if kind == "unix":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(target)
+    else:
+        host, _, port = target.rpartition(":")
+        sock = socket.create_connection((host, int(port)))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def _frame(payload: bytes) -> bytes:
+    """Prefix a payload with its length."""
+    return _LENGTH.pack(len(payload)) + payload
+
+
+class LogCollector:
+    """Receives records from other processes and logs them in this one.
+    
+    Records are handed to the root logger's handlers on the collector thread in
+    the order they arrive; records of one process keep their order.
+    """
+    
+    def __init__(self, log_file: Optional[Path] = None, logger: Optional[logging.Logger] = None):
+        """Initialize LogCollector, start listening and publish the address.
+        
+        Args:
+            log_file: Log file reported to child processes by get_current_log_file()
+            logger: Logger whose handlers write received records (default: root logger)
+        """
+        self.logger = logger if logger is not None else logging.getLogger()
+        self.token = secrets.token_hex(16)
+        self.pid = os.getpid()
+        self.received_records = 0
+        self.connections = 0
+        
+        self._directory: Optional[str] = None
+        if hasattr(socket, "AF_UNIX"):
+            # A private directory keeps the socket away from other users
+            self._directory = tempfile.mkdtemp(prefix="sgl-")
+            path = os.path.join(self._directory, "collector.sock")
+            self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._server.bind(path)
+            self.address = f"unix:{path}"
+        else:
+            self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._server.bind(("127.0.0.1", 0))
+            self.address = "tcp:127.0.0.1:%d" % self._server.getsockname()[1]
+        self._server.listen(128)
+        self._server.setblocking(False)
+        
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ)
+        self._wakeup_read, self._wakeup_write = socket.socketpair()
+        self._selector.register(self._wakeup_read, selectors.EVENT_READ)
+        self._stopped = False
+        
+        os.environ[COLLECTOR_ENV] = json.dumps({
+            "address": self.address,
+            "token": self.token,
+            "pid": self.pid,
+            "log_file": str(log_file) if log_file is not None else None,
+        })
+        self._thread = threading.Thread(target=self._run, name="simple_global_logging-collector", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop accepting records, handle what was received and remove the socket.
+        
+        Called automatically at interpreter exit. In a forked child only the
+        inherited descriptors are closed.
+        
+        Args:
+            timeout: Seconds to wait for the collector thread (default: 5.0)
+        """
+        if self._stopped:
+            return
+        self._stopped = True
+        atexit.unregister(self.stop)
+        if os.getpid() != self.pid:
+            for sock in (self._server, self._wakeup_read, self._wakeup_write):
+                sock.close()
+            return
+        
+        try:
+            self._wakeup_write.send(b"x")
+        except OSError:
+            pass
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        if self.token in os.environ.get(COLLECTOR_ENV, ""):
+            del os.environ[COLLECTOR_ENV]
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+    
+    def _run(self) -> None:
+        """Collector thread: accept connections and dispatch received batches."""
+        buffers: Dict[socket.socket, Tuple[bytearray, List[bool]]] = {}
+        try:
+            while True:
+                for key, _ in self._selector.select():
+                    sock = key.fileobj
+                    if sock is self._server:
+                        self._accept(buffers)
+                    elif sock is self._wakeup_read:
+                        # Stopping: drain what the open connections already sent
+                        self._drain(buffers)
+                        return
+                    else:
+                        self._receive(sock, buffers)
+        finally:
+            for sock in list(buffers):
+                self._close(sock, buffers)
+            self._selector.close()
+            for sock in (self._server, self._wakeup_read, self._wakeup_write):
+                sock.close()
+    
+    def _accept(self, buffers: Dict[socket.socket, Tuple[bytearray, List[bool]]]) -> None:
+        """Accept a pending connection."""
+        try:
+            conn, _ = self._server.accept()
+        except OSError:
+            return
+        conn.setblocking(False)
+        # Buffer, [authenticated]
+        buffers[conn] = (bytearray(), [False])
+        self._selector.register(conn, selectors.EVENT_READ)
+        self.connections += 1
+    
+    def _receive(self, sock: socket.socket, buffers: Dict[socket.socket, Tuple[bytearray, List[bool]]]) -> bool:
+        """Read from a connection and handle its complete frames.
+        
+        Returns:
+            True if data was read; False if none was available or the connection is closed
+        """
+        try:
+            data = sock.recv(1024 * 1024)
+        except BlockingIOError:
+            return False
+        except OSError:
+            data = b""
+        if not data:
+            self._close(sock, buffers)
+            return False
+        
+        buffer, authenticated = buffers[sock]
+        buffer += data
+        position = 0
+        while len(buffer) - position >= 4:
+            (length,) = _LENGTH.unpack_from(buffer, position)
+            if length > _MAX_FRAME:
+                self._close(sock, buffers)
+                return False
+            end = position + 4 + length
+            if len(buffer) < end:
+                break
+            payload = bytes(buffer[position + 4:end])
+            position = end
+            if not authenticated[0]:
+                if not hmac.compare_digest(payload, self.token.encode("ascii")):
+                    self._close(sock, buffers)
+                    return False
+                authenticated[0] = True
+                continue
+            self._dispatch(payload)
+        del buffer[:position]
+        return True
+    
+    def _drain(self, buffers: Dict[socket.socket, Tuple[bytearray, List[bool]]]) -> None:
+        """Handle data already sent on every connection."""
+        for sock in list(buffers):
+            while self._receive(sock, buffers):
+                pass
+    
+    def _close(self, sock: socket.socket, buffers: Dict[socket.socket, Tuple[bytearray, List[bool]]]) -> None:
+        """Close a connection."""
+        buffers.pop(sock, None)
+        try:
+            self._selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+        sock.close()
+    
+    def _dispatch(self, payload: bytes) -> None:
+        """Log the records of a batch with the logger's handlers."""
+        try:
+            batch = pickle.loads(payload)
+        except Exception:
+            return
+        logger = self.logger
+        new_record = logging.LogRecord.__new__
+        for attributes in batch:
+            try:
+                # The attributes are complete, so LogRecord.__init__ is skipped
+                record = new_record(logging.LogRecord)
+                record.__dict__.update(attributes)
+                logger.handle(record)
+            except Exception:
+                pass
+        self.received_records += len(batch)
+
+
+class CollectorHandler(logging.Handler):
+    """logging.Handler forwarding records to a LogCollector in another process.
+    
+    emit() only appends the record to a buffer; a sender thread pickles the
+    buffered records and sends them in batches of up to batch_size, at least
+    every batch_interval seconds. Messages whose arguments are plain builtin
+    values are sent as template and arguments, like the binary format stores
+    them; other messages are rendered before sending. Exception tracebacks are
+    sent as text.
+    """
+    
+    def __init__(self, address: str, token: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 batch_interval: float = DEFAULT_BATCH_INTERVAL):
+        """Initialize CollectorHandler and start its sender thread.
+        
+        Args:
+            address: Collector address from collector_config()
+            token: Collector token from collector_config()
+            batch_size: Maximum records per batch (default: 512)
+            batch_interval: Seconds a record may wait for a batch to fill (default: 0.05)
+        """
+        super().__init__()
+        self.address = address
+        self.token = token
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.sent_records = 0
+        self.dropped_records = 0
+        
+        self._records = deque()
+        self._condition = threading.Condition(threading.Lock())
+        self._sending = 0
+        self._closed = False
+        self._socket: Optional[socket.socket] = None
+        self._exception_formatter = logging.Formatter()
+        self._thread = threading.Thread(target=self._run, name="simple_global_logging-forwarder", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        if "multiprocessing" in sys.modules:
+            # multiprocessing children leave with os._exit(), skipping atexit
+            from multiprocessing import util
+            util.Finalize(self, self.close, exitpriority=10)
+    
+    def prepare(self, record: logging.LogRecord) -> Dict[str, Any]:
+        """Convert a record into picklable attributes.
+        
+        Args:
+            record: Log record
+        
+        Returns:
+            Attribute dictionary for logging.makeLogRecord()
+        """
+        attributes = record.__dict__.copy()
+        msg, args = record.msg, record.args
+        if not (type(msg) is str and _portable(args)):
+            attributes["msg"] = record.getMessage()
+            attributes["args"] = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            attributes["exc_text"] = record.exc_text
+        attributes["exc_info"] = None
+        attributes.pop("message", None)
+        attributes.pop("asctime", None)
+        # The decision of this process's rate limit filter, which the collector does not share
+        attributes.pop(RATE_LIMIT_ATTRIBUTE, None)
+        for key in attributes.keys() - _RECORD_ATTRIBUTES:
+            # Fields passed with extra= arrive as text unless they are plain values
+            if type(attributes[key]) not in _PORTABLE_TYPES:
+                attributes[key] = str(attributes[key])
+        return attributes
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Buffer a record for the sender thread.
+        
+        Args:
+            record: Log record
+        """
+        try:
+            attributes = self.prepare(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._condition:
+            if self._closed:
+                return
+            self._records.append(attributes)
+            if len(self._records) >= self.batch_size:
+                self._condition.notify()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the buffered records have been sent.
+        
+        Args:
+            timeout: Maximum seconds to wait (default: 5.0)
+        
+        Returns:
+            True if everything was sent within the timeout
+        """
+        deadline = time.monotonic() + (5.0 if timeout is None else timeout)
+        with self._condition:
+            self._condition.notify()
+            while (self._records or self._sending) and self._thread.is_alive():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+    
+    def close(self) -> None:
+        """Send the buffered records and close the connection."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        atexit.unregister(self.close)
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(5.0)
+        super().close()
+    
+    def reset_after_fork(self) -> None:
+        """Start over in a child created with os.fork().
+        
+        The parent's buffered records are left for the parent to send, and the
+        child opens a connection of its own: frames written by two processes
+        to one socket would interleave.
+        """
+        self._records = deque()
+        self._condition = threading.Condition(threading.Lock())
+        self._sending = 0
+        self.sent_records = 0
+        self.dropped_records = 0
+        self._disconnect()
+        if not self._closed:
+            self._thread = threading.Thread(target=self._run, name="simple_global_logging-forwarder", daemon=True)
+            self._thread.start()
+    
+    def _run(self) -> None:
+        """Sender thread: send buffered records in batches."""
+        condition = self._condition
+        records = self._records
+        while True:
+            with condition:
+                if not records and not self._closed:
+                    condition.wait(self.batch_interval)
+                if not records:
+                    if self._closed:
+                        break
+                    continue
+                batch = [records.popleft() for _ in range(min(len(records), self.batch_size))]
+                self._sending = len(batch)
+            try:
+                self._send(pickle.dumps(batch, pickle.HIGHEST_PROTOCOL))
+                self.sent_records += len(batch)
+            except Exception:
+                self.dropped_records += len(batch)
+                self._disconnect()
+            with condition:
+                self._sending = 0
+                condition.notify_all()
+        self._disconnect()
+    
+    def _send(self, payload: bytes) -> None:
+        """Send a batch, connecting first if needed."""
+        if self._socket is None:
+            sock = _connect(self.address)
+            sock.sendall(_frame(self.token.encode("ascii")))
+            self._socket = sock
+        self._socket.sendall(_frame(payload))
+    
+    def _disconnect(self) -> None:
+        """Close the connection to the collector."""
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except OSError:
+                pass
+            self._socket = None
+
+
+def _portable(args: Any) -> bool:
+    """Check if message arguments can be sent as they are."""
+    if args is None:
+        return True
+    if type(args) is tuple:
+        return all(type(arg) in _PORTABLE_TYPES for arg in args)
+    if type(args) is dict:
+        return all(type(key) is str and type(value) in _PORTABLE_TYPES for key, value in args.items())
+    return False
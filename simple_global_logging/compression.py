@@ -0,0 +1,342 @@
+"""
+Background compression of finished log files for simple_global_logging.
+"""
+
+from collections import deque
+from pathlib import Path
+from typing import Callable, Optional, Union
+import atexit
+import errno
+import gzip
+import lzma
+import os
+import re
+import shutil
+import threading
+import time
+
+from simple_global_logging.utils import lower_thread_priority
+from simple_global_logging.writers import lock_file
+
+
+# Compression formats supported by LogCompressor, with their file suffixes
+COMPRESSION_FORMATS = ("gzip", "lzma")
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "lzma": ".xz"}
+
+# Files from earlier runs are only queued when unmodified for this many seconds; files
+# another process still holds open are skipped when compressed, whatever their age
+STALE_LOG_AGE = 300.0
+
+_CHUNK_SIZE = 1024 * 1024
+_LOG_NAME = re.compile(r'\d{8}-\d{7}\.log\Z')
+_TEMP_NAME = re.compile(r'\d{8}-\d{7}\.log\.(gz|xz)\.tmp\Z')
+_TEMP_SUFFIX = ".tmp"
+
+
+def compressed_path(path: Union[str, Path], compression: str = "gzip") -> Path:
+    """Get the archive path for a log file.
+    
+    Args:
+        path: Log file
+        compression: "gzip" or "lzma" (default: "gzip")
+    
+    Returns:
+        Path with ".gz" or ".xz" appended
+    """
+    path = Path(path)
+    return path.with_name(path.name + COMPRESSION_SUFFIXES[compression])
+
+
+def compress_file(path: Union[str, Path], compression: str = "gzip", level: Optional[int] = None) -> int:
+    """Compress a log file next to itself and remove the original.
+    
+    The archive is written to a temporary file, synced to disk and renamed into
+    place before the original is deleted, so a crash leaves either the original,
+    or the original and a complete archive; never a partial archive under the
+    final name. Leftover temporary files are removed by LogCompressor.scan().
+    
+    The original is compressed under an exclusive lock. Writers of this package
+    hold a shared lock on the files they append to, in any process, so a file
+    still open for writing is refused instead of being archived while it grows.
+    
+    Args:
+        path: Log file to compress
+        compression: "gzip" or "lzma" (default: "gzip")
+        level: Compression level (default: 6 for both formats)
+    
+    Returns:
+        Size of the archive in bytes
+    
+    Raises:
+        BlockingIOError: If a writer still has the file open
+    """
+    if compression not in COMPRESSION_FORMATS:
+        raise ValueError(f"compression must be one of {COMPRESSION_FORMATS}, got {compression!r}")
+    path = Path(path)
+    target = compressed_path(path, compression)
+    temp = target.with_name(target.name + _TEMP_SUFFIX)
+    if level is None:
+        level = 6
+    
+    try:
+        with open(path, 'rb') as source:
+            if not lock_file(source.fileno(), exclusive=True):
+                raise BlockingIOError(errno.EWOULDBLOCK, "Log file is still open for writing", str(path))
+            with open(temp, 'wb') as raw:
+                if compression == "gzip":
+                    archive = gzip.GzipFile(filename=path.name, mode='wb', fileobj=raw, compresslevel=level)
+                else:
+                    archive = lzma.LZMAFile(raw, mode='wb', preset=level)
+                with archive:
+                    shutil.copyfileobj(source, archive, _CHUNK_SIZE)
+                raw.flush()
+                os.fsync(raw.fileno())
+            os.replace(temp, target)
+            _fsync_directory(path.parent)
+            # Still locked: a writer waiting for the lock finds the file removed and creates a new one
+            os.unlink(path)
+    except BaseException:
+        try:
+            os.unlink(temp)
+        except OSError:
+            pass
+        raise
+    return target.stat().st_size
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Make a rename in a directory durable, where the platform supports it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class LogCompressor:
+    """Compresses finished log files on a low-priority background thread.
+    
+    submit() and scan_in_background() only append to a queue, so neither
+    logging nor setup waits for the directory or for compression. Files still
+    open for writing are skipped (see compress_file) and left for a later scan.
+    On Linux the thread lowers its own scheduling priority; zlib and
+    lzma release the GIL while compressing, so other threads keep running.
+    """
+    
+    def __init__(self, compression: str = "gzip", level: Optional[int] = None, nice: int = 10,
+                 on_compressed: Optional[Callable[[Path, Path], None]] = None):
+        """Initialize LogCompressor and start its thread.
+        
+        Args:
+            compression: "gzip" or "lzma" (default: "gzip")
+            level: Compression level (default: 6)
+            nice: Niceness added to the compression thread on Linux (default: 10)
+            on_compressed: Called on the compression thread with the removed log file
+                           and its archive after each compression (default: none)
+        """
+        if compression not in COMPRESSION_FORMATS:
+            raise ValueError(f"compression must be one of {COMPRESSION_FORMATS}, got {compression!r}")
+        self.compression = compression
+        self.level = level
+        self.nice = nice
+        self.on_compressed = on_compressed
+        
+        self.compressed_files = 0
+        self.skipped_files = 0
+        self.failed_files = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.current_file: Optional[Path] = None
+        
+        self._paths = deque()
+        # Arguments of the scans waiting for the thread, and whether one is running
+        self._scans = deque()
+        self._scanning = False
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="simple_global_logging-compressor", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+    
+    def submit(self, path: Union[str, Path]) -> None:
+        """Queue a closed log file for compression.
+        
+        Args:
+            path: Log file nothing writes to any more
+        """
+        with self._condition:
+            if self._stopped:
+                return
+            self._paths.append(Path(path))
+            self._condition.notify()
+    
+    def scan_in_background(self, base_dir: Union[str, Path], exclude: Optional[Union[str, Path]] = None,
+                           min_age: float = STALE_LOG_AGE) -> None:
+        """Run scan() on the compression thread, before the files queued after this call.
+        
+        Args:
+            base_dir: Log directory
+            exclude: Log file of the current run (default: none)
+            min_age: Skip files modified less than this many seconds ago (default: 300)
+        """
+        with self._condition:
+            if self._stopped:
+                return
+            self._scans.append((base_dir, exclude, min_age))
+            self._condition.notify()
+    
+    def scan(self, base_dir: Union[str, Path], exclude: Optional[Union[str, Path]] = None,
+             min_age: float = STALE_LOG_AGE) -> int:
+        """Queue the YYYYMMDD-serial log files left by earlier runs.
+        
+        Lists the directory on the calling thread; see scan_in_background().
+        Leftover temporary archives are removed. Log files whose archive was
+        completed before a crash prevented the original from being deleted are
+        compressed again.
+        
+        Args:
+            base_dir: Log directory
+            exclude: Log file of the current run (default: none)
+            min_age: Skip files modified less than this many seconds ago (default: 300)
+        
+        Returns:
+            Number of files queued
+        """
+        exclude = Path(exclude).resolve() if exclude is not None else None
+        cutoff = time.time() - min_age
+        queued = 0
+        try:
+            entries = sorted(Path(base_dir).iterdir())
+        except OSError:
+            return 0
+        for entry in entries:
+            name = entry.name
+            try:
+                if _TEMP_NAME.match(name):
+                    if entry.stat().st_mtime < cutoff:
+                        entry.unlink()
+                    continue
+                if not _LOG_NAME.match(name) or entry.resolve() == exclude:
+                    continue
+                if entry.stat().st_mtime >= cutoff:
+                    continue
+            except OSError:
+                continue
+            self.submit(entry)
+            queued += 1
+        return queued
+    
+    def stats(self) -> dict:
+        """Get compression counters.
+        
+        Returns:
+            Dictionary with queued_files (waiting or in progress), compressed_files,
+            skipped_files (still open for writing), failed_files, bytes_in,
+            bytes_out and current_file (or None)
+        """
+        with self._condition:
+            return {
+                "queued_files": len(self._paths) + (self.current_file is not None),
+                "compressed_files": self.compressed_files,
+                "skipped_files": self.skipped_files,
+                "failed_files": self.failed_files,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "current_file": self.current_file,
+            }
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued scan has run and every queued file has been compressed.
+        
+        Args:
+            timeout: Maximum seconds to wait (default: wait indefinitely)
+        
+        Returns:
+            True if the queue was drained within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._scans or self._scanning or self._paths or self.current_file is not None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the thread after the file in progress; queued files are left for the next run's scan.
+        
+        Called automatically at interpreter exit.
+        
+        Args:
+            timeout: Seconds to wait for the file in progress (default: 5.0)
+        """
+        with self._condition:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._paths.clear()
+            self._scans.clear()
+            self._condition.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        atexit.unregister(self.stop)
+    
+    def _run(self) -> None:
+        """Compression thread: run queued scans, then compress queued files one at a time."""
+        lower_thread_priority(self.nice)
+        while True:
+            with self._condition:
+                while not (self._scans or self._paths or self._stopped):
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                if self._scans:
+                    scan = self._scans.popleft()
+                    self._scanning = True
+                else:
+                    scan = None
+                    path = self.current_file = self._paths.popleft()
+            
+            if scan is not None:
+                try:
+                    self.scan(*scan)
+                except Exception:
+                    pass
+                with self._condition:
+                    self._scanning = False
+                    self._condition.notify_all()
+                continue
+            
+            skipped = False
+            try:
+                size = path.stat().st_size
+                compressed = compress_file(path, self.compression, self.level)
+            except BlockingIOError:
+                size = compressed = None
+                skipped = True
+            except Exception:
+                size = compressed = None
+            
+            if compressed is not None and self.on_compressed is not None:
+                try:
+                    self.on_compressed(path, compressed_path(path, self.compression))
+                except Exception:
+                    pass
+            
+            with self._condition:
+                if skipped:
+                    self.skipped_files += 1
+                elif compressed is None:
+                    self.failed_files += 1
+                else:
+                    self.compressed_files += 1
+                    self.bytes_in += size
+                    self.bytes_out += compressed
+                self.current_file = None
+                self._condition.notify_all()
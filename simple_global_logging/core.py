@@ -2,25 +2,66 @@
 Core logging functionality for simple_global_logging.
 """
 
+import atexit
 import logging
+import os
 import sys
 from pathlib import Path
-from datetime import datetime, timezone, timedelta
-from typing import Optional
+from datetime import timezone
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Sequence, Set, Union
 
-from simple_global_logging.utils import generate_log_filename
-from simple_global_logging.capture import LogCapture
+from simple_global_logging.formatters import FastFormatter, FILE_FORMATS, JsonLinesFormatter
+from simple_global_logging.loggers import LoggerPolicy
+from simple_global_logging.capture import CaptureSink, LogCapture
+from simple_global_logging.options import CaptureOptions, RetentionOptions, RotationOptions, resolve_options
+from simple_global_logging.writers import (
+    DEFAULT_LOG_QUEUE_SIZE,
+    FILE_WRITERS,
+    LockedFileHandler,
+    close_inherited,
+    open_mmap_file
+)
+
+if TYPE_CHECKING:
+    from simple_global_logging.ratelimit import RateLimit
+
+# Modules behind optional features (async mode, binary files, rotation,
+# compression, retention, collector mode, fd capture, rate limits) are
+# imported by the setup that uses them, which keeps importing the package
+# cheap for short-lived programs
 
 # Global variables to track state
 _logging_initialized = False
 _stdout_captured = False
 _original_stdout = None
 _original_stderr = None
+_capture_sink = None
+_fd_capture = None
+_console_handler = None
+_file_handler = None
+_queue_handler = None
+_queue_listener = None
 _log_file_path = None
 _current_timezone = None
+_rotator = None
+_compressor = None
+_collector = None
+_forwarding = False
+_per_pid_files = False
+_pruner = None
+_logger_policy = None
+_rate_limit_filter = None
 
 
-def setup_logging(verbose: bool = False, base_dir: str = "out", tz: Optional[timezone] = None, filename: Optional[str] = None) -> logging.Logger:
+def setup_logging(verbose: bool = False, base_dir: str = "out", tz: Optional[timezone] = None, filename: Optional[str] = None,
+                  async_mode: bool = False, queue_size: int = DEFAULT_LOG_QUEUE_SIZE, file_format: str = "text",
+                  context: Optional[Dict[str, Any]] = None,
+                  rotation: Union[RotationOptions, Mapping[str, Any], None] = None,
+                  retention: Union[RetentionOptions, Mapping[str, Any], None] = None,
+                  file_writer: str = "stream", collector: bool = False,
+                  per_pid_files: bool = False, logger_policy: str = "eager",
+                  logger_levels: Optional[Dict[str, Union[int, str]]] = None,
+                  rate_limits: Optional[Sequence[Union["RateLimit", Mapping[str, Any]]]] = None) -> logging.Logger:
     """Setup logging configuration for both console and file output.
     
     Args:
@@ -29,17 +70,131 @@ def setup_logging(verbose: bool = False, base_dir: str = "out", tz: Optional[tim
         tz: Timezone for timestamps (default: UTC)
         filename: Optional specific filename for the log file. If provided, logs will be appended to this file.
                  If not provided, a new timestamped file will be created.
-        
+        async_mode: Format and write records on a background listener thread. The root logger only gets
+                    a queue handler, so logging calls never wait for the console or the disk unless the
+                    queue is full. Use flush_logging()/stop_logging(); the queue is drained at exit (default: False)
+        queue_size: Maximum number of records queued in async mode (default: 10000)
+        file_format: Log file format; the console always gets text (default: "text")
+            - "text": "asctime - level - name - message" lines
+            - "jsonl": one JSON object per line with the keys time, level, logger, stream and
+              message, plus exception, stack, extra (fields passed with extra=) and context
+            - "binary": compact length-prefixed records storing message templates and arguments;
+              render them with `python -m simple_global_logging decode FILE`
+        context: Fields written under "context" on every JSON line, e.g. {"service": "api"} (default: none)
+        rotation: Roll over to the next YYYYMMDD-serial file by size or at midnight, as a
+                  RotationOptions object or a dictionary of its arguments, e.g. {"max_bytes":
+                  10_000_000, "at_midnight": True}. Not supported together with filename
+                  (default: no rotation)
+        retention: Compress and remove finished log files, as a RetentionOptions object or a
+                   dictionary of its arguments, e.g. {"compress": "gzip", "max_age_days": 30}
+                   (default: keep every file uncompressed)
+        file_writer: How the log file is written (default: "stream")
+            - "stream": a regular file, one write() per record
+            - "mmap": records are copied into a memory-mapped file preallocated in 4 MiB chunks,
+              without a system call per record. The file has a NUL-padded tail until it is closed
+              (at exit, or when the next run reopens it after a crash). "text" and "jsonl" only.
+              Only one process may have the file open: with a filename another process is
+              writing, setup_logging raises RuntimeError before changing any handlers
+        collector: Collect the records of child processes into this process's log file (default: False).
+                   Starts a listener on a local socket and publishes its address in the
+                   SIMPLE_GLOBAL_LOGGING_COLLECTOR environment variable. In processes that inherit it,
+                   setup_logging() ignores the other arguments except verbose and installs a handler
+                   forwarding records in batches, so worker processes never open the log file themselves.
+                   Children created with os.fork() switch to forwarding on their own.
+        per_pid_files: Let each child created with os.fork() write to a log file of its own, named
+                       after the current one and the child's PID, e.g. 20240501-0000001.12345.log
+                       (default: False). The parent does no extra work; the child opens the file
+                       with its first record. Children always get their own file with
+                       file_format="binary", file_writer="mmap" or rotation, which cannot be shared.
+                       Otherwise children append to the parent's file. Either way rotation and
+                       compression stay with the parent, locks held at fork time are replaced and
+                       background writer threads are restarted in the child.
+        logger_policy: How child loggers are made to propagate to the root without handlers of
+                       their own. "eager" updates every existing logger now; loggers created or
+                       changed later keep the handlers they are given. "lazy" walks no loggers and
+                       enforces the rules on later changes: new child loggers, and existing ones on
+                       their first record or addHandler() call, get a logger class that ignores
+                       addHandler() (with a RuntimeWarning) and propagate = False (default: "eager")
+        logger_levels: Logger name -> level, e.g. {"botocore": "WARNING"}. These loggers keep
+                       their handlers and propagation; loggers below them inherit the level
+                       (default: {"urllib3": logging.INFO})
+        rate_limits: Token bucket limits per logger name prefix and level, as RateLimit objects or
+                     dictionaries of their arguments, e.g. [{"prefix": "app.db", "rate": 10,
+                     "burst": 100, "level": "WARNING", "sample": 1000}]. Records of a logger and
+                     message template beyond the limit are dropped before they are formatted, and a
+                     summary of the suppressed records is logged every minute (default: no limit)
+    
     Returns:
         Root logger instance
     """
-    global _logging_initialized, _log_file_path, _current_timezone
+    global _logging_initialized, _log_file_path, _current_timezone, _console_handler, _queue_handler, _queue_listener
+    global _rotator, _compressor, _file_handler, _collector, _forwarding, _per_pid_files, _pruner
+    global _rate_limit_filter
+    
+    policy = LoggerPolicy(logger_policy, logger_levels)
+    rotation = resolve_options(rotation, RotationOptions)
+    retention = resolve_options(retention, RetentionOptions)
+    compress = retention.compress
+    rate_limit_filter = None
+    if rate_limits:
+        from simple_global_logging.ratelimit import RateLimitFilter
+        rate_limit_filter = RateLimitFilter(rate_limits)
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"file_format must be one of {FILE_FORMATS}, got {file_format!r}")
+    if compress is not None:
+        from simple_global_logging.compression import COMPRESSION_FORMATS, LogCompressor
+        if compress not in COMPRESSION_FORMATS:
+            raise ValueError(f"compress must be one of {COMPRESSION_FORMATS}, got {compress!r}")
+    if file_writer not in FILE_WRITERS:
+        raise ValueError(f"file_writer must be one of {FILE_WRITERS}, got {file_writer!r}")
+    if file_writer == "mmap" and file_format == "binary":
+        raise ValueError("file_writer='mmap' is not supported for binary log files")
+    rotate = rotation.enabled
+    if rotate and filename:
+        raise ValueError("rotation cannot be used with a custom filename")
+    prune_files = retention.prunes
+    if prune_files:
+        from simple_global_logging.retention import LogPruner, check_limits
+        check_limits(retention.max_files, retention.max_age_days, retention.max_total_bytes)
+    
+    # Drain and stop the listener of a previous async setup
+    stop_logging()
+    if _collector is not None:
+        _collector.stop()
+        _collector = None
+    if _file_handler is not None:
+        # A memory-mapped file is truncated to its real length on close
+        logging.getLogger().removeHandler(_file_handler)
+        _file_handler.close()
+        _file_handler = None
+    if _rotator is not None:
+        _rotator.stop()
+        _rotator = None
+    if _compressor is not None:
+        _compressor.stop()
+        _compressor = None
+    if _pruner is not None:
+        _pruner.stop()
+        _pruner = None
+    _rate_limit_filter = rate_limit_filter
     
     # Default to UTC if no timezone specified
     if tz is None:
         tz = timezone.utc
     
     _current_timezone = tz
+    _per_pid_files = per_pid_files or rotate or file_format == "binary" or file_writer == "mmap"
+    
+    from simple_global_logging.utils import COLLECTOR_ENV, claim_log_file
+    
+    # A worker of a collecting process forwards its records instead of opening a file
+    config = None
+    if os.environ.get(COLLECTOR_ENV):
+        from simple_global_logging.collector import collector_config
+        config = collector_config()
+    _forwarding = config is not None
+    if _forwarding:
+        return _setup_forwarding(verbose, config, policy)
     
     # Create the base directory
     output_dir = Path(base_dir)
@@ -51,10 +206,38 @@ def setup_logging(verbose: bool = False, base_dir: str = "out", tz: Optional[tim
         log_file = output_dir / filename
     else:
         # Generate log file path with timestamp
-        log_file = generate_log_filename(base_dir, tz)
+        log_file = claim_log_file(base_dir, tz)
+    
+    # Lock a memory-mapped file before anything is started, so a file another
+    # process is writing is refused instead of trimmed under its mapping
+    mapped_file = open_mmap_file(log_file) if file_writer == "mmap" else None
     
     _log_file_path = log_file
     
+    if file_format == "binary":
+        from simple_global_logging.binary import BinaryLogHandler, header_record
+    
+    if compress:
+        _compressor = LogCompressor(compress, on_compressed=_compressed_log_file if prune_files else None)
+        _compressor.scan_in_background(base_dir, exclude=log_file)
+    
+    if rotate:
+        from simple_global_logging.rotation import LogRotator
+        _rotator = LogRotator(
+            log_file,
+            base_dir,
+            tz=tz,
+            max_bytes=rotation.max_bytes,
+            at_midnight=rotation.at_midnight,
+            preamble=(lambda: header_record(tz)) if file_format == "binary" else None,
+            on_rotate=_set_log_file_path,
+            on_finished=_finished_log_file if compress or prune_files else None
+        )
+    
+    if prune_files:
+        _pruner = LogPruner(base_dir, max_files=retention.max_files, max_age_days=retention.max_age_days,
+                            max_total_bytes=retention.max_total_bytes, exclude=_active_log_files)
+    
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG if verbose else logging.INFO)
@@ -63,35 +246,57 @@ def setup_logging(verbose: bool = False, base_dir: str = "out", tz: Optional[tim
     root_logger.handlers.clear()
     
     # Create formatters
-    verbose_formatter = logging.Formatter(
+    # asctime is rendered in the specified timezone and cached per second; the
+    # formatted line is reused when the console and file handlers share a formatter
+    verbose_formatter = FastFormatter(
         '%(asctime)s - %(levelname)s - %(name)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
+        datefmt='%Y-%m-%d %H:%M:%S',
+        tz=tz
     )
-    # Set the formatter to use specified timezone
-    verbose_formatter.converter = lambda *args: datetime.now(tz).timetuple()
     
-    simple_formatter = logging.Formatter('%(message)s')
+    simple_formatter = FastFormatter('%(message)s')
     
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(verbose_formatter if verbose else simple_formatter)
-    root_logger.addHandler(console_handler)
+    _console_handler = console_handler
     
     # File handler
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setFormatter(verbose_formatter)
-    root_logger.addHandler(file_handler)
-
+    if file_format == "binary":
+        file_handler = BinaryLogHandler(log_file, tz=tz, rotator=_rotator)
+    else:
+        if file_writer == "mmap" or _rotator is not None:
+            from simple_global_logging.handlers import LogFileHandler, RotatingLogFileHandler
+        if file_writer == "mmap":
+            file_handler = LogFileHandler(log_file, file_writer="mmap", rotator=_rotator)
+            file_handler.writer.open()
+            mapped_file.close()
+        elif _rotator is not None:
+            file_handler = RotatingLogFileHandler(log_file, _rotator, encoding='utf-8')
+        else:
+            file_handler = LockedFileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(verbose_formatter if file_format == "text" else JsonLinesFormatter(tz, context))
+    _file_handler = file_handler
+    
+    if async_mode:
+        # The listener thread owns the console and file handlers
+        from simple_global_logging.handlers import create_queue_logging
+        _queue_handler, _queue_listener = create_queue_logging([console_handler, file_handler], queue_size)
+        root_logger.addHandler(_queue_handler)
+        atexit.unregister(stop_logging)
+        atexit.register(stop_logging)
+    else:
+        root_logger.addHandler(console_handler)
+        root_logger.addHandler(file_handler)
+    _add_rate_limit_filter(root_logger)
+    
     # Ensure all child loggers propagate to root
-    for name in logging.root.manager.loggerDict:
-        logger = logging.getLogger(name)
-        if name == "urllib3":
-            logger.setLevel(logging.INFO)
-            continue
-        logger.propagate = True
-        # Remove any existing handlers from child loggers
-        logger.handlers.clear()
-
+    _set_logger_policy(policy)
+    
+    if collector:
+        from simple_global_logging.collector import LogCollector
+        _collector = LogCollector(log_file)
+    
     root_logger.info(f"Logging started. Output file: {log_file}")
     if verbose:
         root_logger.debug("Verbose logging enabled")
@@ -100,7 +305,90 @@ def setup_logging(verbose: bool = False, base_dir: str = "out", tz: Optional[tim
     return root_logger
 
 
-def setup_logging_with_stdout_capture(verbose: bool = False, base_dir: str = "out", remove_ansi: bool = True, tz: Optional[timezone] = None, filename: Optional[str] = None) -> logging.Logger:
+def _setup_forwarding(verbose: bool, config: Dict[str, Any], policy: LoggerPolicy) -> logging.Logger:
+    """Send this process's records to the collector of a parent process."""
+    global _logging_initialized, _log_file_path, _console_handler
+    
+    _log_file_path = Path(config["log_file"]) if config.get("log_file") else None
+    _console_handler = None
+    
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    root_logger.handlers.clear()
+    from simple_global_logging.collector import CollectorHandler
+    root_logger.addHandler(CollectorHandler(config["address"], config["token"]))
+    _add_rate_limit_filter(root_logger)
+    
+    _set_logger_policy(policy)
+    
+    _logging_initialized = True
+    return root_logger
+
+
+def _add_rate_limit_filter(root_logger: logging.Logger) -> None:
+    """Add the rate limit filter to the root logger's handlers.
+    
+    Handlers filter before formatting, and the queue handler of async_mode before
+    enqueueing, so suppressed records are never formatted.
+    """
+    if _rate_limit_filter is not None:
+        for handler in root_logger.handlers:
+            handler.addFilter(_rate_limit_filter)
+
+
+def _set_logger_policy(policy: LoggerPolicy) -> None:
+    """Apply the child logger policy, removing the previous one."""
+    global _logger_policy
+    if _logger_policy is not None:
+        _logger_policy.remove()
+    _logger_policy = policy
+    policy.apply()
+
+
+def _set_log_file_path(path: Path) -> None:
+    """Record the file the rotator rolled over to."""
+    global _log_file_path
+    _log_file_path = path
+    if _pruner is not None:
+        _pruner.request()
+
+
+def _finished_log_file(path: Path) -> None:
+    """Hand a log file the rotator closed to compression and retention."""
+    if _compressor is not None:
+        _compressor.submit(path)
+    if _pruner is not None:
+        _pruner.update(path)
+
+
+def _compressed_log_file(path: Path, archive: Path) -> None:
+    """Tell retention a log file was replaced by its archive."""
+    if _pruner is not None:
+        _pruner.update(path)
+        _pruner.update(archive)
+
+
+def _active_log_files() -> Set[Path]:
+    """Get the log files retention must not remove."""
+    paths = {_log_file_path} if _log_file_path is not None else set()
+    rotator, compressor = _rotator, _compressor
+    if rotator is not None:
+        paths |= rotator.open_paths()
+    if compressor is not None and compressor.current_file is not None:
+        paths.add(compressor.current_file)
+    return paths
+
+
+def setup_logging_with_stdout_capture(verbose: bool = False, base_dir: str = "out", remove_ansi: bool = True, tz: Optional[timezone] = None, filename: Optional[str] = None,
+                                      capture: Union[CaptureOptions, Mapping[str, Any], None] = None,
+                                      file_format: str = "text", context: Optional[Dict[str, Any]] = None,
+                                      rotation: Union[RotationOptions, Mapping[str, Any], None] = None,
+                                      retention: Union[RetentionOptions, Mapping[str, Any], None] = None,
+                                      file_writer: str = "stream", collector: bool = False,
+                                      per_pid_files: bool = False, logger_policy: str = "eager",
+                                      logger_levels: Optional[Dict[str, Union[int, str]]] = None,
+                                      rate_limits: Optional[Sequence[Union["RateLimit", Mapping[str, Any]]]] = None
+                                      ) -> logging.Logger:
     """Setup logging with stdout/stderr capture enabled.
     
     Args:
@@ -110,27 +398,79 @@ def setup_logging_with_stdout_capture(verbose: bool = False, base_dir: str = "ou
         tz: Timezone for timestamps (default: UTC)
         filename: Optional specific filename for the log file. If provided, logs will be appended to this file.
                  If not provided, a new timestamped file will be created.
-        
+        capture: Buffering, flushing, queueing and overload handling of captured output, as a
+                 CaptureOptions object or a dictionary of its arguments, e.g. {"async_capture": True,
+                 "overload": "drop-oldest"} (default: CaptureOptions())
+        file_format: Log file format, "text", "jsonl" or "binary" (see setup_logging). In "jsonl",
+                     captured lines use the same JSON schema with stream set to "stdout" or
+                     "stderr" (default: "text")
+        context: Fields written under "context" on every JSON line (default: none)
+        rotation: Rollover by size or at midnight (see setup_logging). Captured output counts
+                  towards the size and follows the rollover (default: no rotation)
+        retention: Compression and removal of finished log files (see setup_logging) (default: none)
+        file_writer: "stream" or "mmap" (see setup_logging). With "mmap", captured output is
+                     copied into the same mapping as log records (default: "stream")
+        collector: Collect the records of child processes (see setup_logging). Worker processes
+                   only forward log records; their stdout/stderr is not captured unless the collecting
+                   process uses fd_capture, whose redirected descriptors they inherit (default: False)
+        per_pid_files: Let children created with os.fork() write to a log file of their own
+                       (see setup_logging). Their captured output goes to the same file (default: False)
+        logger_policy: "eager" or "lazy" child logger normalisation (see setup_logging) (default: "eager")
+        logger_levels: Logger name -> level overrides (see setup_logging) (default: {"urllib3": logging.INFO})
+        rate_limits: Token bucket limits for log records (see setup_logging); captured output is not
+                     limited (default: no limit)
+    
     Returns:
         Root logger instance
     """
-    global _stdout_captured, _original_stdout, _original_stderr, _log_file_path
+    global _stdout_captured, _original_stdout, _original_stderr, _capture_sink, _fd_capture, _log_file_path
+    
+    capture = resolve_options(capture, CaptureOptions)
     
     # First setup regular logging
-    logger = setup_logging(verbose=verbose, base_dir=base_dir, tz=tz, filename=filename)
+    logger = setup_logging(verbose=verbose, base_dir=base_dir, tz=tz, filename=filename,
+                           file_format=file_format, context=context, rotation=rotation, retention=retention,
+                           file_writer=file_writer, collector=collector, per_pid_files=per_pid_files,
+                           logger_policy=logger_policy, logger_levels=logger_levels, rate_limits=rate_limits)
     
     # Setup stdout/stderr capture if not already done
-    if not _stdout_captured and _log_file_path:
+    if not _stdout_captured and _log_file_path and not _forwarding:
         _original_stdout = sys.stdout
         _original_stderr = sys.stderr
         
-        # Create capture objects with ANSI removal option and timezone
-        stdout_capture = LogCapture(_original_stdout, _log_file_path, remove_ansi=remove_ansi, tz=_current_timezone)
-        stderr_capture = LogCapture(_original_stderr, _log_file_path, remove_ansi=remove_ansi, tz=_current_timezone)
+        # Both streams write through one sink: one lock, one file handle and one buffer
+        _capture_sink = CaptureSink(
+            _log_file_path,
+            tz=_current_timezone,
+            file_format=file_format,
+            context=context,
+            rotator=_rotator,
+            file_writer=file_writer,
+            **capture.sink_options()
+        )
         
-        # Replace sys.stdout and sys.stderr
-        sys.stdout = stdout_capture
-        sys.stderr = stderr_capture
+        if capture.fd_capture:
+            # Redirect file descriptors 1 and 2; sys.stdout/sys.stderr already write to them
+            from simple_global_logging.fdcapture import FdCapture
+            _fd_capture = FdCapture(_capture_sink, remove_ansi=remove_ansi)
+            _fd_capture.start()
+            # Keep console log output out of the captured stderr
+            if _console_handler is not None:
+                _console_handler.setStream(_fd_capture.original_stream(2))
+        else:
+            # Create capture objects with ANSI removal option and stream labels
+            stream_options = dict(
+                remove_ansi=remove_ansi,
+                sink=_capture_sink,
+                stream_flush=capture.stream_flush,
+                stream_flush_interval=capture.stream_flush_interval
+            )
+            stdout_capture = LogCapture(_original_stdout, stream_name="STDOUT", **stream_options)
+            stderr_capture = LogCapture(_original_stderr, stream_name="STDERR", **stream_options)
+            
+            # Replace sys.stdout and sys.stderr
+            sys.stdout = stdout_capture
+            sys.stderr = stderr_capture
         
         _stdout_captured = True
         logger.info("Standard output capture enabled")
@@ -138,12 +478,54 @@ def setup_logging_with_stdout_capture(verbose: bool = False, base_dir: str = "ou
     return logger
 
 
+def flush_logging(timeout: Optional[float] = None) -> bool:
+    """Wait until all records logged so far have been written.
+    
+    In async mode this waits for the listener thread to drain the queue; otherwise
+    it flushes the root logger's handlers.
+    
+    Args:
+        timeout: Maximum seconds to wait (default: wait indefinitely)
+    
+    Returns:
+        True if everything was written within the timeout
+    """
+    if _queue_listener is not None:
+        return _queue_listener.flush(timeout)
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+    return True
+
+
+def stop_logging():
+    """Stop async logging: drain the queue, stop the listener thread and log synchronously from now on.
+    
+    Does nothing if async mode is not active. Called automatically at interpreter exit.
+    """
+    global _queue_handler, _queue_listener
+    
+    if _queue_listener is None:
+        return
+    listener, queue_handler = _queue_listener, _queue_handler
+    _queue_listener = None
+    _queue_handler = None
+    
+    listener.stop()
+    
+    # Hand the listener's handlers back to the root logger
+    root_logger = logging.getLogger()
+    if queue_handler in root_logger.handlers:
+        root_logger.removeHandler(queue_handler)
+        for handler in listener.handlers:
+            root_logger.addHandler(handler)
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance. If logging is not initialized, will setup with defaults.
     
     Args:
         name: Logger name
-        
+    
     Returns:
         Logger instance
     """
@@ -157,14 +539,31 @@ def get_logger(name: str) -> logging.Logger:
 
 
 def restore_stdout():
-    """Restore original stdout/stderr streams."""
-    global _stdout_captured, _original_stdout, _original_stderr
+    """Restore original stdout/stderr streams and close the capture log writers."""
+    global _stdout_captured, _original_stdout, _original_stderr, _capture_sink, _fd_capture
     
     if _stdout_captured:
+        # Output left in the original streams' buffers by the flush policy goes out first
+        for stream in (_original_stdout, _original_stderr):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+        
         sys.stdout = _original_stdout
         sys.stderr = _original_stderr
         _stdout_captured = False
         
+        if _fd_capture is not None:
+            if _console_handler is not None and _console_handler.stream is _fd_capture.original_stream(2):
+                _console_handler.setStream(_original_stderr)
+            _fd_capture.stop()
+            _fd_capture = None
+        
+        if _capture_sink is not None:
+            _capture_sink.close()
+            _capture_sink = None
+        
         if _logging_initialized:
             logger = logging.getLogger()
             logger.info("Standard output capture disabled")
@@ -185,4 +584,130 @@ def get_current_timezone() -> Optional[timezone]:
     Returns:
         Current timezone or None if logging not initialized
     """
-    return _current_timezone 
\ No newline at end of file
+    return _current_timezone
+
+
+def get_capture_stats() -> Optional[dict]:
+    """Get counters of the active stdout/stderr capture.
+    
+    Returns:
+        Dictionary with queued_records, queued_bytes, written_records, dropped_records,
+        dropped_bytes and write_errors, or None if output is not being captured
+    """
+    if _capture_sink is None:
+        return None
+    return _capture_sink.stats()
+
+def get_compression_stats() -> Optional[dict]:
+    """Get counters of the background log file compression.
+    
+    Returns:
+        Dictionary with queued_files, compressed_files, skipped_files, failed_files, bytes_in,
+        bytes_out and current_file, or None if compression is not enabled
+    """
+    if _compressor is None:
+        return None
+    return _compressor.stats()
+
+
+def get_rate_limit_stats() -> Optional[dict]:
+    """Get counters of the rate limit filter.
+    
+    Returns:
+        Dictionary with passed, sampled and suppressed records and the number of
+        token buckets kept, or None if rate_limits is not set
+    """
+    if _rate_limit_filter is None:
+        return None
+    return _rate_limit_filter.stats()
+
+
+def _reinit_after_fork() -> None:
+    """Reset the inherited logging state in a child created with os.fork().
+    
+    The parent's threads do not exist in the child, and locks they held at fork
+    time would stay locked forever. Everything the parent buffered is left for
+    the parent to write.
+    """
+    global _rotator, _compressor, _pruner, _collector, _queue_handler, _queue_listener, _log_file_path
+    
+    if not _logging_initialized:
+        return
+    try:
+        # Rotation, compression and retention stay with the parent
+        if _rotator is not None:
+            _rotator.reset_after_fork()
+            _rotator = None
+        if _compressor is not None:
+            atexit.unregister(_compressor.stop)
+            _compressor = None
+        if _pruner is not None:
+            atexit.unregister(_pruner.stop)
+            _pruner = None
+        if _rate_limit_filter is not None:
+            _rate_limit_filter.reset_after_fork()
+        
+        root_logger = logging.getLogger()
+        if _forwarding:
+            from simple_global_logging.collector import CollectorHandler
+            for handler in root_logger.handlers:
+                if isinstance(handler, CollectorHandler):
+                    handler.reset_after_fork()
+            return
+        
+        path = None
+        if _per_pid_files and _log_file_path is not None:
+            path = _log_file_path.with_name(f"{_log_file_path.stem}.{os.getpid()}{_log_file_path.suffix}")
+        if _capture_sink is not None:
+            _capture_sink.reset_after_fork(path)
+        
+        if _collector is not None:
+            # Forward to the parent's collector like a worker calling setup_logging() does
+            _collector.stop()
+            _collector = None
+            _drop_file_handler(_file_handler)
+            _queue_handler = None
+            _queue_listener = None
+            from simple_global_logging.collector import collector_config
+            config = collector_config()
+            if config is not None:
+                _setup_forwarding(root_logger.level <= logging.DEBUG, config, _logger_policy or LoggerPolicy())
+            return
+        
+        if _file_handler is not None:
+            # BinaryLogHandler, LogFileHandler and RotatingLogFileHandler reopen their own file
+            if hasattr(_file_handler, "reset_after_fork"):
+                _file_handler.reset_after_fork(path)
+            else:
+                _drop_file_handler(_file_handler)
+                if path is not None:
+                    _file_handler.baseFilename = os.path.abspath(path)
+        if path is not None:
+            _log_file_path = path
+        
+        if _queue_listener is not None:
+            # Start a listener thread of the child's own with a new queue
+            from simple_global_logging.handlers import create_queue_logging
+            previous = _queue_handler
+            _queue_handler, _queue_listener = create_queue_logging(_queue_listener.handlers, _queue_listener.queue.maxsize)
+            _queue_handler.filters = list(previous.filters)
+            root_logger.handlers = [_queue_handler if handler is previous else handler for handler in root_logger.handlers]
+    except Exception:
+        # Logging must never prevent the child from running
+        pass
+
+
+def _drop_file_handler(handler: Optional[logging.Handler]) -> None:
+    """Drop the file a file handler inherited from the parent; it reopens the file on its next record."""
+    if handler is None:
+        return
+    writer = getattr(handler, "writer", None)
+    if writer is not None:
+        writer.reset_after_fork()
+    elif isinstance(handler, logging.FileHandler) and handler.stream is not None:
+        stream, handler.stream = handler.stream, None
+        close_inherited(stream)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
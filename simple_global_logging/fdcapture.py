@@ -0,0 +1,166 @@
+"""
+File-descriptor-level output capture for simple_global_logging.
+"""
+
+from typing import Dict, List, Optional, TextIO, Tuple
+import codecs
+import os
+import sys
+import threading
+
+from simple_global_logging.capture import CaptureSink, remove_ansi_codes
+
+
+# File descriptors redirected by default, with their stream labels
+DEFAULT_FDS = ((1, "STDOUT"), (2, "STDERR"))
+
+_READ_SIZE = 64 * 1024
+
+
+class _RedirectedFd:
+    """State of one redirected file descriptor."""
+    
+    def __init__(self, fd: int, stream_name: str):
+        self.fd = fd
+        self.stream_name = stream_name
+        self.saved_fd = -1
+        self.read_fd = -1
+        self.thread: Optional[threading.Thread] = None
+
+
+class FdCapture:
+    """Captures output at the file descriptor level.
+    
+    File descriptors 1 and 2 are redirected into pipes with os.dup2(). A reader
+    thread per descriptor copies everything it receives to the original
+    descriptor and to the capture sink. Unlike LogCapture, this also captures
+    output from C extensions, os.write() and child processes that inherit the
+    descriptors.
+    """
+    
+    def __init__(self, sink: CaptureSink, remove_ansi: bool = True, fds: Tuple[Tuple[int, str], ...] = DEFAULT_FDS):
+        """Initialize FdCapture.
+        
+        Args:
+            sink: Capture sink receiving the captured output
+            remove_ansi: Whether to remove ANSI escape sequences from log file (default: True)
+            fds: Pairs of file descriptor and stream label to redirect (default: stdout and stderr)
+        """
+        self.sink = sink
+        self.remove_ansi = remove_ansi
+        self._redirected: List[_RedirectedFd] = [_RedirectedFd(fd, name) for fd, name in fds]
+        self._original_streams: Dict[int, TextIO] = {}
+        self.active = False
+    
+    def start(self) -> None:
+        """Redirect the file descriptors and start the reader threads."""
+        if self.active:
+            return
+        _flush_python_streams()
+        
+        for redirected in self._redirected:
+            redirected.saved_fd = os.dup(redirected.fd)
+            read_fd, write_fd = os.pipe()
+            os.dup2(write_fd, redirected.fd)
+            os.close(write_fd)
+            redirected.read_fd = read_fd
+            redirected.thread = threading.Thread(
+                target=self._pump,
+                args=(redirected,),
+                name=f"simple_global_logging-fd{redirected.fd}",
+                daemon=True
+            )
+            redirected.thread.start()
+        self.active = True
+    
+    def stop(self, timeout: float = 1.0) -> None:
+        """Restore the original file descriptors and wait for the reader threads.
+        
+        Output still buffered in the pipes is copied before the threads exit. If a
+        child process keeps a pipe open past the timeout, its reader thread is left
+        running in the background.
+        
+        Args:
+            timeout: Seconds to wait for each reader thread (default: 1.0)
+        """
+        if not self.active:
+            return
+        _flush_python_streams()
+        
+        # Restoring the descriptors drops our write end of each pipe, so the readers see EOF
+        for redirected in self._redirected:
+            os.dup2(redirected.saved_fd, redirected.fd)
+        
+        for redirected in self._redirected:
+            redirected.thread.join(timeout)
+            if not redirected.thread.is_alive():
+                os.close(redirected.read_fd)
+                os.close(redirected.saved_fd)
+        
+        for stream in self._original_streams.values():
+            try:
+                stream.flush()
+            except Exception:
+                pass
+        self._original_streams.clear()
+        self.active = False
+    
+    def original_stream(self, fd: int) -> TextIO:
+        """Get a text stream writing to the original, unredirected file descriptor.
+        
+        Args:
+            fd: Redirected file descriptor, e.g. 2 for stderr
+        
+        Returns:
+            Line-buffered text stream; valid until stop()
+        """
+        stream = self._original_streams.get(fd)
+        if stream is None:
+            saved_fd = next(r.saved_fd for r in self._redirected if r.fd == fd)
+            stream = open(saved_fd, 'w', encoding='utf-8', errors='backslashreplace', closefd=False, buffering=1)
+            self._original_streams[fd] = stream
+        return stream
+    
+    def _pump(self, redirected: _RedirectedFd) -> None:
+        """Reader thread: copy pipe output to the original descriptor and the sink."""
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        while True:
+            try:
+                data = os.read(redirected.read_fd, _READ_SIZE)
+            except OSError:
+                break
+            if not data:
+                break
+            
+            _write_all(redirected.saved_fd, data)
+            self._capture(redirected.stream_name, decoder.decode(data))
+        
+        self._capture(redirected.stream_name, decoder.decode(b'', final=True))
+    
+    def _capture(self, stream_name: str, text: str) -> None:
+        """Write decoded text to the sink."""
+        if not text:
+            return
+        if self.remove_ansi:
+            text = remove_ansi_codes(text)
+        self.sink.write(stream_name, text)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write all of data to fd, ignoring errors so capture never breaks output."""
+    view = memoryview(data)
+    try:
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    except OSError:
+        pass
+
+
+def _flush_python_streams() -> None:
+    """Flush Python-level buffers so their output lands on the right descriptor."""
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
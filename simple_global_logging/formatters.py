@@ -0,0 +1,278 @@
+"""
+Log record formatters for simple_global_logging.
+"""
+
+from datetime import timezone, tzinfo
+from json.encoder import encode_basestring
+from typing import Any, Callable, Dict, Mapping, Optional
+import json
+import logging
+import re
+
+from simple_global_logging.timestamps import TimezoneConverter, get_timestamp_cache
+
+
+# Log file formats: "asctime - level - name - message" text, one JSON object per line,
+# or length-prefixed binary records (see simple_global_logging.binary)
+FILE_FORMATS = ("text", "jsonl", "binary")
+
+
+class TimezoneFormatter(logging.Formatter):
+    """logging.Formatter that renders asctime in a given timezone.
+    
+    Timestamps come from record.created, so queued or delayed records keep the
+    time they were logged at. When the formatter's own datefmt is used, asctime
+    comes from the shared per-second TimestampCache instead of being rebuilt for
+    every record; other formats go through a TimezoneConverter.
+    """
+    
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None, style: str = '%',
+                 tz: Optional[tzinfo] = None):
+        """Initialize TimezoneFormatter.
+        
+        Args:
+            fmt: Format string for the record (default: "%(message)s")
+            datefmt: strftime format for asctime (default: logging's ISO 8601 format)
+            style: Format string style, as for logging.Formatter (default: '%')
+            tz: Timezone for timestamps (default: UTC)
+        """
+        super().__init__(fmt, datefmt, style)
+        if tz is None:
+            tz = timezone.utc
+        self.tz = tz
+        self.converter = TimezoneConverter(tz)
+        self._timestamps = get_timestamp_cache(tz, datefmt) if datefmt else None
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """Return the creation time of the record formatted in the formatter's timezone.
+        
+        Args:
+            record: Log record
+            datefmt: strftime format (default: the formatter's datefmt)
+        
+        Returns:
+            Formatted timestamp
+        """
+        if self._timestamps is not None and datefmt == self.datefmt:
+            return self._timestamps.format(record.created)
+        return super().formatTime(record, datefmt)
+
+
+# A %-style field with no conversion flags, e.g. %(levelname)s
+_PLAIN_FIELD = re.compile(r'%\(([A-Za-z_]\w*)\)s')
+
+
+def compile_format(fmt: str) -> Optional[Callable[[logging.LogRecord, str, str], str]]:
+    """Compile a %-style format string into a field-concatenation function.
+    
+    Args:
+        fmt: Format string using only plain %(name)s fields
+    
+    Returns:
+        Function of (record, message, asctime) returning the formatted line, or None
+        if the format needs logging's generic interpolation (width, precision, %d, %%)
+    """
+    template = []
+    position = 0
+    for match in _PLAIN_FIELD.finditer(fmt):
+        literal = fmt[position:match.start()]
+        if '%' in literal:
+            return None
+        template.append(literal.replace('{', '{{').replace('}', '}}'))
+        name = match.group(1)
+        if name in ('message', 'asctime'):
+            template.append('{' + name + '}')
+        else:
+            template.append('{record.' + name + '!s}')
+        position = match.end()
+    
+    literal = fmt[position:]
+    if '%' in literal:
+        return None
+    template.append(literal.replace('{', '{{').replace('}', '}}'))
+    return eval('lambda record, message, asctime: f' + repr(''.join(template)), {})
+
+
+class FastFormatter(TimezoneFormatter):
+    """TimezoneFormatter that compiles its format string and memoises the result per record.
+    
+    Formats made only of plain %(name)s fields are turned into a single f-string
+    instead of going through logging's dict interpolation, and record.asctime is
+    not set. The last formatted record and its line are kept, so handlers sharing
+    this formatter (console and file) format each record once. Records with
+    exception or stack information, and formats the compiler does not handle, use
+    the standard logging.Formatter path.
+    
+    Handlers that change a record between formatting (e.g. filters rewriting msg)
+    must not share a FastFormatter.
+    """
+    
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None, style: str = '%',
+                 tz: Optional[tzinfo] = None):
+        """Initialize FastFormatter.
+        
+        Args:
+            fmt: Format string for the record (default: "%(message)s")
+            datefmt: strftime format for asctime (default: logging's ISO 8601 format)
+            style: Format string style, as for logging.Formatter; only '%' is compiled (default: '%')
+            tz: Timezone for timestamps (default: UTC)
+        """
+        super().__init__(fmt, datefmt, style, tz)
+        self._format_fields = compile_format(self._fmt) if style == '%' else None
+        self._uses_time = self.usesTime()
+        # (record, formatted line), replaced as a whole so threads never see a mismatch
+        self._last: tuple = (None, '')
+    
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record, reusing the line if this formatter already formatted it.
+        
+        Args:
+            record: Log record
+        
+        Returns:
+            Formatted line
+        """
+        last_record, text = self._last
+        if last_record is record:
+            return text
+        
+        if self._format_fields is None or record.exc_info or record.exc_text or record.stack_info:
+            text = super().format(record)
+        else:
+            message = record.message = record.getMessage()
+            if self._uses_time:
+                if self._timestamps is not None:
+                    asctime = self._timestamps.format(record.created)
+                else:
+                    asctime = self.formatTime(record, self.datefmt)
+            else:
+                asctime = ''
+            text = self._format_fields(record, message, asctime)
+        
+        self._last = (record, text)
+        return text
+
+
+# Attribute RateLimitFilter stores its decision in, so handlers sharing it count a record once
+RATE_LIMIT_ATTRIBUTE = "_rate_limit"
+
+# Attributes every LogRecord has, or gets from this package; any other attribute was passed with extra=
+_RECORD_ATTRIBUTES = (frozenset(logging.LogRecord("", 0, "", 0, "", None, None).__dict__)
+                      | {"message", "asctime", RATE_LIMIT_ATTRIBUTE})
+
+# Encoder for extra and context values, which may be of any type
+_encode_value = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str).encode
+
+
+class JsonLinesEncoder:
+    """Encodes log records and captured output as JSON Lines with a fixed key order.
+    
+    Every line has the keys time, level, logger, stream and message, followed by
+    exception, stack, extra and context when present. Log records have stream
+    "log"; captured lines have the lowercased stream label (e.g. "stdout") and
+    null level and logger. Strings are escaped with the json module's C string
+    encoder, and repeating parts (level and logger names, stream labels, context)
+    are encoded once and cached.
+    """
+    
+    def __init__(self, tz: Optional[tzinfo] = None, context: Optional[Mapping[str, Any]] = None):
+        """Initialize JsonLinesEncoder.
+        
+        Args:
+            tz: Timezone for timestamps (default: UTC)
+            context: Fields written under "context" on every line (default: none)
+        """
+        if tz is None:
+            tz = timezone.utc
+        self.tz = tz
+        self._dates = get_timestamp_cache(tz, "%Y-%m-%dT%H:%M:%S")
+        self._offsets = get_timestamp_cache(tz, "%z")
+        self._suffix = (',"context":' + _encode_value(dict(context)) if context else '') + '}'
+        self._encoded: Dict[str, str] = {}
+        self._exception_formatter = logging.Formatter()
+    
+    def _encode_cached(self, text: str) -> str:
+        """Encode a string that repeats across lines, such as a logger name."""
+        encoded = self._encoded.get(text)
+        if encoded is None:
+            encoded = self._encoded[text] = encode_basestring(text)
+        return encoded
+    
+    def format_time(self, created: float) -> str:
+        """Format a timestamp as ISO 8601 with milliseconds and UTC offset.
+        
+        Args:
+            created: Seconds since the epoch
+        
+        Returns:
+            Timestamp such as "2023-11-15T07:13:20.500+09:00"
+        """
+        offset = self._offsets.format(created)
+        return f"{self._dates.format(created)}.{int(created % 1 * 1000):03d}{offset[:3]}:{offset[3:]}"
+    
+    def encode_record(self, record: logging.LogRecord) -> str:
+        """Encode a log record as one JSON object without a trailing newline.
+        
+        Args:
+            record: Log record
+        
+        Returns:
+            JSON object text
+        """
+        line = (f'{{"time":"{self.format_time(record.created)}","level":{self._encode_cached(record.levelname)},'
+                f'"logger":{self._encode_cached(record.name)},"stream":"log",'
+                f'"message":{encode_basestring(record.getMessage())}')
+        
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+        if record.exc_text:
+            line += ',"exception":' + encode_basestring(record.exc_text)
+        if record.stack_info:
+            line += ',"stack":' + encode_basestring(record.stack_info)
+        
+        extra = record.__dict__.keys() - _RECORD_ATTRIBUTES
+        if extra:
+            fields = record.__dict__
+            line += ',"extra":{' + ','.join(
+                f'{encode_basestring(key)}:{_encode_value(fields[key])}' for key in sorted(extra)
+            ) + '}'
+        return line + self._suffix
+    
+    def encode_capture(self, created: float, stream: str, text: str) -> str:
+        """Encode a captured output line as one JSON object without a trailing newline.
+        
+        Args:
+            created: Capture time in seconds since the epoch
+            stream: Stream label, e.g. "STDOUT"; written lowercased
+            text: Captured line without a trailing newline
+        
+        Returns:
+            JSON object text
+        """
+        return (f'{{"time":"{self.format_time(created)}","level":null,"logger":null,'
+                f'"stream":{self._encode_cached(stream.lower())},"message":{encode_basestring(text)}{self._suffix}')
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """logging.Formatter writing each record as one JSON object (see JsonLinesEncoder)."""
+    
+    def __init__(self, tz: Optional[tzinfo] = None, context: Optional[Mapping[str, Any]] = None):
+        """Initialize JsonLinesFormatter.
+        
+        Args:
+            tz: Timezone for timestamps (default: UTC)
+            context: Fields written under "context" on every line (default: none)
+        """
+        super().__init__()
+        self.encoder = JsonLinesEncoder(tz, context)
+    
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record as one JSON object.
+        
+        Args:
+            record: Log record
+        
+        Returns:
+            JSON object text
+        """
+        return self.encoder.encode_record(record)
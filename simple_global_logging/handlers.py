@@ -0,0 +1,267 @@
+"""
+Logging handlers for simple_global_logging.
+"""
+
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
+import copy
+import logging
+import os
+import queue
+import time
+
+from simple_global_logging.writers import (
+    BufferedLogWriter,
+    DEFAULT_BUFFER_SIZE,
+    DEFAULT_LOG_QUEUE_SIZE,
+    LockedFileHandler,
+    close_inherited
+)
+
+if TYPE_CHECKING:
+    from simple_global_logging.rotation import LogRotator
+
+# Argument types a record can keep while queued: nobody can change them before it is formatted
+_IMMUTABLE_ARG_TYPES = frozenset((str, int, float, bool, bytes, type(None)))
+
+
+class BlockingQueueHandler(QueueHandler):
+    """QueueHandler for a bounded queue that waits for room instead of failing.
+    
+    The standard QueueHandler uses put_nowait(), which reports an error for every
+    record logged while a bounded queue is full. It also formats each record on
+    the calling thread and replaces msg, args and exc_info with the text; this
+    handler queues records unformatted, so formatting happens on the listener
+    thread and the JSON Lines and binary formatters still get the template,
+    arguments and exception.
+    
+    Arguments other than str, int, float, bool, bytes and None may be changed by
+    the caller before the listener formats the record, so a record with any of
+    them is queued with the message rendered and no arguments. The template of
+    such records is lost: binary files store the rendered message instead.
+    """
+    
+    _exception_formatter = logging.Formatter()
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Get the record to queue: the record itself, or a copy with the mutable parts rendered.
+        
+        A traceback is rendered into exc_text on the calling thread, while its frames
+        are still as they were when it was raised, and exc_info is dropped from the
+        copy so the queue does not keep those frames alive. Mutable arguments are
+        rendered into msg the same way.
+        """
+        args = record.args
+        if isinstance(args, dict):
+            args = args.values()
+        render_args = bool(args) and not all(type(arg) in _IMMUTABLE_ARG_TYPES for arg in args)
+        has_exception = record.exc_info is not None and record.exc_info[0] is not None
+        if not render_args and not has_exception:
+            return record
+        record = copy.copy(record)
+        if render_args:
+            record.msg = record.getMessage()
+            record.args = None
+        if has_exception:
+            if not record.exc_text:
+                record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put the record on the queue, waiting while it is full."""
+        self.queue.put(record)
+
+
+class LogQueueListener(QueueListener):
+    """QueueListener that can wait until the queued records have been handled."""
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every record queued so far has been handled, then flush the handlers.
+        
+        Args:
+            timeout: Maximum seconds to wait (default: wait indefinitely)
+        
+        Returns:
+            True if the queue was drained within the timeout
+        """
+        log_queue = self.queue
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with log_queue.all_tasks_done:
+            while log_queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                log_queue.all_tasks_done.wait(remaining)
+        
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+        return True
+
+
+class RotatingLogFileHandler(LockedFileHandler):
+    """FileHandler that follows the rollovers of a LogRotator.
+    
+    The rotator opens the next file in the background; emit() only swaps the
+    stream reference and hands the old stream back to the rotator to close.
+    """
+    
+    def __init__(self, filename: Union[str, Path], rotator: "LogRotator", mode: str = 'a',
+                 encoding: Optional[str] = None, errors: Optional[str] = None):
+        """Initialize RotatingLogFileHandler.
+        
+        Args:
+            filename: Current log file
+            rotator: Rotator deciding when to roll over
+            mode: File mode (default: 'a')
+            encoding: File encoding (default: locale encoding)
+            errors: Encoding error handling (default: 'strict')
+        """
+        super().__init__(filename, mode, encoding=encoding, errors=errors)
+        self.rotator = rotator
+        self._slot = rotator.register(self._open_path, filename)
+    
+    def rotate(self) -> bool:
+        """Switch to the file prepared by the rotator, if any.
+        
+        Returns:
+            True if the handler switched to a new file
+        """
+        switched = self.rotator.switch(self._slot, self.stream) if self._slot is not None else None
+        if switched is None:
+            return False
+        path, self.stream = switched
+        self.baseFilename = os.path.abspath(path)
+        return True
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record, switching to a newly prepared file first.
+        
+        Args:
+            record: Log record
+        """
+        slot = self._slot
+        if slot is not None and slot.pending is not None:
+            self.rotate()
+        if self.stream is None:
+            if self.mode != 'w' or not self._closed:
+                self.stream = self._open()
+            else:
+                return
+        try:
+            msg = self.format(record)
+            stream = self.stream
+            stream.write(msg + self.terminator)
+            stream.flush()
+            self.rotator.written(len(msg) + 1)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def reset_after_fork(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Drop the file inherited from the parent process, in a child created with os.fork().
+        
+        The file is opened again on the next record, without rotation.
+        
+        Args:
+            path: File to write from now on (default: the same file)
+        """
+        stream, self.stream = self.stream, None
+        if stream is not None:
+            close_inherited(stream)
+        if path is not None:
+            self.baseFilename = os.path.abspath(path)
+        self._slot = None
+    
+    def close(self) -> None:
+        """Close the file and unregister from the rotator."""
+        try:
+            super().close()
+        finally:
+            with self.lock:
+                if self._slot is not None:
+                    self.rotator.unregister(self._slot)
+                    self._slot = None
+
+
+class LogFileHandler(logging.Handler):
+    """logging.Handler writing formatted records to a file through a BufferedLogWriter.
+    
+    With file_writer="mmap" each record is copied into a memory-mapped,
+    preallocated file instead of being written with a system call, and the
+    capture sink writing the same path shares the mapping.
+    """
+    
+    def __init__(self, path: Union[str, Path], file_writer: str = "mmap", encoding: str = 'utf-8',
+                 buffer_size: int = DEFAULT_BUFFER_SIZE, flush_policy: str = "line",
+                 rotator: Optional["LogRotator"] = None):
+        """Initialize LogFileHandler; the file is opened on the first record.
+        
+        Args:
+            path: Path to the log file (appended to)
+            file_writer: "stream" or "mmap", as for BufferedLogWriter (default: "mmap")
+            encoding: Encoding of the formatted records (default: 'utf-8')
+            buffer_size: Size of the file buffer for "stream" in bytes (default: 64 KiB)
+            flush_policy: When to flush, as for BufferedLogWriter (default: "line")
+            rotator: Optional LogRotator deciding when to roll over
+        """
+        super().__init__()
+        self.encoding = encoding
+        self.writer = BufferedLogWriter(path, buffer_size=buffer_size, flush_policy=flush_policy,
+                                        rotator=rotator, file_writer=file_writer, lock=self.lock)
+    
+    @property
+    def path(self) -> Path:
+        """Path of the file currently written to."""
+        return self.writer.path
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Format and write a record.
+        
+        Args:
+            record: Log record
+        """
+        try:
+            self.writer.write((self.format(record) + "\n").encode(self.encoding))
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self) -> None:
+        """Flush buffered records to the file."""
+        with self.lock:
+            self.writer.flush()
+    
+    def reset_after_fork(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Drop the file inherited from the parent process, in a child created with os.fork().
+        
+        Args:
+            path: File to write from now on (default: the same file)
+        """
+        self.writer.reset_after_fork(path)
+    
+    def close(self) -> None:
+        """Close the file; a memory-mapped file is truncated to its real length."""
+        with self.lock:
+            self.writer.close()
+        super().close()
+
+
+def create_queue_logging(handlers, queue_size: int = DEFAULT_LOG_QUEUE_SIZE):
+    """Create a queue handler and a started listener that owns the given handlers.
+    
+    Args:
+        handlers: Handlers that format and write records on the listener thread
+        queue_size: Maximum number of queued records; logging calls wait while it is full (default: 10000)
+    
+    Returns:
+        Tuple of (queue handler for the root logger, started listener)
+    """
+    log_queue = queue.Queue(maxsize=queue_size)
+    listener = LogQueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return BlockingQueueHandler(log_queue), listener
@@ -0,0 +1,196 @@
+"""
+Child logger policy for simple_global_logging.
+
+setup_logging routes every record through the root logger: child loggers
+propagate and have no handlers of their own, except for loggers with a level
+override, which keep their handlers and only get the configured level.
+"""
+
+from typing import Dict, Mapping, Optional, Type, Union
+import logging
+import warnings
+
+
+# How the policy reaches existing and future child loggers
+LOGGER_POLICIES = ("eager", "lazy")
+
+# Level overrides applied unless setup_logging is given logger_levels
+DEFAULT_LOGGER_LEVELS: Dict[str, Union[int, str]] = {"urllib3": logging.INFO}
+
+# logging.Logger methods replaced by hooks while a lazy policy is applied
+_call_handlers = logging.Logger.callHandlers
+_add_handler = logging.Logger.addHandler
+
+# Manager -> its lazy policy
+_lazy_policies: Dict[logging.Manager, "LoggerPolicy"] = {}
+
+
+class PolicyLogger(logging.Logger):
+    """Logger that keeps the policy: it always propagates and never gets handlers.
+    
+    The lazy policy makes child loggers instances of a subclass of this and of
+    their own class, so the policy holds for every later change instead of only
+    at setup.
+    """
+    
+    @property
+    def propagate(self) -> bool:
+        """Always True; assignments are ignored."""
+        return True
+    
+    @propagate.setter
+    def propagate(self, value: bool) -> None:
+        pass
+    
+    def addHandler(self, hdlr: logging.Handler) -> None:
+        """Ignored: records reach the root logger's handlers through propagation.
+        
+        A RuntimeWarning is issued for the first handler given to each logger.
+        """
+        if self.__dict__.get("_policy_warned"):
+            return
+        self._policy_warned = True
+        warnings.warn(f"Handler {hdlr!r} not added to logger {self.name!r}: the lazy logger policy "
+                      f"sends its records to the root logger's handlers", RuntimeWarning, stacklevel=2)
+
+
+def _call_handlers_hook(self: logging.Logger, record: logging.LogRecord) -> None:
+    """logging.Logger.callHandlers while a lazy policy is applied: adopt the logger on first use."""
+    policy = _lazy_policies.get(self.manager)
+    if policy is not None:
+        policy.adopt(self)
+    _call_handlers(self, record)
+
+
+def _add_handler_hook(self: logging.Logger, hdlr: logging.Handler) -> None:
+    """logging.Logger.addHandler while a lazy policy is applied: adopt the logger first."""
+    policy = _lazy_policies.get(self.manager)
+    if policy is not None and policy.adopt(self):
+        PolicyLogger.addHandler(self, hdlr)
+    else:
+        _add_handler(self, hdlr)
+
+
+class LoggerPolicy:
+    """Propagation, handler and level rules for the loggers below the root.
+    
+    "eager" updates every logger that exists at setup; placeholders of names
+    nobody asked for are left alone, and loggers created or changed later keep
+    whatever handlers they are given. "lazy" walks no loggers at setup and
+    enforces the rules when the state changes instead: the manager creates new
+    loggers as PolicyLogger subclasses, which ignore addHandler() and
+    assignments to propagate, and existing child loggers become one on their
+    first record or addHandler() call.
+    """
+    
+    def __init__(self, mode: str = "eager", levels: Optional[Mapping[str, Union[int, str]]] = None):
+        """Initialize LoggerPolicy.
+        
+        Args:
+            mode: "eager" or "lazy" (default: "eager")
+            levels: Logger name -> level. Loggers below a configured name inherit
+                    its level (default: DEFAULT_LOGGER_LEVELS)
+        """
+        if mode not in LOGGER_POLICIES:
+            raise ValueError(f"logger_policy must be one of {LOGGER_POLICIES}, got {mode!r}")
+        if levels is None:
+            levels = DEFAULT_LOGGER_LEVELS
+        self.mode = mode
+        self.levels: Dict[str, int] = {}
+        for name, level in levels.items():
+            if isinstance(level, str):
+                level = logging.getLevelName(level.upper())
+            if not isinstance(level, int):
+                raise ValueError(f"logger_levels has an unknown level for {name!r}: {levels[name]!r}")
+            self.levels[name] = level
+        self._manager: Optional[logging.Manager] = None
+        self._previous_class: Optional[Type[logging.Logger]] = None
+        # Logger class -> its PolicyLogger subclass
+        self._classes: Dict[Type[logging.Logger], Type[logging.Logger]] = {}
+    
+    def apply(self, manager: Optional[logging.Manager] = None) -> None:
+        """Apply the rules to the loggers of a manager.
+        
+        Args:
+            manager: Logging manager (default: the root logger's)
+        """
+        if manager is None:
+            manager = logging.root.manager
+        for name, level in self.levels.items():
+            logger = manager.getLogger(name)
+            # setLevel clears the level cache of every logger, so only call it on a change
+            if logger.level != level:
+                logger.setLevel(level)
+        if self.mode == "eager":
+            # Placeholders of names nobody asked for are skipped, not turned into loggers
+            for logger in list(manager.loggerDict.values()):
+                if isinstance(logger, logging.Logger):
+                    self.normalise(logger)
+            return
+        
+        self._manager = manager
+        self._previous_class = manager.loggerClass
+        manager.loggerClass = self._policy_class(manager.loggerClass or logging.getLoggerClass())
+        _lazy_policies[manager] = self
+        logging.Logger.callHandlers = _call_handlers_hook
+        logging.Logger.addHandler = _add_handler_hook
+    
+    def normalise(self, logger: logging.Logger) -> None:
+        """Make a logger propagate to the root without handlers of its own, unless it has a level override."""
+        if logger.name in self.levels:
+            return
+        logger.propagate = True
+        if logger.handlers:
+            logger.handlers.clear()
+    
+    def adopt(self, logger: logging.Logger) -> bool:
+        """Normalise a child logger of a lazy policy's manager and make it a PolicyLogger.
+        
+        Args:
+            logger: Logger of the manager
+        
+        Returns:
+            True if the logger is a PolicyLogger now, False for the root logger and level overrides
+        """
+        if isinstance(logger, PolicyLogger):
+            return True
+        manager = self._manager
+        if manager is None or logger.name in self.levels or manager.loggerDict.get(logger.name) is not logger:
+            return False
+        self.normalise(logger)
+        logger.__class__ = self._policy_class(type(logger))
+        return True
+    
+    def remove(self) -> None:
+        """Give the loggers of a lazy policy their own classes back and restore the manager's logger class."""
+        manager = self._manager
+        if manager is None:
+            return
+        self._manager = None
+        if _lazy_policies.get(manager) is self:
+            del _lazy_policies[manager]
+        if not _lazy_policies:
+            logging.Logger.callHandlers = _call_handlers
+            logging.Logger.addHandler = _add_handler
+        if manager.loggerClass in self._classes.values():
+            manager.loggerClass = self._previous_class
+        bases = {policy_class: base for base, policy_class in self._classes.items()}
+        for logger in list(manager.loggerDict.values()):
+            base = bases.get(type(logger))
+            if base is not None:
+                logger.__class__ = base
+                # Loggers created with the policy class never stored propagate themselves
+                logger.propagate = True
+    
+    def _policy_class(self, base: Type[logging.Logger]) -> Type[logging.Logger]:
+        """Get the PolicyLogger subclass of a logger class."""
+        if issubclass(base, PolicyLogger):
+            return base
+        policy_class = self._classes.get(base)
+        if policy_class is None:
+            namespace = {}
+            if base.callHandlers in (_call_handlers, _call_handlers_hook):
+                # Policy loggers skip the first use hook, unless their class overrides callHandlers
+                namespace["callHandlers"] = _call_handlers
+            policy_class = self._classes[base] = type(f"Policy{base.__name__}", (PolicyLogger, base), namespace)
+        return policy_class
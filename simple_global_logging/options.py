@@ -0,0 +1,179 @@
+"""
+Option groups for setup_logging and setup_logging_with_stdout_capture.
+
+Each group is passed as an instance or as a dictionary of its arguments, e.g.
+rotation={"max_bytes": 10_000_000, "at_midnight": True}. Values are checked
+by the setup that uses them.
+"""
+
+from typing import Any, Dict, Mapping, Optional, Type, TypeVar, Union
+
+from simple_global_logging.capture import DEFAULT_PARTIAL_LINE_TIMEOUT, DEFAULT_STREAM_FLUSH_INTERVAL
+from simple_global_logging.writers import (
+    DEFAULT_BUFFER_SIZE,
+    DEFAULT_FLUSH_INTERVAL,
+    DEFAULT_QUEUE_BYTES,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_SAMPLE_RATE,
+    DEFAULT_SUMMARY_INTERVAL
+)
+
+
+class CaptureOptions:
+    """How captured stdout/stderr is buffered, queued and written."""
+    
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE, flush_policy: str = "line",
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, flush_threshold: Optional[int] = None,
+                 async_capture: bool = False, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 max_queue_bytes: Optional[int] = DEFAULT_QUEUE_BYTES,
+                 partial_line_timeout: float = DEFAULT_PARTIAL_LINE_TIMEOUT, overload: str = "block",
+                 sample_rate: int = DEFAULT_SAMPLE_RATE, drop_summary_interval: float = DEFAULT_SUMMARY_INTERVAL,
+                 stream_flush: str = "tty", stream_flush_interval: float = DEFAULT_STREAM_FLUSH_INTERVAL,
+                 fd_capture: bool = False):
+        """Initialize CaptureOptions.
+        
+        Args:
+            buffer_size: Size of the captured output file buffer in bytes (default: 64 KiB)
+            flush_policy: When captured output is flushed to the log file (default: "line")
+                - "line": after every captured write
+                - "interval": at most once per flush_interval seconds, and flush_interval seconds
+                  after the last captured write at the latest
+                - "size": once flush_threshold characters are pending
+            flush_interval: Seconds between flushes for the "interval" policy (default: 1.0)
+            flush_threshold: Pending characters that trigger a flush for the "size" policy (default: buffer_size)
+            async_capture: Write captured output from a background thread. Captured writes only enqueue
+                          the text and its timestamp; the queue is drained by restore_stdout() and at exit
+                          (default: False)
+            queue_size: Maximum number of captured records queued in async mode (default: 10000)
+            max_queue_bytes: In-memory budget of the async capture queue in bytes, or None for
+                             no budget (default: 16 MiB)
+            partial_line_timeout: Seconds after which captured output without a trailing newline is
+                                  written as its own record (default: 1.0). Writes are otherwise
+                                  assembled into one timestamped record per line.
+            overload: What to do when captured output arrives faster than it can be written (default: "block")
+                - "block": wait for the writer
+                - "drop-oldest": discard the oldest queued lines
+                - "drop-newest": discard the new lines
+                - "sample": keep 1 in sample_rate new lines while overloaded
+                Any policy other than "block" enables async_capture. Drops are reported by a periodic
+                "CAPTURE: dropped N lines" record and by get_capture_stats().
+            sample_rate: Keep 1 in sample_rate lines while overloaded with "sample" (default: 10)
+            drop_summary_interval: Minimum seconds between drop summary records (default: 60.0)
+            stream_flush: When the original stdout/stderr are flushed after a captured write (default: "tty")
+                - "always": after every write
+                - "tty": after every write on a terminal; pipes and files stay buffered
+                - "newline": when the written text contains a newline
+                - "interval": at most once per stream_flush_interval seconds
+            stream_flush_interval: Seconds between flushes for the "interval" policy (default: 0.5)
+            fd_capture: Capture at the file descriptor level instead of replacing sys.stdout/sys.stderr.
+                        File descriptors 1 and 2 are redirected through pipes, so output from C
+                        extensions, os.write() and child processes is captured too. The console log
+                        handler keeps writing to the original stderr (default: False)
+        """
+        self.buffer_size = buffer_size
+        self.flush_policy = flush_policy
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.async_capture = async_capture
+        self.queue_size = queue_size
+        self.max_queue_bytes = max_queue_bytes
+        self.partial_line_timeout = partial_line_timeout
+        self.overload = overload
+        self.sample_rate = sample_rate
+        self.drop_summary_interval = drop_summary_interval
+        self.stream_flush = stream_flush
+        self.stream_flush_interval = stream_flush_interval
+        self.fd_capture = fd_capture
+    
+    def sink_options(self) -> Dict[str, Any]:
+        """Get the keyword arguments of CaptureSink among the options."""
+        return {
+            "buffer_size": self.buffer_size,
+            "flush_policy": self.flush_policy,
+            "flush_interval": self.flush_interval,
+            "flush_threshold": self.flush_threshold,
+            "async_capture": self.async_capture,
+            "queue_size": self.queue_size,
+            "max_queue_bytes": self.max_queue_bytes,
+            "partial_line_timeout": self.partial_line_timeout,
+            "overload": self.overload,
+            "sample_rate": self.sample_rate,
+            "drop_summary_interval": self.drop_summary_interval,
+        }
+
+
+class RotationOptions:
+    """When the log file rolls over to the next YYYYMMDD-serial file."""
+    
+    def __init__(self, max_bytes: Optional[int] = None, at_midnight: bool = False):
+        """Initialize RotationOptions.
+        
+        Args:
+            max_bytes: Roll over once about this many bytes were written to the current file
+                       (default: no size limit)
+            at_midnight: Roll over to a new file at local midnight in the setup's timezone.
+                         Rollovers happen on a background thread; writers switch to the
+                         new file on their next write, and get_current_log_file() follows
+                         (default: False)
+        """
+        self.max_bytes = max_bytes
+        self.at_midnight = at_midnight
+    
+    @property
+    def enabled(self) -> bool:
+        """Check whether any rollover is configured."""
+        return self.max_bytes is not None or self.at_midnight
+
+
+class RetentionOptions:
+    """How finished log files in base_dir are compressed and removed."""
+    
+    def __init__(self, compress: Optional[str] = None, max_files: Optional[int] = None,
+                 max_age_days: Optional[float] = None, max_total_bytes: Optional[int] = None):
+        """Initialize RetentionOptions.
+        
+        Args:
+            compress: Compress finished YYYYMMDD-serial log files with "gzip" or "lzma" on a
+                      low-priority background thread: files closed by rotation, and files of earlier
+                      runs unmodified for 5 minutes, found by a scan on that thread. Files another
+                      process still has open for writing are skipped. Each archive is written to a
+                      temporary file and renamed before the original is deleted. See
+                      get_compression_stats() (default: None)
+            max_files: Keep at most this many log files in base_dir (default: no limit)
+            max_age_days: Remove log files last modified more than this many days ago (default: no limit)
+            max_total_bytes: Keep the log files in base_dir at most this large in total (default: no limit)
+                             The limits apply to the YYYYMMDD-serial log files, per-PID files and
+                             their archives, oldest first. They are enforced by a low-priority background
+                             thread at startup, after every rollover and hourly. Checks use an index kept up
+                             to date by rotation and compression; the directory is listed at startup and
+                             then every 6 hours, which picks up files of other processes. The current log
+                             file, files still being written or compressed, and files modified in the last
+                             5 minutes are never removed. See prune() for a one-off cleanup.
+        """
+        self.compress = compress
+        self.max_files = max_files
+        self.max_age_days = max_age_days
+        self.max_total_bytes = max_total_bytes
+    
+    @property
+    def prunes(self) -> bool:
+        """Check whether any retention limit is configured."""
+        return self.max_files is not None or self.max_age_days is not None or self.max_total_bytes is not None
+
+
+_Options = TypeVar("_Options", CaptureOptions, RotationOptions, RetentionOptions)
+
+
+def resolve_options(options: Union[_Options, Mapping[str, Any], None], cls: Type[_Options]) -> _Options:
+    """Get an option group from an instance, a dictionary of its arguments or None for the defaults.
+    
+    Raises:
+        TypeError: If options is neither, or the dictionary has an unknown key
+    """
+    if options is None:
+        return cls()
+    if isinstance(options, cls):
+        return options
+    if isinstance(options, Mapping):
+        return cls(**options)
+    raise TypeError(f"expected {cls.__name__} or a dict of its arguments, got {type(options).__name__}")
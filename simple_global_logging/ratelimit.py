@@ -0,0 +1,241 @@
+"""
+Rate limiting of log records for simple_global_logging.
+
+RateLimitFilter is a logging.Filter for the handlers setup_logging installs on
+the root logger. Handlers filter a record before formatting it, so a dropped
+record costs a dictionary lookup and a token bucket update instead of a
+formatted, written line.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+import logging
+import threading
+import time
+
+from simple_global_logging.formatters import RATE_LIMIT_ATTRIBUTE
+
+
+# Token buckets kept before the least recently used one is evicted
+DEFAULT_MAX_KEYS = 10000
+
+# Seconds between "suppressed N records" summary records
+DEFAULT_RATE_SUMMARY_INTERVAL = 60.0
+
+# Logger the summary records are logged to
+SUMMARY_LOGGER = "simple_global_logging.ratelimit"
+
+# Keys listed by name in a summary record
+_SUMMARY_TOP = 5
+
+
+class RateLimit:
+    """Token bucket settings for the records of a logger name prefix.
+    
+    Records of a logger at or below prefix, with a level up to level, may pass
+    at rate records per second per message template, after an initial burst.
+    Records beyond that are suppressed, except one in every sample of them.
+    """
+    
+    def __init__(self, prefix: str = "", rate: float = 10.0, burst: Optional[int] = None,
+                 level: Union[int, str] = logging.WARNING, sample: int = 0):
+        """Initialize RateLimit.
+        
+        Args:
+            prefix: Logger name the limit applies to, with the loggers below it; "" for all (default: "")
+            rate: Records per second allowed per logger and message template (default: 10.0)
+            burst: Records allowed at once before the rate applies (default: one second's worth, at least 1)
+            level: Highest level limited; records above it always pass (default: logging.WARNING)
+            sample: Keep one in this many suppressed records; 0 keeps none (default: 0)
+        """
+        if isinstance(level, str):
+            level = logging.getLevelName(level.upper())
+            if not isinstance(level, int):
+                raise ValueError(f"level must be a logging level, got {level!r}")
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate!r}")
+        if burst is None:
+            burst = max(1, int(rate))
+        if burst <= 0:
+            raise ValueError(f"burst must be positive, got {burst!r}")
+        if sample < 0:
+            raise ValueError(f"sample must not be negative, got {sample!r}")
+        self.prefix = prefix
+        self.rate = float(rate)
+        self.burst = burst
+        self.level = level
+        self.sample = sample
+    
+    def matches(self, name: str, levelno: int) -> bool:
+        """Check whether the limit applies to a record of a logger and level."""
+        if levelno > self.level:
+            return False
+        prefix = self.prefix
+        return not prefix or name == prefix or name.startswith(prefix + ".")
+
+
+class RateLimitFilter(logging.Filter):
+    """Suppresses records beyond a token bucket per (logger name, message template).
+    
+    The most specific limit applies: the longest matching prefix, then the
+    lowest level. The buckets are kept in LRU order and bounded by max_keys.
+    Every summary_interval seconds the next limited record, passed or
+    suppressed, triggers a summary of the records suppressed since the
+    previous one.
+    
+    One instance may be shared by several handlers; a record reaching all of
+    them is counted once, as the decision is stored on the record.
+    """
+    
+    def __init__(self, limits: Iterable[Union[RateLimit, Mapping[str, Any]]] = (),
+                 max_keys: int = DEFAULT_MAX_KEYS, summary_interval: float = DEFAULT_RATE_SUMMARY_INTERVAL):
+        """Initialize RateLimitFilter.
+        
+        Args:
+            limits: RateLimit objects, or dictionaries of RateLimit arguments (default: a
+                    RateLimit() for all loggers)
+            max_keys: Token buckets kept; the least recently used is evicted beyond this (default: 10000)
+            summary_interval: Seconds between summary records; 0 disables them (default: 60.0)
+        """
+        super().__init__()
+        limits = [limit if isinstance(limit, RateLimit) else RateLimit(**limit) for limit in limits]
+        if not limits:
+            limits = [RateLimit()]
+        if max_keys <= 0:
+            raise ValueError(f"max_keys must be positive, got {max_keys!r}")
+        # Most specific first: longest prefix, then lowest level
+        self.limits = sorted(limits, key=lambda limit: (-len(limit.prefix), limit.level))
+        self.max_keys = max_keys
+        self.summary_interval = summary_interval
+        
+        self.passed = 0
+        self.sampled = 0
+        self.suppressed = 0
+        
+        self._lock = threading.Lock()
+        # (logger name, template) -> [tokens, time of last update, records over the limit,
+        # records suppressed since the last summary]
+        self._buckets: "OrderedDict[Tuple[str, Any], List[Any]]" = OrderedDict()
+        # (logger name, level) -> most specific limit, or None
+        self._limit_cache: Dict[Tuple[str, int], Optional[RateLimit]] = {}
+        self._evicted_suppressed = 0
+        self._last_summary = time.monotonic()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decide whether a record passes.
+        
+        Args:
+            record: Log record, not formatted yet
+        
+        Returns:
+            False if the record is suppressed
+        """
+        name = record.name
+        limit_key = (name, record.levelno)
+        try:
+            limit = self._limit_cache[limit_key]
+        except KeyError:
+            limit = self._limit_cache[limit_key] = self._find_limit(name, record.levelno)
+        if limit is None:
+            return True
+        
+        template = record.msg
+        if not isinstance(template, str):
+            template = type(template).__name__
+        now = time.monotonic()
+        summary = None
+        with self._lock:
+            decision = getattr(record, RATE_LIMIT_ATTRIBUTE, None)
+            if decision is not None and decision[0] is self:
+                return decision[1]
+            
+            key = (name, template)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [limit.burst, now, 0, 0]
+                if len(self._buckets) > self.max_keys:
+                    _, evicted = self._buckets.popitem(last=False)
+                    self._evicted_suppressed += evicted[3]
+            else:
+                self._buckets.move_to_end(key)
+                tokens = bucket[0] + (now - bucket[1]) * limit.rate
+                bucket[0] = tokens if tokens < limit.burst else limit.burst
+                bucket[1] = now
+            
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                allowed = True
+                self.passed += 1
+            else:
+                bucket[2] += 1
+                allowed = bool(limit.sample) and bucket[2] % limit.sample == 0
+                if allowed:
+                    self.sampled += 1
+                else:
+                    bucket[3] += 1
+                    self.suppressed += 1
+            
+            # setattr, unlike record.__dict__, does not make Python build the instance dictionary
+            setattr(record, RATE_LIMIT_ATTRIBUTE, (self, allowed))
+            if self.summary_interval and now - self._last_summary >= self.summary_interval:
+                summary = self._collect_summary(now)
+        
+        if summary is not None:
+            self._log_summary(*summary)
+        return allowed
+    
+    def stats(self) -> dict:
+        """Get rate limiting counters.
+        
+        Returns:
+            Dictionary with passed, sampled and suppressed records and the number of buckets kept
+        """
+        with self._lock:
+            return {
+                "passed": self.passed,
+                "sampled": self.sampled,
+                "suppressed": self.suppressed,
+                "keys": len(self._buckets),
+            }
+    
+    def reset_after_fork(self) -> None:
+        """Replace the lock in a forked child, in case a parent thread held it."""
+        self._lock = threading.Lock()
+    
+    def _find_limit(self, name: str, levelno: int) -> Optional[RateLimit]:
+        """Find the most specific limit for a logger and level."""
+        # Summary records are never limited
+        if name == SUMMARY_LOGGER:
+            return None
+        for limit in self.limits:
+            if limit.matches(name, levelno):
+                return limit
+        return None
+    
+    def _collect_summary(self, now: float) -> Optional[Tuple[int, float, List[Tuple[int, str, Any]]]]:
+        """Take the suppressed counts since the last summary; called with the lock held.
+        
+        Returns:
+            Tuple of total suppressed, seconds covered and the top (count, logger, template)
+            entries, or None if nothing was suppressed
+        """
+        seconds = now - self._last_summary
+        self._last_summary = now
+        total = self._evicted_suppressed
+        self._evicted_suppressed = 0
+        counts = []
+        for (name, template), bucket in self._buckets.items():
+            if bucket[3]:
+                total += bucket[3]
+                counts.append((bucket[3], name, template))
+                bucket[3] = 0
+        if not total:
+            return None
+        counts.sort(key=lambda entry: entry[0], reverse=True)
+        return total, seconds, counts[:_SUMMARY_TOP]
+    
+    def _log_summary(self, total: int, seconds: float, top: List[Tuple[int, str, Any]]) -> None:
+        """Log a summary record; records of SUMMARY_LOGGER bypass the filter."""
+        details = ", ".join(f"{name}: {template!r} ({count})" for count, name, template in top)
+        logging.getLogger(SUMMARY_LOGGER).warning(
+            "Rate limit suppressed %d records in the last %.0fs; most from %s", total, seconds, details)
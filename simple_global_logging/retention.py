@@ -0,0 +1,341 @@
+"""
+Retention of old log files for simple_global_logging.
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+import atexit
+import bisect
+import os
+import re
+import threading
+import time
+
+from simple_global_logging.compression import STALE_LOG_AGE
+from simple_global_logging.utils import lower_thread_priority
+
+
+# How often LogPruner checks the directory without being asked
+DEFAULT_PRUNE_INTERVAL = 3600.0
+
+# How often LogPruner lists the directory instead of using its index, which
+# picks up files of other processes and changes made by hand
+DEFAULT_RESCAN_INTERVAL = 6 * 3600.0
+
+# Files removed by LogPruner before it pauses for other I/O
+DEFAULT_PRUNE_BATCH = 100
+
+# Serial log files, per-PID files of forked children and their archives
+_PRUNABLE_NAME = re.compile(r'\d{8}-\d{7}(?:\.\d+)?\.log(?:\.gz|\.xz)?\Z')
+
+
+def check_limits(max_files: Optional[int], max_age_days: Optional[float], max_total_bytes: Optional[int]) -> None:
+    """Raise ValueError for retention limits that are not positive."""
+    for name, value in (("max_files", max_files), ("max_age_days", max_age_days), ("max_total_bytes", max_total_bytes)):
+        if value is not None and value <= 0:
+            raise ValueError(f"{name} must be positive, got {value!r}")
+
+
+def _scan(base_dir: Union[str, Path]) -> List[Tuple[str, str, int, float]]:
+    """List the log files of a directory, oldest serial first.
+    
+    Returns:
+        (name, path, size, modification time) per file
+    """
+    files = []
+    try:
+        with os.scandir(base_dir) as entries:
+            for entry in entries:
+                if not _PRUNABLE_NAME.match(entry.name):
+                    continue
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                files.append((entry.name, entry.path, stat.st_size, stat.st_mtime))
+    except OSError:
+        return []
+    # Names start with date and serial, so they sort chronologically
+    files.sort()
+    return files
+
+
+def _select(files: List[Tuple[str, str, int, float]], max_files: Optional[int], max_age_days: Optional[float],
+            max_total_bytes: Optional[int], protected: Set[Path], min_age: float) -> List[Tuple[str, int]]:
+    """Pick the files to remove, oldest first.
+    
+    Protected and recently modified files are kept but still count towards the limits.
+    
+    Returns:
+        (path, size) per file to remove
+    """
+    now = time.time()
+    expired = now - max_age_days * 86400 if max_age_days is not None else None
+    recent = now - min_age
+    count = len(files)
+    total = sum(size for _, _, size, _ in files)
+    selected = []
+    for _, path, size, mtime in files:
+        over = ((max_files is not None and count > max_files)
+                or (max_total_bytes is not None and total > max_total_bytes)
+                or (expired is not None and mtime < expired))
+        if not over:
+            if expired is None:
+                # Only the age limit can apply to newer files
+                break
+            continue
+        if mtime >= recent or Path(path).resolve() in protected:
+            continue
+        selected.append((path, size))
+        count -= 1
+        total -= size
+    return selected
+
+
+def prune(base_dir: Union[str, Path] = "out", max_files: Optional[int] = None, max_age_days: Optional[float] = None,
+          max_total_bytes: Optional[int] = None, exclude: Iterable[Union[str, Path]] = (),
+          min_age: float = STALE_LOG_AGE) -> List[Path]:
+    """Remove the oldest log files of a directory until it is within the limits.
+    
+    Only files named like the ones setup_logging creates are considered:
+    YYYYMMDD-serial log files, per-PID files of forked children and their
+    .gz/.xz archives. Files are removed oldest serial first.
+    
+    Args:
+        base_dir: Log directory (default: "out")
+        max_files: Keep at most this many log files (default: no limit)
+        max_age_days: Remove files last modified more than this many days ago (default: no limit)
+        max_total_bytes: Keep the log files at most this large in total (default: no limit)
+        exclude: Files never to remove, e.g. get_current_log_file() (default: none)
+        min_age: Never remove files modified less than this many seconds ago, which
+                 other processes may still be writing to (default: 300)
+    
+    Returns:
+        Paths of the removed files
+    """
+    check_limits(max_files, max_age_days, max_total_bytes)
+    protected = {Path(path).resolve() for path in exclude if path is not None}
+    removed = []
+    for path, _ in _select(_scan(base_dir), max_files, max_age_days, max_total_bytes, protected, min_age):
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        removed.append(Path(path))
+    return removed
+
+
+class LogPruner:
+    """Applies a retention policy to a log directory on a low-priority background thread.
+    
+    The directory is checked when the pruner starts, on request() (e.g. after a
+    rollover) and every interval seconds. Files are removed in batches with a
+    pause in between, so pruning a large backlog does not starve the writers of
+    disk I/O. On Linux the thread lowers its own scheduling priority.
+    
+    Checks work from an index of the log files' names, sizes and modification
+    times instead of listing the directory. The first check and every check
+    after rescan_interval seconds rebuild it from the directory. In between it
+    is kept up to date by update(), which rotation and compression call for the
+    files they finish, archive and remove, and the files in use are stat()ed
+    again on every check, since they may still grow.
+    """
+    
+    def __init__(self, base_dir: Union[str, Path], max_files: Optional[int] = None,
+                 max_age_days: Optional[float] = None, max_total_bytes: Optional[int] = None,
+                 exclude: Optional[Callable[[], Iterable[Union[str, Path]]]] = None,
+                 interval: float = DEFAULT_PRUNE_INTERVAL, min_age: float = STALE_LOG_AGE,
+                 batch_size: int = DEFAULT_PRUNE_BATCH, batch_pause: float = 0.01, nice: int = 10,
+                 rescan_interval: float = DEFAULT_RESCAN_INTERVAL):
+        """Initialize LogPruner and start its thread.
+        
+        Args:
+            base_dir: Log directory
+            max_files: Keep at most this many log files (default: no limit)
+            max_age_days: Remove files last modified more than this many days ago (default: no limit)
+            max_total_bytes: Keep the log files at most this large in total (default: no limit)
+            exclude: Function returning the files in use, called before every check (default: none)
+            interval: Seconds between checks without a request (default: 3600)
+            min_age: Never remove files modified less than this many seconds ago (default: 300)
+            batch_size: Files removed between pauses (default: 100)
+            batch_pause: Seconds to pause between batches (default: 0.01)
+            nice: Niceness added to the thread on Linux (default: 10)
+            rescan_interval: Seconds after which a check lists the directory again
+                             instead of using the index (default: 21600)
+        """
+        check_limits(max_files, max_age_days, max_total_bytes)
+        self.base_dir = base_dir
+        self.max_files = max_files
+        self.max_age_days = max_age_days
+        self.max_total_bytes = max_total_bytes
+        self.exclude = exclude
+        self.interval = interval
+        self.min_age = min_age
+        self.batch_size = max(1, batch_size)
+        self.batch_pause = batch_pause
+        self.nice = nice
+        self.rescan_interval = rescan_interval
+        
+        self.checks = 0
+        self.scans = 0
+        self.removed_files = 0
+        self.removed_bytes = 0
+        
+        # Index of the log files: sorted names, and name -> (name, path, size, mtime)
+        self._names: List[str] = []
+        self._files: Dict[str, Tuple[str, str, int, float]] = {}
+        self._last_scan: Optional[float] = None
+        
+        self._requested = True
+        self._running = False
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="simple_global_logging-pruner", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+    
+    def request(self) -> None:
+        """Ask the thread to check the directory soon."""
+        with self._condition:
+            self._requested = True
+            self._condition.notify_all()
+    
+    def update(self, path: Union[str, Path]) -> None:
+        """Record the current size and age of a log file, or that it is gone.
+        
+        Args:
+            path: Log file in base_dir this process finished, created or removed
+        """
+        directory, name = os.path.split(os.path.abspath(path))
+        if not _PRUNABLE_NAME.match(name) or directory != os.path.abspath(self.base_dir):
+            return
+        path = os.path.join(self.base_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        with self._condition:
+            if stat is None:
+                self._forget(name)
+            else:
+                self._remember((name, path, stat.st_size, stat.st_mtime))
+    
+    def _remember(self, entry: Tuple[str, str, int, float]) -> None:
+        """Add or replace an index entry. Must be called with the lock held."""
+        name = entry[0]
+        if name not in self._files:
+            bisect.insort(self._names, name)
+        self._files[name] = entry
+    
+    def _forget(self, name: str) -> None:
+        """Remove an index entry, if present. Must be called with the lock held."""
+        if self._files.pop(name, None) is not None:
+            del self._names[bisect.bisect_left(self._names, name)]
+    
+    def stats(self) -> dict:
+        """Get retention counters.
+        
+        Returns:
+            Dictionary with checks, scans (directory listings), removed_files and removed_bytes
+        """
+        with self._condition:
+            return {
+                "checks": self.checks,
+                "scans": self.scans,
+                "removed_files": self.removed_files,
+                "removed_bytes": self.removed_bytes,
+            }
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no check is requested or running.
+        
+        Args:
+            timeout: Maximum seconds to wait (default: wait indefinitely)
+        
+        Returns:
+            True if the pruner was idle within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while (self._requested or self._running) and not self._stopped:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the thread after the file being removed. Called automatically at interpreter exit.
+        
+        Args:
+            timeout: Seconds to wait for the thread (default: 5.0)
+        """
+        with self._condition:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        atexit.unregister(self.stop)
+    
+    def _run(self) -> None:
+        """Pruner thread: check the directory when requested or every interval."""
+        lower_thread_priority(self.nice)
+        while True:
+            with self._condition:
+                if not (self._requested or self._stopped):
+                    self._condition.wait(self.interval)
+                if self._stopped:
+                    return
+                self._requested = False
+                self._running = True
+            try:
+                self._check()
+            except Exception:
+                # A failed check is retried on the next request or interval
+                pass
+            with self._condition:
+                self._running = False
+                self.checks += 1
+                self._condition.notify_all()
+    
+    def _check(self) -> None:
+        """Remove files beyond the limits, a batch at a time."""
+        exclude = [path for path in (self.exclude() if self.exclude is not None else ()) if path is not None]
+        protected = {Path(path).resolve() for path in exclude}
+        now = time.monotonic()
+        if self._last_scan is None or now - self._last_scan >= self.rescan_interval:
+            files = _scan(self.base_dir)
+            with self._condition:
+                self._names = [entry[0] for entry in files]
+                self._files = {entry[0]: entry for entry in files}
+                self.scans += 1
+            self._last_scan = now
+        else:
+            # Files in use may have grown since they were indexed
+            for path in exclude:
+                self.update(path)
+            with self._condition:
+                files = [self._files[name] for name in self._names]
+        
+        selected = _select(files, self.max_files, self.max_age_days, self.max_total_bytes,
+                           protected, self.min_age)
+        for index, (path, size) in enumerate(selected):
+            if index and index % self.batch_size == 0:
+                time.sleep(self.batch_pause)
+            if self._stopped:
+                return
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                # Removed by someone else since it was indexed
+                with self._condition:
+                    self._forget(os.path.basename(path))
+                continue
+            except OSError:
+                continue
+            with self._condition:
+                self._forget(os.path.basename(path))
+                self.removed_files += 1
+                self.removed_bytes += size
@@ -0,0 +1,326 @@
+"""
+Log file rotation for simple_global_logging.
+"""
+
+from datetime import datetime, time as dt_time, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import atexit
+import threading
+import time
+
+from simple_global_logging.utils import claim_log_file
+from simple_global_logging.writers import close_inherited
+
+
+def next_local_midnight(now: float, tz: Optional[tzinfo] = None) -> float:
+    """Get the next local midnight after a timestamp.
+    
+    Args:
+        now: Seconds since the epoch
+        tz: Timezone whose midnight is wanted (default: UTC)
+    
+    Returns:
+        Seconds since the epoch of the next 00:00 in tz
+    """
+    if tz is None:
+        tz = timezone.utc
+    tomorrow = datetime.fromtimestamp(now, tz).date() + timedelta(days=1)
+    return datetime.combine(tomorrow, dt_time(0), tzinfo=tz).timestamp()
+
+
+class RotationSlot:
+    """A writer's registration with a LogRotator.
+    
+    On rollover the rotator opens the next file with the slot's opener and leaves
+    it in the slot. The writer checks `pending` on each write and swaps its handle
+    with LogRotator.switch(); it never opens or closes files itself.
+    """
+    
+    def __init__(self, opener: Callable[[Path], Any], path: Path):
+        """Initialize RotationSlot.
+        
+        Args:
+            opener: Function opening a path the way the writer needs it
+            path: File the writer currently writes to
+        """
+        self.opener = opener
+        self.path = path
+        self.pending: Optional[Tuple[Path, Any]] = None
+
+
+class LogRotator:
+    """Rolls log files over to the next YYYYMMDD-serial name by size and/or at midnight.
+    
+    Writers register a RotationSlot and report the bytes they write. A background
+    thread decides when to roll over, claims the next file with claim_log_file(),
+    opens it for every registered writer and closes the files they retire.
+    Writers only swap a handle on their next write, so they never wait for a file
+    to be opened, flushed or closed. Until then they keep appending to the
+    previous file, which may grow slightly past max_bytes.
+    
+    Once every writer has switched away from a previous file and its handles are
+    closed, on_finished is called with its path.
+    """
+    
+    def __init__(self, path: Path, base_dir: str, tz: Optional[tzinfo] = None,
+                 max_bytes: Optional[int] = None, at_midnight: bool = False,
+                 preamble: Optional[Callable[[], bytes]] = None,
+                 on_rotate: Optional[Callable[[Path], None]] = None,
+                 on_finished: Optional[Callable[[Path], None]] = None):
+        """Initialize LogRotator and start its thread.
+        
+        Args:
+            path: Current log file
+            base_dir: Directory for new log files
+            tz: Timezone for file names and midnight (default: UTC)
+            max_bytes: Roll over once about this many bytes were written to a file (default: no limit)
+            at_midnight: Roll over at local midnight in tz (default: False)
+            preamble: Function returning bytes every new file starts with, e.g. a binary header (default: none)
+            on_rotate: Called with the new path on the rotator thread after each rollover
+            on_finished: Called on the rotator thread with the path of a previous file
+                         once no writer has it open any more
+        """
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes!r}")
+        self.path = Path(path)
+        self.base_dir = base_dir
+        self.tz = tz if tz is not None else timezone.utc
+        self.max_bytes = max_bytes
+        self.at_midnight = at_midnight
+        self.preamble = preamble
+        self.on_rotate = on_rotate
+        self.on_finished = on_finished
+        self.rotations = 0
+        self.size = self.path.stat().st_size if self.path.exists() else 0
+        
+        self._slots: List[RotationSlot] = []
+        # Handles per path: writers using it plus prepared files not taken yet
+        self._users: Dict[Path, int] = {}
+        # (path, file or None) released by writers, closed by the thread
+        self._retired: List[Tuple[Path, Any]] = []
+        self._requested = False
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="simple_global_logging-rotator", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+    
+    def register(self, opener: Callable[[Path], Any], path: Optional[Path] = None) -> RotationSlot:
+        """Register a writer.
+        
+        Args:
+            opener: Function opening a new log file for the writer
+            path: File the writer currently writes to (default: the rotator's current file)
+        
+        Returns:
+            Slot the writer checks for prepared files
+        """
+        slot = RotationSlot(opener, Path(path) if path is not None else self.path)
+        with self._condition:
+            self._slots.append(slot)
+            self._users[slot.path] = self._users.get(slot.path, 0) + 1
+        return slot
+    
+    def unregister(self, slot: RotationSlot) -> None:
+        """Unregister a writer that closed its file, and close any file prepared for it."""
+        with self._condition:
+            if slot not in self._slots:
+                return
+            self._slots.remove(slot)
+            pending, slot.pending = slot.pending, None
+        if pending is not None:
+            self._retire(*pending)
+        self._retire(slot.path, None)
+    
+    def switch(self, slot: RotationSlot, current: Any) -> Optional[Tuple[Path, Any]]:
+        """Take the file prepared for a writer and retire the one it used.
+        
+        Args:
+            slot: Writer's slot
+            current: File the writer used until now, or None if it never opened it;
+                     the rotator thread flushes and closes it
+        
+        Returns:
+            (path, file) to use from now on, or None if no file was prepared
+        """
+        with self._condition:
+            pending, slot.pending = slot.pending, None
+            if pending is None:
+                return None
+            previous, slot.path = slot.path, pending[0]
+        self._retire(previous, current)
+        return pending
+    
+    def open_paths(self) -> Set[Path]:
+        """Get the current file and every previous file a writer still has open."""
+        with self._condition:
+            return set(self._users) | {self.path}
+    
+    def written(self, size: int) -> None:
+        """Report bytes written to the current file; requests a rollover past max_bytes.
+        
+        Args:
+            size: Bytes (or characters, for text writers) just written
+        """
+        self.size += size
+        if self.max_bytes is not None and self.size >= self.max_bytes and not self._requested:
+            self.request_rollover()
+    
+    def request_rollover(self) -> None:
+        """Ask the rotator thread to roll over to a new file."""
+        with self._condition:
+            self._requested = True
+            self._condition.notify()
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the rotator thread and close retired files.
+        
+        Files already swapped in stay with their writers. Called automatically at interpreter exit.
+        
+        Args:
+            timeout: Seconds to wait for the thread (default: 5.0)
+        """
+        with self._condition:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        atexit.unregister(self.stop)
+    
+    def reset_after_fork(self) -> None:
+        """Stop rotating in a child created with os.fork(); rollovers stay with the parent.
+        
+        The rotator thread does not exist in the child. Files the parent prepared
+        or retired are closed without flushing, registered writers never get a new
+        file, and the lock is replaced in case a parent thread held it.
+        """
+        atexit.unregister(self.stop)
+        inherited = [slot.pending for slot in self._slots if slot.pending is not None] + self._retired
+        for slot in self._slots:
+            slot.pending = None
+        for _, file in inherited:
+            if file is not None:
+                close_inherited(file)
+        self._slots = []
+        self._users = {}
+        self._retired = []
+        self._stopped = True
+        self._condition = threading.Condition()
+    
+    def _retire(self, path: Path, file: Any) -> None:
+        """Hand a released handle of path to the rotator thread, or close it directly once stopped."""
+        with self._condition:
+            if not self._stopped:
+                self._retired.append((path, file))
+                self._condition.notify()
+                return
+        self._close(path, file)
+    
+    def _close(self, path: Path, file: Any) -> None:
+        """Close a released handle and report the path once its last handle is gone."""
+        if file is not None:
+            _close_quietly(file)
+        with self._condition:
+            users = self._users.get(path, 0) - 1
+            if users > 0:
+                self._users[path] = users
+                return
+            self._users.pop(path, None)
+            finished = path != self.path
+        if finished:
+            self._finished(path)
+    
+    def _finished(self, path: Path) -> None:
+        """Call on_finished for a previous file."""
+        if self.on_finished is not None:
+            try:
+                self.on_finished(path)
+            except Exception:
+                pass
+    
+    def _run(self) -> None:
+        """Rotator thread: wait for a size request or midnight, roll over, close retired files."""
+        deadline = next_local_midnight(time.time(), self.tz) if self.at_midnight else None
+        while True:
+            with self._condition:
+                while not (self._requested or self._stopped or self._retired):
+                    if deadline is not None and time.time() >= deadline:
+                        self._requested = True
+                        break
+                    self._condition.wait(None if deadline is None else max(0.0, deadline - time.time()))
+                retired, self._retired = self._retired, []
+                rollover = self._requested and not self._stopped
+                stopped = self._stopped
+            
+            for path, file in retired:
+                self._close(path, file)
+            if rollover:
+                self._rollover()
+                if deadline is not None and time.time() >= deadline:
+                    deadline = next_local_midnight(time.time(), self.tz)
+            if stopped:
+                with self._condition:
+                    retired, self._retired = self._retired, []
+                for path, file in retired:
+                    self._close(path, file)
+                return
+    
+    def _rollover(self) -> None:
+        """Create the next log file and prepare it for every registered writer."""
+        try:
+            path = claim_log_file(self.base_dir, self.tz)
+            with open(path, 'ab') as f:
+                if self.preamble is not None and f.tell() == 0:
+                    f.write(self.preamble())
+                size = f.tell()
+        except Exception:
+            # Keep writing to the current file; try again on the next request
+            with self._condition:
+                self._requested = False
+            return
+        
+        with self._condition:
+            slots = list(self._slots)
+        replaced = []
+        for slot in slots:
+            try:
+                file = slot.opener(path)
+            except Exception:
+                continue
+            with self._condition:
+                if slot not in self._slots:
+                    replaced.append((path, file))
+                elif slot.pending is not None:
+                    replaced.append(slot.pending)
+                self._users[path] = self._users.get(path, 0) + 1
+                if slot in self._slots:
+                    slot.pending = (path, file)
+        
+        with self._condition:
+            previous, self.path = self.path, path
+            self.size = size
+            self.rotations += 1
+            self._requested = False
+            unused = previous not in self._users
+        # Prepared files a writer never took before this rollover, and the
+        # previous file if no writer had it open
+        for old_path, file in replaced:
+            self._close(old_path, file)
+        if unused:
+            self._finished(previous)
+        if self.on_rotate is not None:
+            try:
+                self.on_rotate(path)
+            except Exception:
+                pass
+
+
+def _close_quietly(file: Any) -> None:
+    """Flush and close a file, ignoring errors."""
+    try:
+        file.close()
+    except Exception:
+        pass
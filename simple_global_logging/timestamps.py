@@ -0,0 +1,192 @@
+"""
+Cached timestamp formatting for simple_global_logging.
+"""
+
+from datetime import datetime, timezone, tzinfo
+from typing import Dict, Optional, Tuple
+import os
+import threading
+import time
+
+
+DEFAULT_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# How far TimezoneConverter looks for the next offset change before assuming none
+_TRANSITION_PROBE_SECONDS = 24 * 60 * 60
+
+
+class TimestampCache:
+    """Formats epoch timestamps, reusing the formatted string within the same second.
+    
+    Logging and capture produce many records per second, so the datetime is only
+    built and formatted once per (second, timezone) instead of once per record.
+    """
+    
+    def __init__(self, tz: Optional[tzinfo] = None, fmt: str = DEFAULT_TIMESTAMP_FORMAT):
+        """Initialize TimestampCache.
+        
+        Args:
+            tz: Timezone for timestamps (default: UTC)
+            fmt: strftime format; must not contain sub-second fields (default: "%Y-%m-%d %H:%M:%S")
+        """
+        if tz is None:
+            tz = timezone.utc
+        self.tz = tz
+        self.fmt = fmt
+        # (epoch second, formatted text), replaced as a whole so readers never see a mismatch
+        self._cached: Tuple[Optional[int], str] = (None, "")
+    
+    def format(self, created: float) -> str:
+        """Format a timestamp with second precision.
+        
+        Args:
+            created: Seconds since the epoch
+        
+        Returns:
+            Formatted timestamp
+        """
+        second = int(created // 1)
+        cached_second, text = self._cached
+        if second != cached_second:
+            text = datetime.fromtimestamp(second, self.tz).strftime(self.fmt)
+            self._cached = (second, text)
+        return text
+    
+    def format_ms(self, created: float, separator: str = ".") -> str:
+        """Format a timestamp with millisecond precision.
+        
+        Args:
+            created: Seconds since the epoch
+            separator: Separator between seconds and milliseconds (default: ".")
+        
+        Returns:
+            Formatted timestamp followed by the milliseconds
+        """
+        return f"{self.format(created)}{separator}{int(created % 1 * 1000):03d}"
+
+
+class TimezoneConverter:
+    """Converts epoch timestamps to time.struct_time in a timezone.
+    
+    Intended as logging.Formatter.converter, which is called with record.created.
+    The result matches datetime.fromtimestamp(created, tz).timetuple(). Fixed-offset
+    zones use a precomputed offset; other zones (e.g. zoneinfo) cache the UTC offset
+    for the span between two transitions, so a datetime is only built when a record
+    falls outside that span. The last converted second is reused as well.
+    """
+    
+    def __init__(self, tz: Optional[tzinfo] = None):
+        """Initialize TimezoneConverter.
+        
+        Args:
+            tz: Timezone for timestamps (default: UTC)
+        """
+        if tz is None:
+            tz = timezone.utc
+        self.tz = tz
+        if isinstance(tz, timezone):
+            self._fixed: Optional[Tuple[float, int]] = (tz.utcoffset(None).total_seconds(), -1)
+        else:
+            self._fixed = None
+        # (start, end, offset seconds, tm_isdst) valid for start <= created < end,
+        # replaced as a whole so readers never see a mismatch
+        self._span: Tuple[int, int, float, int] = (0, 0, 0.0, -1)
+        # (epoch second, struct_time) of the last conversion
+        self._cached: Tuple[Optional[int], Optional[time.struct_time]] = (None, None)
+    
+    def __call__(self, created: Optional[float] = None) -> time.struct_time:
+        """Convert a timestamp to a struct_time in the converter's timezone.
+        
+        Args:
+            created: Seconds since the epoch (default: now)
+        
+        Returns:
+            Local time in the converter's timezone
+        """
+        if created is None:
+            created = time.time()
+        second = int(created // 1)
+        cached_second, converted = self._cached
+        if second == cached_second:
+            return converted
+        
+        if self._fixed is not None:
+            offset, isdst = self._fixed
+        else:
+            start, end, offset, isdst = self._span
+            if not start <= second < end:
+                start, end, offset, isdst = self._span = self._find_span(second)
+        converted = time.struct_time(time.gmtime(second + offset)[:8] + (isdst,))
+        self._cached = (second, converted)
+        return converted
+    
+    def _offset_at(self, seconds: float) -> Tuple[float, int]:
+        """Get the UTC offset and tm_isdst flag in effect at a timestamp."""
+        local = datetime.fromtimestamp(seconds, self.tz)
+        dst = local.dst()
+        return local.utcoffset().total_seconds(), -1 if dst is None else int(bool(dst))
+    
+    def _find_span(self, second: int) -> Tuple[int, int, float, int]:
+        """Find the span of whole seconds around second that shares its UTC offset.
+        
+        Looks one day either way and binary searches for the transition when the
+        offset there differs. Zones changing offset twice within a day may get a
+        span that is too long; real-world zones do not.
+        """
+        current = self._offset_at(second)
+        try:
+            start = self._boundary(second, second - _TRANSITION_PROBE_SECONDS, current) + 1
+            end = self._boundary(second, second + _TRANSITION_PROBE_SECONDS, current)
+        except (OverflowError, OSError, ValueError):
+            # Near the limits of datetime: only cache this second
+            start, end = second, second + 1
+        return start, end, current[0], current[1]
+    
+    def _boundary(self, inside: int, outside: int, current: Tuple[float, int]) -> int:
+        """Get the second nearest to inside, up to outside, whose offset differs from current.
+        
+        Returns outside itself if the offset there is unchanged, so the span ends at the probe.
+        """
+        if self._offset_at(outside) == current:
+            return outside
+        while abs(outside - inside) > 1:
+            middle = (inside + outside) // 2
+            if self._offset_at(middle) == current:
+                inside = middle
+            else:
+                outside = middle
+        return outside
+
+
+_caches: Dict[Tuple[tzinfo, str], TimestampCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _reinit_lock() -> None:
+    """Replace the lock in a forked child, in case a parent thread held it."""
+    global _caches_lock
+    _caches_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reinit_lock)
+
+
+def get_timestamp_cache(tz: Optional[tzinfo] = None, fmt: str = DEFAULT_TIMESTAMP_FORMAT) -> TimestampCache:
+    """Get the shared TimestampCache for a timezone and format.
+    
+    Args:
+        tz: Timezone for timestamps (default: UTC)
+        fmt: strftime format (default: "%Y-%m-%d %H:%M:%S")
+    
+    Returns:
+        TimestampCache shared by all callers using the same timezone and format
+    """
+    if tz is None:
+        tz = timezone.utc
+    key = (tz, fmt)
+    cache = _caches.get(key)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.setdefault(key, TimestampCache(tz, fmt))
+    return cache
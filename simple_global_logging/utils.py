@@ -4,20 +4,45 @@ Utility functions for simple_global_logging.
 
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
-import glob
+import os
 import re
-from typing import Optional
+import sys
+import threading
+from typing import Callable, Optional
 
+# Environment variable holding the collector's address for child processes
+COLLECTOR_ENV = "SIMPLE_GLOBAL_LOGGING_COLLECTOR"
 
-def generate_log_filename(base_dir: str, tz: Optional[timezone] = None) -> Path:
-    """Generate log filename in format {yyyymmdd-7digit-serial-001}.log
+# Per-directory file remembering the last serial handed out, as "YYYYMMDD-NNNNNNN\n"
+SERIAL_FILE = ".simple_global_logging.serial"
+
+# Taken serials in a row after which the directory is scanned again
+MAX_SERIAL_PROBES = 16
+
+# Suffixes of the archives LogCompressor replaces log files with (compression.COMPRESSION_SUFFIXES)
+ARCHIVE_SUFFIXES = (".gz", ".xz")
+
+# Log files and their compressed archives; per-PID files of forked children do not count
+_SERIAL_NAME = re.compile(r'(\d{8})-(\d{7})\.log(?:\.\w+)?\Z')
+_COUNTER = re.compile(rb'(\d{8})-(\d{7})\n\Z')
+
+
+def claim_log_file(base_dir: str, tz: Optional[timezone] = None) -> Path:
+    """Create the next log file, named {yyyymmdd}-{7-digit serial}.log
+    
+    The file is created empty, so each serial is claimed by exactly one caller,
+    also across processes starting at the same time. A serial whose log file has
+    been compressed to a .log.gz or .log.xz archive stays taken. The last serial
+    is kept in a small counter file in base_dir, so the directory is only scanned
+    when the counter is missing, from an earlier version, or behind the files on
+    disk.
     
     Args:
-        base_dir: Base directory for log files
+        base_dir: Base directory for log files, created if missing
         tz: Timezone for timestamp (default: UTC)
-        
+    
     Returns:
-        Path object for the log file
+        Path of the new, empty log file
     """
     # Default to UTC if no timezone specified
     if tz is None:
@@ -28,26 +53,121 @@ def generate_log_filename(base_dir: str, tz: Optional[timezone] = None) -> Path:
     output_dir = Path(base_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Find existing files for today
-    pattern = f"{today}-*.log"
-    existing_files = glob.glob(str(output_dir / pattern))
-    
-    # Extract serial numbers from existing files
-    serial_numbers = []
-    for file_path in existing_files:
-        filename = Path(file_path).name
-        match = re.search(rf"{today}-(\d{{7}})\.log", filename)
-        if match:
-            serial_numbers.append(int(match.group(1)))
-    
-    # Determine next serial number
-    if serial_numbers:
-        next_serial = max(serial_numbers) + 1
-    else:
-        next_serial = 1
-    
-    # Format as 7-digit number
-    serial_str = f"{next_serial:07d}"
-    filename = f"{today}-{serial_str}.log"
-    
-    return output_dir / filename 
\ No newline at end of file
+    counter = os.open(output_dir / SERIAL_FILE, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        serial = _first_serial(output_dir, today, os.read(counter, 64))
+        path = _free_serial(output_dir, today, serial, _create_log_file)
+        
+        # Fixed width, so the update is a single write readers never see half done
+        os.lseek(counter, 0, os.SEEK_SET)
+        os.write(counter, f"{path.stem}\n".encode('ascii'))
+    finally:
+        os.close(counter)
+    
+    return path
+
+
+def generate_log_filename(base_dir: str, tz: Optional[timezone] = None) -> Path:
+    """Get the name the next claim_log_file() call would return, without creating anything.
+    
+    Another process may claim the serial before the caller opens the file;
+    use claim_log_file() for a file to write to.
+    
+    Args:
+        base_dir: Base directory for log files
+        tz: Timezone for timestamp (default: UTC)
+    
+    Returns:
+        Path object for the log file
+    """
+    if tz is None:
+        tz = timezone.utc
+    
+    today = datetime.now(tz).strftime("%Y%m%d")
+    output_dir = Path(base_dir)
+    if not output_dir.is_dir():
+        return output_dir / f"{today}-{1:07d}.log"
+    
+    try:
+        with open(output_dir / SERIAL_FILE, 'rb') as counter:
+            recorded = counter.read(64)
+    except FileNotFoundError:
+        recorded = b""
+    serial = _first_serial(output_dir, today, recorded)
+    return _free_serial(output_dir, today, serial, lambda path: not _serial_taken(path))
+
+
+def _first_serial(output_dir: Path, today: str, recorded: bytes) -> int:
+    """Get the serial after the one in the counter file, or after today's files if it has none."""
+    match = _COUNTER.match(recorded)
+    if match is None:
+        return _scan_serial(output_dir, today) + 1
+    if match.group(1) == today.encode('ascii'):
+        return int(match.group(2)) + 1
+    return 1
+
+
+def _free_serial(output_dir: Path, today: str, serial: int, take: Callable[[Path], bool]) -> Path:
+    """Find the first serial from serial on that take() accepts and return its log file path."""
+    probes = 0
+    while True:
+        path = output_dir / f"{today}-{serial:07d}.log"
+        if take(path):
+            return path
+        probes += 1
+        if probes == MAX_SERIAL_PROBES:
+            # Files were created without the counter; start after the last one
+            serial = max(serial, _scan_serial(output_dir, today)) + 1
+        else:
+            serial += 1
+
+
+def _create_log_file(path: Path) -> bool:
+    """Create a log file exclusively; False if its serial is taken."""
+    try:
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+    except FileExistsError:
+        return False
+    # LogCompressor removes a log file only once its archive is in place, so an
+    # archive is visible whenever the log file it replaced is gone
+    if _serial_taken(path, archives_only=True):
+        os.unlink(path)
+        return False
+    return True
+
+
+def _serial_taken(path: Path, archives_only: bool = False) -> bool:
+    """Check whether a log file or one of its archives exists."""
+    if not archives_only and path.exists():
+        return True
+    return any(path.with_name(path.name + suffix).exists() for suffix in ARCHIVE_SUFFIXES)
+
+
+def _scan_serial(output_dir: Path, today: str) -> int:
+    """Find the highest serial of today's log files and archives, or 0 if there are none."""
+    highest = 0
+    prefix = today + "-"
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.startswith(prefix):
+                match = _SERIAL_NAME.match(name)
+                if match is not None:
+                    highest = max(highest, int(match.group(2)))
+    return highest
+
+
+def lower_thread_priority(nice: int) -> None:
+    """Lower the scheduling priority of the current thread (Linux only).
+    
+    Args:
+        nice: Niceness to add; 0 leaves the priority unchanged
+    """
+    if not nice or not sys.platform.startswith("linux"):
+        return
+    try:
+        # On Linux PRIO_PROCESS with a thread id applies to that thread only
+        tid = threading.get_native_id()
+        os.setpriority(os.PRIO_PROCESS, tid, os.getpriority(os.PRIO_PROCESS, tid) + nice)
+    except (AttributeError, OSError):
+        pass
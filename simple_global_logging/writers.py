@@ -0,0 +1,989 @@
+"""
+Log file writers for simple_global_logging.
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Dict, Iterable, Optional, TextIO, Union
+from collections import deque
+import atexit
+import errno
+import logging
+import mmap
+import os
+import threading
+import time
+
+if TYPE_CHECKING:
+    from simple_global_logging.rotation import LogRotator
+
+
+# Flush policies supported by BufferedLogWriter
+FLUSH_POLICIES = ("line", "interval", "size")
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_QUEUE_BYTES = 16 * 1024 * 1024
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_SAMPLE_RATE = 10
+DEFAULT_SUMMARY_INTERVAL = 60.0
+
+# Records queued for the listener of setup_logging(async_mode=True)
+DEFAULT_LOG_QUEUE_SIZE = 10000
+
+# Overload policies supported by AsyncLogWriter
+OVERLOAD_POLICIES = ("block", "drop-oldest", "drop-newest", "sample")
+
+# File writers supported by BufferedLogWriter
+FILE_WRITERS = ("stream", "mmap")
+
+# Space preallocated and mapped at a time by MmapFile
+DEFAULT_MMAP_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Seconds a writer waits for an exclusive lock on its log file, e.g. the compressor's, to be released
+DEFAULT_LOCK_TIMEOUT = 10.0
+
+
+def recover_log_file(path: Union[str, Path]) -> int:
+    """Truncate the zero-filled tail a crashed MmapFile writer left behind.
+    
+    Log lines never contain NUL bytes, so everything after the last non-NUL
+    byte is preallocated space that was never written.
+    
+    Args:
+        path: Text or JSON Lines log file
+    
+    Returns:
+        Length of the file after truncation
+    """
+    fd = os.open(path, os.O_RDWR)
+    try:
+        if not lock_file(fd, exclusive=True):
+            raise RuntimeError(f"log file {str(path)!r} is open in another process and cannot be trimmed")
+        return _trim_zero_tail(fd)
+    finally:
+        os.close(fd)
+
+
+def lock_file(fd: int, exclusive: bool = False) -> bool:
+    """Take a non-blocking advisory lock (flock) on an open file.
+    
+    Writers of this package hold a shared lock on the log files they append to,
+    and MmapFile an exclusive one, so the compressor can tell a file that is
+    still written from a closed one. The lock belongs to the open file and is
+    released when it is closed. A forked child shares the locks of the files it
+    inherits.
+    
+    Args:
+        fd: File descriptor
+        exclusive: Take an exclusive instead of a shared lock (default: False)
+    
+    Returns:
+        False if another open file holds a conflicting lock; True otherwise,
+        including on platforms and file systems without flock
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return True
+    try:
+        fcntl.flock(fd, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def open_locked(path: Union[str, Path], opener: Callable[[], Any], timeout: float = DEFAULT_LOCK_TIMEOUT) -> Any:
+    """Open a log file for appending and take a shared lock on it (see lock_file).
+    
+    While another open file holds an exclusive lock, such as the compressor's,
+    this waits for it to be released. If the file was removed meanwhile, the path
+    is opened again, which creates a new file.
+    
+    Args:
+        path: Log file
+        opener: Opens the path and returns a file object with fileno() and close()
+        timeout: Maximum seconds to wait for the lock (default: DEFAULT_LOCK_TIMEOUT)
+    
+    Returns:
+        File object returned by opener
+    
+    Raises:
+        BlockingIOError: If the file is still locked after timeout seconds
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.005
+    while True:
+        file = opener()
+        try:
+            locked = lock_file(file.fileno())
+            if locked and os.fstat(file.fileno()).st_nlink:
+                return file
+        except BaseException:
+            file.close()
+            raise
+        file.close()
+        if locked:
+            # Removed while we waited: open the new file at the path
+            continue
+        if time.monotonic() >= deadline:
+            raise BlockingIOError(errno.EWOULDBLOCK, "Log file is locked by another writer or the compressor", str(path))
+        time.sleep(delay)
+        delay = min(delay * 2, 0.1)
+
+
+def _trim_zero_tail(fd: int) -> int:
+    """Truncate trailing NUL bytes of an open file and return its new length."""
+    end = os.fstat(fd).st_size
+    length = end
+    while length > 0:
+        start = max(0, length - 65536)
+        block = os.pread(fd, length - start, start) if hasattr(os, 'pread') else _read_at(fd, start, length - start)
+        stripped = block.rstrip(b'\0')
+        length = start + len(stripped)
+        if stripped:
+            break
+    if length != end:
+        os.ftruncate(fd, length)
+    return length
+
+
+def _read_at(fd: int, offset: int, size: int) -> bytes:
+    """Read size bytes at offset (for platforms without os.pread)."""
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, size)
+
+
+def _preallocate(fd: int, offset: int, length: int) -> None:
+    """Reserve disk space for a file region, extending the file if needed."""
+    if hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(fd, offset, length)
+            return
+        except OSError:
+            # Not supported by the file system; fall back to a sparse extension
+            pass
+    if os.fstat(fd).st_size < offset + length:
+        os.ftruncate(fd, offset + length)
+
+
+class MmapFile:
+    """Append-only log file written through a memory map of preallocated space.
+    
+    The file is grown chunk_size bytes at a time with posix_fallocate() (or
+    ftruncate() where that is unavailable) and the chunk being written is mapped,
+    so a write is a memory copy instead of a system call. Written data is in the
+    page cache right away and survives a crash of the process; sync() forces it
+    to disk. Writes are serialised with an internal lock.
+    
+    While the file is open it is longer than the data written, padded with NUL
+    bytes. close() truncates it to the real length, and a file left padded by a
+    crash is trimmed when it is opened again.
+    
+    Use open_mmap_file() so that every writer of a path in this process shares
+    one instance; two instances, or two processes, must not map the same file.
+    The file is locked exclusively while open, so opening a file another
+    instance or process has open fails with RuntimeError instead of truncating
+    it under that process's mapping. A child created with os.fork() starts with
+    an empty registry and must drop inherited instances with close_inherited().
+    """
+    
+    def __init__(self, path: Union[str, Path], chunk_size: int = DEFAULT_MMAP_CHUNK_SIZE):
+        """Open or create the file, lock it and trim a zero-filled tail.
+        
+        Args:
+            path: Log file to append to
+            chunk_size: Bytes preallocated and mapped at a time, rounded to the
+                        mmap allocation granularity (default: 4 MiB)
+        
+        Raises:
+            RuntimeError: If the file is open in another process, or another MmapFile
+        """
+        granularity = mmap.ALLOCATIONGRANULARITY
+        self.path = Path(path)
+        self.name = str(path)
+        self.chunk_size = max(granularity, chunk_size - chunk_size % granularity)
+        self.closed = False
+        
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o666)
+        try:
+            if not lock_file(self._fd, exclusive=True):
+                raise RuntimeError(f"log file {self.name!r} is already open in another process; "
+                                   "file_writer='mmap' needs a log file of its own per process")
+            self._length = _trim_zero_tail(self._fd)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._map: Optional[mmap.mmap] = None
+        self._base = 0
+        self._end = 0
+        self._users = 1
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+    
+    def _remap(self, size: int) -> None:
+        """Map the chunk starting at the current length, large enough for size more bytes."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        granularity = mmap.ALLOCATIONGRANULARITY
+        base = self._length - self._length % granularity
+        needed = self._length - base + size
+        length = max(self.chunk_size, needed + (-needed) % granularity)
+        _preallocate(self._fd, base, length)
+        self._map = mmap.mmap(self._fd, length, offset=base)
+        self._base = base
+        self._end = base + length
+    
+    def write(self, data: bytes) -> int:
+        """Append data.
+        
+        Args:
+            data: Bytes to append
+        
+        Returns:
+            Number of bytes written
+        """
+        size = len(data)
+        with self._lock:
+            if self.closed:
+                raise ValueError("write to closed file")
+            start = self._length
+            if start + size > self._end:
+                self._remap(size)
+            offset = start - self._base
+            self._map[offset:offset + size] = data
+            self._length = start + size
+        return size
+    
+    def tell(self) -> int:
+        """Get the number of bytes in the file."""
+        return self._length
+    
+    def flush(self) -> None:
+        """Does nothing: written data is already visible to other readers of the file."""
+    
+    def sync(self) -> None:
+        """Write mapped data to disk."""
+        with self._lock:
+            if self._map is not None:
+                self._map.flush()
+    
+    def close(self) -> None:
+        """Release this user; the last one unmaps the file and truncates it to its real length."""
+        # Close under the registry lock so a new instance never maps the file
+        # before this one has truncated it
+        with _mmap_files_lock, self._lock:
+            self._users -= 1
+            if self._users > 0 or self.closed:
+                return
+            if _mmap_files.get(self.path) is self:
+                del _mmap_files[self.path]
+            self.closed = True
+            try:
+                if self._map is not None:
+                    self._map.close()
+                    self._map = None
+                # A forked child must not cut off what the parent keeps writing
+                if os.getpid() == self._pid:
+                    os.ftruncate(self._fd, self._length)
+            finally:
+                os.close(self._fd)
+
+
+_mmap_files: Dict[Path, MmapFile] = {}
+_mmap_files_lock = threading.Lock()
+
+
+def _reinit_mmap_files() -> None:
+    """Forget the parent's shared files in a forked child; they must not be written from two processes."""
+    global _mmap_files_lock
+    _mmap_files_lock = threading.Lock()
+    _mmap_files.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reinit_mmap_files)
+
+
+def close_inherited(file: Any) -> None:
+    """Close a file inherited from the parent process without writing its buffered data.
+    
+    After os.fork() the parent still owns what it buffered or mapped; writing it
+    from the child as well would duplicate it. Errors are ignored.
+    
+    Args:
+        file: File object or MmapFile opened before the fork
+    """
+    try:
+        if isinstance(file, MmapFile):
+            # Unmap the child's copy only; the parent keeps the file and its length
+            file.closed = True
+            if file._map is not None:
+                file._map.close()
+                file._map = None
+            os.close(file._fd)
+            return
+        # Point the descriptor at the null device, so close() flushes the buffer there
+        null = os.open(os.devnull, os.O_WRONLY)
+        try:
+            os.dup2(null, file.fileno())
+        finally:
+            os.close(null)
+        file.close()
+    except Exception:
+        pass
+
+
+class LockedFileHandler(logging.FileHandler):
+    """FileHandler holding a shared lock on its file while it is open (see lock_file)."""
+    
+    def _open(self) -> TextIO:
+        """Open the current log file."""
+        return self._open_path(self.baseFilename)
+    
+    def _open_path(self, path: Union[str, Path]) -> TextIO:
+        """Open a log file the way this handler writes it, with a shared lock (see open_locked)."""
+        return open_locked(path, lambda: open(path, self.mode, encoding=self.encoding, errors=self.errors))
+
+
+def open_mmap_file(path: Union[str, Path], chunk_size: int = DEFAULT_MMAP_CHUNK_SIZE) -> MmapFile:
+    """Open a MmapFile shared by every writer of the path in this process.
+    
+    Each call must be matched by a close(); the file is truncated and closed
+    when the last user closes it.
+    
+    Args:
+        path: Log file to append to
+        chunk_size: Bytes preallocated and mapped at a time (default: 4 MiB)
+    
+    Returns:
+        Shared MmapFile
+    """
+    key = Path(os.path.abspath(path))
+    with _mmap_files_lock:
+        file = _mmap_files.get(key)
+        if file is not None:
+            file._users += 1
+            return file
+        file = MmapFile(key, chunk_size)
+        _mmap_files[key] = file
+        return file
+
+
+class BufferedLogWriter:
+    """Long-lived, buffered writer for a log file.
+    
+    The file is opened lazily in binary append mode on the first write and kept
+    open until close(). Callers pass UTF-8 encoded bytes, so binary payloads are
+    written without a str round-trip. The writer does not lock; callers are
+    expected to serialise access.
+    
+    The "interval" policy only flushes on a write, so whatever the last writes
+    left in the buffer needs a flush once the interval has passed: given the
+    owner's lock, the writer schedules it on a shared background thread; owners
+    with a thread of their own, such as AsyncLogWriter, call flush_if_due().
+    
+    With file_writer="mmap" the file is a shared MmapFile instead, so writers of
+    the same path in this process append to one mapping and flushing is free.
+    """
+    
+    def __init__(self, path: Path, buffer_size: int = DEFAULT_BUFFER_SIZE, flush_policy: str = "line",
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, flush_threshold: Optional[int] = None,
+                 rotator: Optional["LogRotator"] = None, file_writer: str = "stream",
+                 lock: Optional[Any] = None):
+        """Initialize BufferedLogWriter.
+        
+        Args:
+            path: Path to log file (opened in append mode)
+            buffer_size: Size of the file buffer in bytes (default: 64 KiB)
+            flush_policy: When to flush buffered data to disk (default: "line")
+                - "line": after every write
+                - "interval": when flush_interval seconds passed since the last flush, on a
+                  write or, for what the last writes left, in the background (see lock)
+                - "size": when at least flush_threshold bytes are pending
+            flush_interval: Seconds between flushes for the "interval" policy (default: 1.0)
+            flush_threshold: Pending bytes that trigger a flush for the "size" policy
+                (default: buffer_size)
+            rotator: Optional LogRotator; the writer reports written bytes to it and
+                switches to the file it prepares on the next write
+            file_writer: "stream" for a buffered file object, or "mmap" for a shared
+                MmapFile; only for files without NUL bytes, such as text logs (default: "stream")
+            lock: Lock the owner holds around every call; lets a background thread flush
+                what the "interval" policy left unflushed after the last write (default: None)
+        """
+        if flush_policy not in FLUSH_POLICIES:
+            raise ValueError(f"flush_policy must be one of {FLUSH_POLICIES}, got {flush_policy!r}")
+        if file_writer not in FILE_WRITERS:
+            raise ValueError(f"file_writer must be one of {FILE_WRITERS}, got {file_writer!r}")
+        
+        self.path = Path(path)
+        self.file_writer = file_writer
+        self.buffer_size = buffer_size
+        self.flush_policy = flush_policy
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold if flush_threshold is not None else buffer_size
+        self.lock = lock
+        
+        self._file: Optional[BinaryIO] = None
+        self._closed = False
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._flush_scheduled = False
+        
+        self.rotator = rotator
+        self._slot = rotator.register(self._open_path, self.path) if rotator is not None else None
+    
+    def _open_path(self, path: Path) -> BinaryIO:
+        """Open a log file for appending."""
+        if self.file_writer == "mmap":
+            return open_mmap_file(path)
+        return open_locked(path, lambda: open(path, 'ab', buffering=self.buffer_size))
+    
+    def _open(self) -> BinaryIO:
+        """Open the log file for appending."""
+        self._file = self._open_path(self.path)
+        return self._file
+    
+    def open(self) -> None:
+        """Open the log file now instead of on the first write, so that errors are raised here."""
+        if self._file is None and not self._closed:
+            self._open()
+    
+    @property
+    def rotation_pending(self) -> bool:
+        """Check if the rotator has prepared a new file that the next write switches to."""
+        return self._slot is not None and self._slot.pending is not None
+    
+    def rotate(self) -> bool:
+        """Switch to the file prepared by the rotator, if any.
+        
+        The previous file is handed back to the rotator, which flushes and closes it
+        in the background.
+        
+        Returns:
+            True if the writer switched to a new file
+        """
+        switched = self.rotator.switch(self._slot, self._file) if self._slot is not None else None
+        if switched is None:
+            return False
+        self.path, self._file = switched
+        self._pending = 0
+        return True
+    
+    def write(self, data: bytes) -> None:
+        """Write data to the log file, flushing according to the flush policy.
+        
+        Args:
+            data: Bytes-like object to append to the log file
+        """
+        self.writelines((data,))
+    
+    def writelines(self, chunks: Iterable[bytes]) -> None:
+        """Write several chunks to the log file, then apply the flush policy once.
+        
+        Args:
+            chunks: Bytes-like objects to append to the log file
+        """
+        if self._closed:
+            return
+        
+        if self._slot is not None and self._slot.pending is not None:
+            self.rotate()
+        f = self._file or self._open()
+        written = 0
+        for chunk in chunks:
+            written += f.write(chunk)
+        if self.rotator is not None:
+            self.rotator.written(written)
+        
+        if self.flush_policy == "line":
+            f.flush()
+        elif self.flush_policy == "interval":
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                f.flush()
+                self._last_flush = now
+                self._pending = 0
+            else:
+                self._pending += written
+                if self.lock is not None and not self._flush_scheduled:
+                    self._flush_scheduled = True
+                    _idle_flusher.schedule(self, self._last_flush + self.flush_interval - now)
+        else:
+            self._pending += written
+            if self._pending >= self.flush_threshold:
+                f.flush()
+                self._pending = 0
+    
+    def flush(self) -> None:
+        """Flush buffered data to the log file."""
+        if self._file is not None:
+            self._file.flush()
+            self._pending = 0
+            self._last_flush = time.monotonic()
+    
+    def flush_if_due(self) -> Optional[float]:
+        """Flush what the "interval" policy left unflushed, once flush_interval has passed.
+        
+        Returns:
+            Seconds until the unflushed data is due, or None if there is none left
+        """
+        if self.flush_policy != "interval" or not self._pending or self._file is None:
+            return None
+        remaining = self._last_flush + self.flush_interval - time.monotonic()
+        if remaining > 0:
+            return remaining
+        self.flush()
+        return None
+    
+    def _idle_flush(self) -> Optional[float]:
+        """Flush for the background thread of the "interval" policy; called with the lock held."""
+        remaining = self.flush_if_due()
+        self._flush_scheduled = remaining is not None
+        return remaining
+    
+    def close(self) -> None:
+        """Flush and close the log file. Further writes are ignored."""
+        self._closed = True
+        try:
+            if self._file is not None:
+                try:
+                    self._file.close()
+                finally:
+                    self._file = None
+        finally:
+            if self._slot is not None:
+                self.rotator.unregister(self._slot)
+                self._slot = None
+    
+    def reset_after_fork(self, path: Optional[Path] = None) -> None:
+        """Drop the file inherited from the parent process, in a child created with os.fork().
+        
+        Data the parent buffered is left for the parent to write. The writer leaves
+        its rotator, whose rollovers stay with the parent, and opens the file again
+        on the next write.
+        
+        Args:
+            path: File to write from now on (default: the same file)
+        """
+        file, self._file = self._file, None
+        if file is not None:
+            close_inherited(file)
+        if path is not None:
+            self.path = Path(path)
+        self.rotator = None
+        self._slot = None
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._flush_scheduled = False
+    
+    @property
+    def closed(self) -> bool:
+        """Check if the writer has been closed."""
+        return self._closed
+
+
+class _IdleFlusher:
+    """Background thread for work due after the last write, such as flushing a buffer.
+    
+    Targets have a lock their owner holds around every call and an
+    _idle_flush() method, which the thread calls under that lock once the
+    target's deadline has passed. It returns the seconds until it is due again,
+    or None. The thread is started with the first schedule() and sleeps while
+    nothing is scheduled.
+    """
+    
+    def __init__(self):
+        """Initialize _IdleFlusher; no thread runs until the first schedule()."""
+        self._deadlines: Dict[Any, float] = {}
+        self._cond = threading.Condition(threading.Lock())
+        self._thread: Optional[threading.Thread] = None
+    
+    def schedule(self, target: Any, delay: float) -> None:
+        """Call target._idle_flush() under target.lock in delay seconds."""
+        deadline = time.monotonic() + delay
+        with self._cond:
+            self._deadlines[target] = deadline
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="simple_global_logging-flusher", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+    
+    def reset_after_fork(self) -> None:
+        """Forget the parent's targets and thread in a forked child."""
+        self._deadlines = {}
+        self._cond = threading.Condition(threading.Lock())
+        self._thread = None
+    
+    def _run(self) -> None:
+        """Flusher thread: run the targets whose deadline has passed."""
+        while True:
+            with self._cond:
+                while not self._deadlines:
+                    self._cond.wait()
+                now = time.monotonic()
+                due = [target for target, deadline in self._deadlines.items() if deadline <= now]
+                if not due:
+                    self._cond.wait(min(self._deadlines.values()) - now)
+                    continue
+                for target in due:
+                    del self._deadlines[target]
+            
+            for target in due:
+                try:
+                    with target.lock:
+                        remaining = target._idle_flush()
+                    if remaining is not None:
+                        self.schedule(target, remaining)
+                except Exception:
+                    # The target schedules itself again on its next write
+                    pass
+
+
+_idle_flusher = _IdleFlusher()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_idle_flusher.reset_after_fork)
+
+
+def schedule_idle_flush(target: Any, delay: float) -> None:
+    """Call target._idle_flush() under target.lock on a shared background thread in delay seconds.
+    
+    _idle_flush() returns the seconds until it should run again, or None.
+    
+    Args:
+        target: Object with a lock attribute and an _idle_flush() method
+        delay: Seconds to wait
+    """
+    _idle_flusher.schedule(target, delay)
+
+
+class _FlushRequest:
+    """Queue marker asking the writer thread to flush and signal completion."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class AsyncLogWriter:
+    """Writes records to a BufferedLogWriter from a dedicated background thread.
+    
+    Callers only enqueue records into a bounded queue; the writer thread formats
+    them with `format_record` and writes them to the file in batches. close()
+    drains everything that was queued before it and is also run at interpreter exit.
+    
+    The queue is bounded by a record count and a byte budget. What happens when a
+    record does not fit is decided by the overload policy:
+        - "block": submit() waits until the writer thread has made room
+        - "drop-oldest": the oldest queued records are discarded
+        - "drop-newest": the new record is discarded
+        - "sample": only every sample_rate-th new record is kept, making room by
+                    discarding the oldest queued records
+    Dropped records and bytes are counted, and if summary_record is given a
+    summary record is written at most once per summary_interval while drops occur.
+    """
+    
+    def __init__(self, writer: BufferedLogWriter, format_record: Callable[[Any], Iterable[bytes]],
+                 max_queue_size: int = DEFAULT_QUEUE_SIZE, batch_size: int = DEFAULT_BATCH_SIZE,
+                 idle_callback: Optional[Callable[[], Iterable[Any]]] = None, idle_interval: float = 1.0,
+                 overload: str = "block", max_queue_bytes: Optional[int] = DEFAULT_QUEUE_BYTES,
+                 sample_rate: int = DEFAULT_SAMPLE_RATE,
+                 summary_record: Optional[Callable[[int, int, float], Any]] = None,
+                 summary_interval: float = DEFAULT_SUMMARY_INTERVAL):
+        """Initialize AsyncLogWriter and start its writer thread.
+        
+        Args:
+            writer: Writer that is owned by the background thread from now on
+            format_record: Function converting a queued record into the byte chunks to write
+            max_queue_size: Maximum number of queued records (default: 10000)
+            batch_size: Maximum number of records written per batch (default: 256)
+            idle_callback: Optional function called on the writer thread after idle_interval
+                           seconds without records; the records it returns are written
+            idle_interval: Seconds of inactivity before idle_callback is called (default: 1.0)
+            overload: "block", "drop-oldest", "drop-newest" or "sample" (default: "block")
+            max_queue_bytes: Maximum total size of queued records, or None for no byte budget
+                             (default: 16 MiB)
+            sample_rate: Keep 1 in sample_rate records while overloaded with "sample" (default: 10)
+            summary_record: Optional function building a record from the number of dropped
+                            records, dropped bytes and seconds covered
+            summary_interval: Minimum seconds between drop summaries (default: 60.0)
+        """
+        if overload not in OVERLOAD_POLICIES:
+            raise ValueError(f"overload must be one of {OVERLOAD_POLICIES}, got {overload!r}")
+        
+        self.writer = writer
+        self.format_record = format_record
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.idle_callback = idle_callback
+        self.idle_interval = idle_interval
+        self.overload = overload
+        self.max_queue_bytes = max_queue_bytes
+        self.sample_rate = max(1, sample_rate)
+        self.summary_record = summary_record
+        self.summary_interval = summary_interval
+        
+        # Queue of (record, size); markers have size -1 and bypass the budget
+        self._items = deque()
+        self._queued_bytes = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._overloaded_count = 0
+        
+        self.dropped_records = 0
+        self.dropped_bytes = 0
+        self.written_records = 0
+        self.write_errors = 0
+        self._summary_dropped = (0, 0)
+        self._last_summary = time.monotonic()
+        
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="simple_global_logging-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def _is_full(self, size: int) -> bool:
+        """Check if a record of the given size does not fit. Must be called with the lock held."""
+        if len(self._items) >= self.max_queue_size:
+            return True
+        return self.max_queue_bytes is not None and self._items and self._queued_bytes + size > self.max_queue_bytes
+    
+    def _drop_oldest(self, size: int) -> None:
+        """Discard queued records until a record of the given size fits. Must be called with the lock held."""
+        items = self._items
+        index = 0
+        while self._is_full(size) and index < len(items):
+            if items[index][1] < 0:
+                # Never discard flush or stop markers
+                index += 1
+                continue
+            _, dropped_size = items[index]
+            del items[index]
+            self._queued_bytes -= dropped_size
+            self.dropped_records += 1
+            self.dropped_bytes += dropped_size
+    
+    def submit(self, record: Any, size: int = 0) -> None:
+        """Queue a record for writing, applying the overload policy if the queue is full.
+        
+        Args:
+            record: Record passed to format_record on the writer thread
+            size: Approximate size of the record in bytes, counted against max_queue_bytes
+        """
+        with self._cond:
+            if self._closed:
+                return
+            if self._is_full(size):
+                overload = self.overload
+                if overload == "block":
+                    while self._is_full(size) and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        return
+                elif overload == "drop-newest":
+                    self.dropped_records += 1
+                    self.dropped_bytes += size
+                    return
+                elif overload == "drop-oldest":
+                    self._drop_oldest(size)
+                else:
+                    self._overloaded_count += 1
+                    if self._overloaded_count % self.sample_rate:
+                        self.dropped_records += 1
+                        self.dropped_bytes += size
+                        return
+                    self._drop_oldest(size)
+            else:
+                self._overloaded_count = 0
+            
+            self._items.append((record, size))
+            self._queued_bytes += size
+            self._cond.notify_all()
+    
+    def _put_marker(self, marker: Any) -> None:
+        """Queue a flush or stop marker, ignoring the budget."""
+        with self._cond:
+            self._items.append((marker, -1))
+            self._cond.notify_all()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far has been written and flushed.
+        
+        Args:
+            timeout: Maximum seconds to wait (default: wait indefinitely)
+        
+        Returns:
+            True if the flush completed within the timeout
+        """
+        if self._closed or not self._thread.is_alive():
+            return True
+        request = _FlushRequest()
+        self._put_marker(request)
+        return request.done.wait(timeout)
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting records, drain the queue and close the underlying writer.
+        
+        Args:
+            timeout: Maximum seconds to wait for the drain (default: wait indefinitely)
+        """
+        with self._close_lock:
+            if self._closed:
+                return
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+        atexit.unregister(self.close)
+        if self._thread.is_alive():
+            self._put_marker(_STOP)
+            self._thread.join(timeout)
+        else:
+            self.writer.close()
+    
+    def reset_after_fork(self) -> None:
+        """Start over in a child created with os.fork().
+        
+        The writer thread does not exist in the child and the queue holds the
+        parent's records, which the parent writes. The queue and counters are
+        reset, the locks replaced and, unless closed, a new writer thread started.
+        Reset the underlying writer first.
+        """
+        self._items = deque()
+        self._queued_bytes = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._close_lock = threading.Lock()
+        self._overloaded_count = 0
+        self.dropped_records = 0
+        self.dropped_bytes = 0
+        self.written_records = 0
+        self.write_errors = 0
+        self._summary_dropped = (0, 0)
+        self._last_summary = time.monotonic()
+        if not self._closed:
+            self._thread = threading.Thread(target=self._run, name="simple_global_logging-writer", daemon=True)
+            self._thread.start()
+    
+    @property
+    def closed(self) -> bool:
+        """Check if the writer has been closed."""
+        return self._closed
+    
+    def stats(self) -> dict:
+        """Get queue and drop counters.
+        
+        Returns:
+            Dictionary with queued_records, queued_bytes, written_records, dropped_records,
+            dropped_bytes and write_errors
+        """
+        with self._cond:
+            return {
+                "queued_records": len(self._items),
+                "queued_bytes": self._queued_bytes,
+                "written_records": self.written_records,
+                "dropped_records": self.dropped_records,
+                "dropped_bytes": self.dropped_bytes,
+                "write_errors": self.write_errors,
+            }
+    
+    def _take_batch(self, timeout: Optional[float]) -> list:
+        """Wait for queued items and take up to batch_size of them."""
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout)
+            items = self._items
+            batch = []
+            while items and len(batch) < self.batch_size:
+                item, size = items.popleft()
+                if size > 0:
+                    self._queued_bytes -= size
+                batch.append(item)
+            if batch:
+                # Wake producers blocked on a full queue
+                self._cond.notify_all()
+            return batch
+    
+    def _run(self) -> None:
+        """Writer thread: drain the queue in batches until stopped."""
+        timeouts = [interval for interval, enabled in (
+            (self.idle_interval, self.idle_callback is not None),
+            (self.summary_interval, self.summary_record is not None)
+        ) if enabled]
+        timeout = min(timeouts) if timeouts else None
+        stop = False
+        while not stop:
+            # Flush what the writer's "interval" policy left unflushed once it is due
+            wait = timeout
+            try:
+                flush_delay = self.writer.flush_if_due()
+            except Exception:
+                flush_delay = None
+                self.write_errors += 1
+            if flush_delay is not None and (wait is None or flush_delay < wait):
+                wait = flush_delay
+            batch = self._take_batch(wait)
+            if self.summary_record is not None:
+                self._write_summary()
+            if not batch:
+                if self.idle_callback is not None:
+                    self._write_records(self.idle_callback())
+                continue
+            
+            records = []
+            flush_requests = []
+            for item in batch:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, _FlushRequest):
+                    flush_requests.append(item)
+                else:
+                    records.append(item)
+            
+            self._write_records(records)
+            if flush_requests:
+                try:
+                    self.writer.flush()
+                except Exception:
+                    self.write_errors += 1
+            for request in flush_requests:
+                request.done.set()
+        
+        if self.summary_record is not None:
+            self._write_summary(force=True)
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+    
+    def _write_records(self, records: Iterable[Any]) -> None:
+        """Format and write records on the writer thread."""
+        chunks = []
+        count = 0
+        try:
+            for record in records:
+                chunks.extend(self.format_record(record))
+                count += 1
+            if chunks:
+                self.writer.writelines(chunks)
+            self.written_records += count
+        except Exception:
+            # If we can't write to log file, don't crash the writer thread
+            self.write_errors += 1
+    
+    def _write_summary(self, force: bool = False) -> None:
+        """Write a summary of records dropped since the last summary, if due."""
+        now = time.monotonic()
+        if not force and now - self._last_summary < self.summary_interval:
+            return
+        dropped_records, dropped_bytes = self.dropped_records, self.dropped_bytes
+        last_records, last_bytes = self._summary_dropped
+        if dropped_records > last_records:
+            summary = self.summary_record(dropped_records - last_records, dropped_bytes - last_bytes, now - self._last_summary)
+            self._write_records([summary])
+        self._summary_dropped = (dropped_records, dropped_bytes)
+        self._last_summary = now
@@ -0,0 +1,185 @@
+"""Tests for the binary log format and its decoder."""
+
+import io
+import logging
+import sys
+from datetime import timezone, timedelta
+
+import pytest
+
+from simple_global_logging.__main__ import main
+from simple_global_logging.binary import BinaryLogEncoder, BinaryLogHandler, decode_to_text, iter_records
+from simple_global_logging.capture import CaptureSink
+from simple_global_logging.formatters import TimezoneFormatter
+
+JST = timezone(timedelta(hours=9))
+VERBOSE_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+
+
+def make_record(msg, args=(), level=logging.INFO, name="app.worker", created=1700000000.25, exc_info=None, **kwargs):
+    """Create a record with a fixed creation time."""
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, exc_info, **kwargs)
+    record.created = created
+    return record
+
+
+def decode(path, tz=None):
+    """Decode a binary log file to a list of text lines."""
+    output = io.StringIO()
+    decode_to_text(path, output, tz)
+    return output.getvalue().splitlines()
+
+
+class TestBinaryLog:
+    """Test suite for BinaryLogHandler and the decoder."""
+    
+    def setup_method(self):
+        """Create a handler writing to a temporary file."""
+        import tempfile
+        from pathlib import Path
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "binary.log"
+    
+    def teardown_method(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+    
+    def write(self, records, tz=JST):
+        """Write records with a fresh handler."""
+        handler = BinaryLogHandler(self.path, tz=tz)
+        for record in records:
+            handler.handle(record)
+        handler.close()
+    
+    def test_round_trip_matches_text_format(self):
+        """Test that decoding renders exactly what the text file handler writes."""
+        class Opaque:
+            def __str__(self):
+                return "opaque"
+        
+        records = [
+            make_record("plain message"),
+            make_record("request %d took %.3fs user=%s ok=%s none=%s", (7, 0.25, "bob", True, None)),
+            make_record("request %d took %.3fs user=%s ok=%s none=%s", (-8, 1e-9, "ünï", False, None)),
+            make_record("object %s", (Opaque(),), level=logging.WARNING),
+            make_record("list %r bytes %r", ([1, 2], b"\x00")),
+            make_record("%(key)s mapping", ({"key": "value"},), name="other"),
+            make_record("literal %d percent", (), level=logging.DEBUG),
+            make_record("stack", stack_info="Stack (most recent call last):\n  frame"),
+        ]
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            records.append(make_record("failed %s", ("job",), level=logging.ERROR, exc_info=sys.exc_info()))
+        
+        formatter = TimezoneFormatter(VERBOSE_FORMAT, datefmt='%Y-%m-%d %H:%M:%S', tz=JST)
+        expected = "\n".join(formatter.format(record) for record in records).splitlines()
+        self.write(records)
+        
+        assert decode(self.path) == expected
+    
+    def test_templates_are_interned(self):
+        """Test that repeated templates are written once and the file is much smaller than text."""
+        records = [make_record("request %d handled for %s", (i, "alice"), created=1700000000 + i / 1000)
+                   for i in range(1000)]
+        self.write(records)
+        
+        text_size = sum(len(f"2023-11-15 07:13:20 - INFO - app.worker - request {i} handled for alice\n")
+                        for i in range(1000))
+        assert self.path.stat().st_size * 3 < text_size
+        assert decode(self.path)[-1] == "2023-11-15 07:13:20 - INFO - app.worker - request 999 handled for alice"
+    
+    def test_template_table_overflow(self):
+        """Test that templates are written inline once the table is full."""
+        encoder = BinaryLogEncoder(max_templates=1)
+        data = encoder.header() + b''.join(
+            encoder.encode_record(make_record(f"message {i}")) for i in range(3)
+        )
+        
+        assert [record.message for record in iter_records(data)] == ["message 0", "message 1", "message 2"]
+    
+    def test_reopened_file_resets_tables(self):
+        """Test appending with a new handler, e.g. a second run with the same filename."""
+        self.write([make_record("first run %d", (1,))])
+        self.write([make_record("second run %d", (2,))], tz=timezone.utc)
+        
+        assert decode(self.path) == [
+            "2023-11-15 07:13:20 - INFO - app.worker - first run 1",
+            "2023-11-14 22:13:20 - INFO - app.worker - second run 2",
+        ]
+        assert decode(self.path, tz=timezone.utc)[0].startswith("2023-11-14 22:13:20")
+    
+    def test_captured_output(self):
+        """Test captured records written by the capture sink into the same file."""
+        handler = BinaryLogHandler(self.path, tz=JST)
+        handler.handle(make_record("logged"))
+        sink = CaptureSink(self.path, tz=JST, file_format="binary")
+        sink.write("STDOUT", "printed line\n")
+        sink.write_bytes("STDERR", b"raw \xff bytes\n")
+        sink.close()
+        handler.close()
+        
+        lines = decode(self.path)
+        assert lines[0].endswith(" - INFO - app.worker - logged")
+        assert lines[1].endswith("] STDOUT: printed line")
+        assert lines[2].endswith("] STDERR: raw � bytes")
+    
+    def test_truncated_record_is_ignored(self):
+        """Test that a record cut short by a crash does not break decoding."""
+        self.write([make_record("complete"), make_record("cut short")])
+        self.path.write_bytes(self.path.read_bytes()[:-3])
+        
+        assert len(decode(self.path)) == 1
+    
+    def test_not_a_binary_log(self):
+        """Test that text files are rejected."""
+        self.path.write_text("2023-11-15 07:13:20 - INFO - app - text\n", encoding='utf-8')
+        
+        with pytest.raises(ValueError):
+            decode(self.path)
+    
+    def test_argument_values(self):
+        """Test that stored argument values come back unchanged and others are rendered when written."""
+        values = (0, -1, 2 ** 63 - 1, -2 ** 63, 2 ** 64, 1.5, float("inf"), "", "ü" * 200, b"\x00\xff", None, False, True)
+        encoder = BinaryLogEncoder()
+        data = encoder.header() + encoder.encode_record(make_record(" ".join(["%r"] * len(values)), values))
+        
+        assert [record.message for record in iter_records(data)] == [" ".join(repr(value) for value in values)]
+    
+    def test_corrupt_record(self):
+        """Test that a record that does not parse is reported and skipped."""
+        encoder = BinaryLogEncoder()
+        start = encoder.header() + encoder.encode_record(make_record("count %d", (4,)))
+        corrupt = encoder.encode_record(make_record("count %d", (5,)))
+        # Replace the argument's tag with an unknown one
+        corrupt = corrupt[:-2] + b"\x09" + corrupt[-1:]
+        data = start + corrupt + encoder.encode_record(make_record("after"))
+        
+        with pytest.raises(ValueError, match="Corrupt record at byte"):
+            list(iter_records(data))
+        errors = []
+        records = list(iter_records(data, on_error=lambda offset, error: errors.append((offset, str(error)))))
+        assert [record.message for record in records] == ["count 4", "after"]
+        assert errors == [(len(start), "Unknown argument tag 9")]
+        
+        self.path.write_bytes(data)
+        output = self.path.with_suffix(".txt")
+        assert main(["decode", str(self.path), "-o", str(output)]) == 1
+        assert output.read_text(encoding='utf-8').endswith(" - INFO - app.worker - after\n")
+    
+    def test_other_format_version(self):
+        """Test that files of another format version are rejected."""
+        data = bytearray(BinaryLogEncoder().header())
+        data[6] += 1
+        
+        with pytest.raises(ValueError, match="Unsupported binary log format version"):
+            list(iter_records(bytes(data)))
+    
+    def test_decode_command(self):
+        """Test the decode command line."""
+        self.write([make_record("from the command line")])
+        output = self.path.with_suffix(".txt")
+        
+        assert main(["decode", str(self.path), "--tz", "+09:00", "-o", str(output)]) == 0
+        assert output.read_text(encoding='utf-8') == "2023-11-15 07:13:20 - INFO - app.worker - from the command line\n"
+        assert main(["decode", str(output), "-o", str(output.with_suffix(".out"))]) == 1
@@ -0,0 +1,135 @@
+"""Tests for multiprocess log collection."""
+
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+import simple_global_logging
+from simple_global_logging import core
+from simple_global_logging.collector import COLLECTOR_ENV, CollectorHandler, LogCollector
+
+
+RECORDS_PER_WORKER = 200
+
+
+def log_from_worker(index, count):
+    """Worker process: set up logging like an application module would, then log."""
+    simple_global_logging.setup_logging(base_dir="ignored-in-workers", collector=True)
+    logger = logging.getLogger(f"worker{index}")
+    for i in range(count):
+        logger.info("record %d from worker %d", i, index)
+    try:
+        raise ValueError("worker failure")
+    except ValueError:
+        logger.exception("failed in worker %d", index)
+    assert simple_global_logging.get_current_log_file().name.endswith(".log")
+    simple_global_logging.flush_logging()
+
+
+def wait_for(condition, timeout=10.0):
+    """Poll until condition() is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for the collector")
+        time.sleep(0.01)
+
+
+class TestCollector:
+    """Test suite for collector mode."""
+    
+    def setup_method(self):
+        """Create a temporary log directory."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+    
+    def teardown_method(self):
+        """Stop the collector and restore logging."""
+        if core._collector is not None:
+            core._collector.stop()
+            core._collector = None
+        logging.getLogger().handlers.clear()
+        shutil.rmtree(self.temp_dir)
+    
+    @pytest.mark.parametrize("method", ["spawn", "fork"])
+    def test_workers_write_one_file(self, method):
+        """Test that records of worker processes end up complete and ordered in one file."""
+        if method not in multiprocessing.get_all_start_methods():
+            pytest.skip(f"{method} is not available")
+        simple_global_logging.setup_logging(base_dir=str(self.temp_dir), collector=True)
+        log_file = simple_global_logging.get_current_log_file()
+        assert COLLECTOR_ENV in os.environ
+        
+        context = multiprocessing.get_context(method)
+        workers = [context.Process(target=log_from_worker, args=(index, RECORDS_PER_WORKER)) for index in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+            assert worker.exitcode == 0
+        
+        expected = 4 * (RECORDS_PER_WORKER + 1)
+        wait_for(lambda: core._collector.received_records >= expected)
+        simple_global_logging.flush_logging()
+        
+        assert list(self.temp_dir.glob("*.log")) == [log_file]
+        content = log_file.read_text()
+        for index in range(4):
+            numbers = [int(n) for n in re.findall(rf" - INFO - worker{index} - record (\d+) from worker {index}\n", content)]
+            assert numbers == list(range(RECORDS_PER_WORKER))
+            assert f" - ERROR - worker{index} - failed in worker {index}\nTraceback" in content
+        assert content.count("ValueError: worker failure\n") == 4
+    
+    def test_forwarding_handler(self):
+        """Test the handler and collector within one process."""
+        collector_logger = logging.Logger("collected")
+        received = []
+        
+        class ListHandler(logging.Handler):
+            def emit(self, record):
+                received.append(record)
+        
+        collector_logger.addHandler(ListHandler())
+        collector = LogCollector(logger=collector_logger)
+        try:
+            handler = CollectorHandler(collector.address, collector.token, batch_size=2)
+            logger = logging.Logger("app")
+            logger.addHandler(handler)
+            logger.info("plain %s %d", "args", 1)
+            logger.info("object %s", object(), extra={"request": object(), "user": "alice"})
+            logger.warning("no args")
+            assert handler.flush(5)
+            handler.close()
+            wait_for(lambda: len(received) == 3)
+        finally:
+            collector.stop()
+        
+        assert [record.getMessage() for record in received][0] == "plain args 1"
+        assert received[0].msg == "plain %s %d" and received[0].args == ("args", 1)
+        assert received[1].getMessage().startswith("object <object object at ")
+        assert received[1].user == "alice" and received[1].request.startswith("<object object")
+        assert received[2].levelname == "WARNING"
+        assert handler.sent_records == 3
+    
+    def test_rejects_wrong_token(self):
+        """Test that connections without the token are dropped."""
+        received = []
+        collector_logger = logging.Logger("collected")
+        collector_logger.handle = received.append
+        collector = LogCollector(logger=collector_logger)
+        try:
+            handler = CollectorHandler(collector.address, "0" * 32)
+            handler.handle(logging.makeLogRecord({"msg": "injected"}))
+            handler.flush(5)
+            handler.close()
+            time.sleep(0.1)
+        finally:
+            collector.stop()
+        assert received == []
+        assert COLLECTOR_ENV not in os.environ
@@ -0,0 +1,238 @@
+"""Tests for background log file compression."""
+
+import gzip
+import lzma
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from simple_global_logging.compression import LogCompressor, compress_file, compressed_path
+from simple_global_logging.rotation import LogRotator
+from simple_global_logging.writers import BufferedLogWriter, LockedFileHandler, lock_file, open_locked
+
+
+CONTENT = b"".join(b"2024-05-01 09:30:00 - INFO - app - request %d handled\n" % i for i in range(1000))
+
+
+class TestLogCompressor:
+    """Test suite for compress_file and LogCompressor."""
+    
+    def setup_method(self):
+        """Create a temporary log directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.compressors = []
+    
+    def teardown_method(self):
+        """Stop compressors and remove the directory."""
+        for compressor in self.compressors:
+            compressor.stop()
+        self.temp_dir.cleanup()
+    
+    def log_file(self, name, age=0.0):
+        """Write a log file, optionally backdating its modification time."""
+        path = self.base_dir / name
+        path.write_bytes(CONTENT)
+        if age:
+            mtime = time.time() - age
+            os.utime(path, (mtime, mtime))
+        return path
+    
+    def compressor(self, compression="gzip"):
+        """Create a compressor."""
+        compressor = LogCompressor(compression)
+        self.compressors.append(compressor)
+        return compressor
+    
+    @pytest.mark.parametrize("compression, module", [("gzip", gzip), ("lzma", lzma)])
+    def test_compress_file(self, compression, module):
+        """Test that the archive replaces the original."""
+        path = self.log_file("20240501-0000001.log")
+        
+        size = compress_file(path, compression)
+        
+        archive = compressed_path(path, compression)
+        assert not path.exists()
+        assert archive.stat().st_size == size < len(CONTENT) / 5
+        assert module.decompress(archive.read_bytes()) == CONTENT
+        assert [p.name for p in self.base_dir.iterdir()] == [archive.name]
+    
+    def test_failure_keeps_original(self):
+        """Test that a failed compression leaves the original and no partial archive."""
+        path = self.log_file("20240501-0000001.log")
+        
+        with mock.patch("simple_global_logging.compression.os.fsync", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                compress_file(path)
+        
+        assert [p.name for p in self.base_dir.iterdir()] == [path.name]
+        assert path.read_bytes() == CONTENT
+    
+    def test_scan_compresses_earlier_runs(self):
+        """Test that old serial log files are compressed and leftovers cleaned up."""
+        old = self.log_file("20240501-0000001.log", age=3600)
+        recent = self.log_file("20240501-0000002.log")
+        current = self.log_file("20240501-0000003.log", age=3600)
+        custom = self.log_file("app.log", age=3600)
+        leftover = self.log_file("20240501-0000004.log.gz.tmp", age=3600)
+        compressor = self.compressor()
+        
+        assert compressor.scan(self.base_dir, exclude=current) == 1
+        assert compressor.wait(5)
+        
+        assert sorted(p.name for p in self.base_dir.iterdir()) == [
+            "20240501-0000001.log.gz", recent.name, current.name, custom.name]
+        stats = compressor.stats()
+        assert stats["compressed_files"] == 1
+        assert stats["queued_files"] == 0
+        assert stats["failed_files"] == 0
+        assert stats["bytes_in"] == len(CONTENT)
+        assert stats["bytes_out"] == compressed_path(old).stat().st_size
+        assert not leftover.exists()
+    
+    def test_scan_in_background(self):
+        """Test that scan_in_background lists the directory on the compression thread."""
+        old = self.log_file("20240501-0000001.log", age=3600)
+        compressor = self.compressor()
+        threads = []
+        scan = compressor.scan
+        
+        def recording_scan(*args):
+            threads.append(threading.current_thread())
+            return scan(*args)
+        
+        compressor.scan = recording_scan
+        compressor.scan_in_background(self.base_dir)
+        assert compressor.wait(5)
+        
+        assert threads == [compressor._thread]
+        assert not old.exists()
+        assert compressed_path(old).exists()
+    
+    @pytest.mark.skipif(os.name == "nt", reason="flock is not available")
+    def test_skips_files_open_for_writing(self):
+        """Test that old log files a writer still holds open are skipped until they are closed."""
+        stream_path = self.log_file("20240501-0000001.log", age=3600)
+        handler_path = self.log_file("20240501-0000002.log", age=3600)
+        writer = BufferedLogWriter(stream_path)
+        writer.open()
+        handler = LockedFileHandler(handler_path)
+        compressor = self.compressor()
+        
+        assert compressor.scan(self.base_dir) == 2
+        assert compressor.wait(5)
+        
+        assert stream_path.read_bytes() == handler_path.read_bytes() == CONTENT
+        assert not compressed_path(stream_path).exists()
+        stats = compressor.stats()
+        assert stats["skipped_files"] == 2
+        assert stats["compressed_files"] == stats["failed_files"] == 0
+        
+        writer.close()
+        handler.close()
+        compressor.scan(self.base_dir, min_age=0)
+        assert compressor.wait(5)
+        assert sorted(p.name for p in self.base_dir.iterdir()) == [
+            "20240501-0000001.log.gz", "20240501-0000002.log.gz"]
+    
+    @pytest.mark.parametrize("writer_type", ["stream", "handler"])
+    def test_writer_waits_for_compression(self, writer_type):
+        """Test that a writer opening a file being compressed waits and then writes a new file."""
+        import shutil
+        path = self.log_file("20240501-0000001.log")
+        copying, release = threading.Event(), threading.Event()
+        copy = shutil.copyfileobj
+        
+        def slow_copy(*args):
+            copying.set()
+            release.wait(5)
+            copy(*args)
+        
+        with mock.patch("simple_global_logging.compression.shutil.copyfileobj", slow_copy):
+            compression = threading.Thread(target=compress_file, args=(path,))
+            compression.start()
+            assert copying.wait(5)
+            
+            if writer_type == "stream":
+                writer = BufferedLogWriter(path)
+                opening = threading.Thread(target=writer.open)
+            else:
+                writer = LockedFileHandler(path, delay=True)
+                opening = threading.Thread(target=lambda: setattr(writer, "stream", writer._open()))
+            opening.start()
+            opening.join(0.2)
+            assert opening.is_alive()
+            release.set()
+            compression.join(5)
+            opening.join(5)
+        
+        if writer_type == "stream":
+            writer.write(b"after\n")
+        else:
+            writer.stream.write("after\n")
+        writer.close()
+        assert path.read_bytes() == b"after\n"
+        with gzip.open(compressed_path(path)) as archive:
+            assert archive.read() == CONTENT
+    
+    def test_lock_timeout(self):
+        """Test that opening a file that stays locked fails after the timeout."""
+        path = self.log_file("20240501-0000001.log")
+        with open(path, 'rb') as holder:
+            assert lock_file(holder.fileno(), exclusive=True)
+            with pytest.raises(BlockingIOError):
+                open_locked(path, lambda: open(path, 'ab'), timeout=0.05)
+    
+    def test_reports_compressed_files(self):
+        """Test that on_compressed gets each removed log file and its archive."""
+        path = self.log_file("20240501-0000001.log")
+        compressed = []
+        compressor = LogCompressor(on_compressed=lambda *paths: compressed.append(paths))
+        self.compressors.append(compressor)
+        
+        compressor.submit(path)
+        compressor.submit(self.base_dir / "20240501-0000009.log")
+        assert compressor.wait(5)
+        
+        assert compressed == [(path, compressed_path(path))]
+    
+    def test_counts_failures(self):
+        """Test that missing files are counted as failures."""
+        compressor = self.compressor()
+        compressor.submit(self.base_dir / "20240501-0000009.log")
+        assert compressor.wait(5)
+        assert compressor.stats()["failed_files"] == 1
+    
+    def test_compresses_rotated_files(self):
+        """Test that files finished by rotation are compressed."""
+        compressor = self.compressor("lzma")
+        first = self.base_dir / "20240501-0000001.log"
+        rotator = LogRotator(first, str(self.base_dir), on_finished=compressor.submit)
+        writer = BufferedLogWriter(first, rotator=rotator)
+        writer.write(CONTENT)
+        
+        rotator.request_rollover()
+        deadline = time.monotonic() + 5
+        while not writer.rotation_pending:
+            assert time.monotonic() < deadline
+            time.sleep(0.005)
+        writer.write(b"next\n")
+        while compressor.stats()["compressed_files"] == 0:
+            assert time.monotonic() < deadline
+            time.sleep(0.005)
+        writer.close()
+        rotator.stop()
+        
+        assert not first.exists()
+        assert lzma.decompress(compressed_path(first, "lzma").read_bytes()) == CONTENT
+        assert rotator.path.read_bytes() == b"next\n"
+    
+    def test_invalid_compression(self):
+        """Test that unknown formats are rejected."""
+        with pytest.raises(ValueError, match="compression must be one of"):
+            LogCompressor("zip")
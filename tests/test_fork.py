@@ -0,0 +1,172 @@
+"""Tests for logging state in children created with os.fork()."""
+
+import logging
+import os
+import signal
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+import simple_global_logging
+from simple_global_logging import core
+
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="os.fork() is not available")
+
+
+def run_in_child(function):
+    """Fork, run function in the child and return its exit status."""
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            # A deadlocked child is killed instead of hanging the test run
+            signal.alarm(10)
+            function()
+            status = 0
+        except BaseException:
+            pass
+        finally:
+            os._exit(status)
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status)
+
+
+def child_log_file(path, pid):
+    """Per-PID log file of a child."""
+    return path.with_name(f"{path.stem}.{pid}{path.suffix}")
+
+
+class TestFork:
+    """Test suite for fork safety."""
+    
+    def setup_method(self):
+        """Create a temporary log directory and reset the capture set up by conftest."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = self.temp_dir.name
+        core._stdout_captured = False
+        if core._original_stdout:
+            sys.stdout = core._original_stdout
+            sys.stderr = core._original_stderr
+    
+    def teardown_method(self):
+        """Restore logging and remove the directory."""
+        simple_global_logging.restore_stdout()
+        simple_global_logging.stop_logging()
+        if core._collector is not None:
+            core._collector.stop()
+            core._collector = None
+        if core._rotator is not None:
+            core._rotator.stop()
+            core._rotator = None
+        if core._file_handler is not None:
+            core._file_handler.close()
+            core._file_handler = None
+        logging.getLogger().handlers.clear()
+        self.temp_dir.cleanup()
+    
+    def test_capture_lock_held_at_fork(self):
+        """Test that a child can write while the parent holds the capture lock, without duplicating buffered output."""
+        simple_global_logging.setup_logging_with_stdout_capture(
+            base_dir=self.base_dir, capture={"flush_policy": "interval", "flush_interval": 60.0})
+        log_file = simple_global_logging.get_current_log_file()
+        print("parent before fork")
+        
+        def child():
+            print("child output")
+            sys.stdout.flush()
+            logging.getLogger("child").info("child record")
+        
+        with core._capture_sink.lock:
+            assert run_in_child(child) == 0
+        simple_global_logging.restore_stdout()
+        
+        content = log_file.read_text()
+        assert content.count("STDOUT: parent before fork\n") == 1
+        assert content.count("STDOUT: child output\n") == 1
+        assert content.count(" - INFO - child - child record\n") == 1
+    
+    def test_async_threads_restarted(self):
+        """Test that the async listener and capture writer work in the child."""
+        simple_global_logging.setup_logging(base_dir=self.base_dir, async_mode=True)
+        log_file = simple_global_logging.get_current_log_file()
+        simple_global_logging.setup_logging_with_stdout_capture(base_dir=self.base_dir, filename=log_file.name,
+                                                                capture={"async_capture": True})
+        simple_global_logging.setup_logging(base_dir=self.base_dir, filename=log_file.name, async_mode=True)
+        
+        def child():
+            logger = logging.getLogger("child")
+            for i in range(100):
+                logger.info("record %d", i)
+            print("child output")
+            assert simple_global_logging.flush_logging(5)
+            sys.stdout.flush()
+            assert core._capture_sink.async_writer.flush(5)
+        
+        assert run_in_child(child) == 0
+        content = log_file.read_text()
+        assert all(f" - INFO - child - record {i}\n" in content for i in range(100))
+        assert content.count("STDOUT: child output\n") == 1
+    
+    def test_per_pid_files(self):
+        """Test that children write to a file of their own when asked to."""
+        simple_global_logging.setup_logging(base_dir=self.base_dir, per_pid_files=True)
+        log_file = simple_global_logging.get_current_log_file()
+        
+        def child():
+            assert simple_global_logging.get_current_log_file() == child_log_file(log_file, os.getpid())
+            logging.getLogger("child").info("child record")
+        
+        before = set(Path(self.base_dir).glob("*.log"))
+        assert run_in_child(child) == 0
+        created = set(Path(self.base_dir).glob("*.log")) - before
+        
+        assert len(created) == 1
+        path = created.pop()
+        assert path.name.startswith(log_file.stem + ".") and path.suffix == ".log"
+        assert " - INFO - child - child record\n" in path.read_text()
+        assert "child record" not in log_file.read_text()
+    
+    def test_mmap_children_get_own_file(self):
+        """Test that a child never writes into the parent's mapping."""
+        simple_global_logging.setup_logging(base_dir=self.base_dir, file_writer="mmap")
+        log_file = simple_global_logging.get_current_log_file()
+        
+        def child():
+            logging.getLogger("child").info("child record")
+        
+        assert run_in_child(child) == 0
+        logging.getLogger("parent").info("parent record")
+        core._file_handler.close()
+        core._file_handler = None
+        
+        content = log_file.read_bytes()
+        assert b"parent record" in content and b"child record" not in content
+        assert b"\0" not in content
+        children = [p for p in Path(self.base_dir).glob("*.log") if p != log_file]
+        assert len(children) == 1
+        # The child left with os._exit(), so the preallocated tail was not trimmed
+        assert children[0].read_bytes().rstrip(b"\0").endswith(b" - INFO - child - child record\n")
+    
+    def test_collector_children_forward(self):
+        """Test that forked children forward their records to the parent's collector."""
+        simple_global_logging.setup_logging(base_dir=self.base_dir, collector=True)
+        log_file = simple_global_logging.get_current_log_file()
+        received = core._collector.received_records
+        
+        def child():
+            logging.getLogger("child").info("forwarded record")
+            assert simple_global_logging.flush_logging()
+        
+        assert run_in_child(child) == 0
+        deadline = time.monotonic() + 10
+        while core._collector.received_records < received + 1:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        simple_global_logging.flush_logging()
+        
+        assert log_file.read_text().count(" - INFO - child - forwarded record\n") == 1
+        assert list(Path(self.base_dir).glob("*.log")) == [log_file]
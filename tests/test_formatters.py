@@ -0,0 +1,135 @@
+"""Tests for the compiled log record formatter."""
+
+import json
+import logging
+import sys
+from datetime import timezone, timedelta
+
+import pytest
+
+from simple_global_logging.formatters import (
+    FastFormatter,
+    JsonLinesEncoder,
+    JsonLinesFormatter,
+    TimezoneFormatter,
+    compile_format
+)
+
+
+def make_record(msg="hello %s", args=("world",), exc_info=None):
+    """Create a record with a fixed creation time."""
+    record = logging.LogRecord("app.worker", logging.WARNING, __file__, 42, msg, args, exc_info)
+    record.created = 1700000000.5
+    record.msecs = 500.0
+    return record
+
+
+class TestFastFormatter:
+    """Test suite for FastFormatter."""
+    
+    @pytest.mark.parametrize("fmt", [
+        '%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+        '%(message)s',
+        '{braces} "quotes" \\backslash %(message)s\n',
+        '%(levelname)-8s %(message)s',
+        '%(lineno)d %(message)s',
+        '100%% %(message)s',
+    ])
+    @pytest.mark.parametrize("datefmt", ['%Y-%m-%d %H:%M:%S', None])
+    def test_matches_timezone_formatter(self, fmt, datefmt):
+        """Test that output is identical to the generic formatter, compiled or not."""
+        jst = timezone(timedelta(hours=9))
+        fast = FastFormatter(fmt, datefmt=datefmt, tz=jst)
+        generic = TimezoneFormatter(fmt, datefmt=datefmt, tz=jst)
+        
+        assert fast.format(make_record()) == generic.format(make_record())
+    
+    def test_compile_format(self):
+        """Test which formats are compiled."""
+        assert compile_format('%(asctime)s - %(levelname)s - %(name)s - %(message)s') is not None
+        assert compile_format('%(message)s') is not None
+        assert compile_format('%(levelname)-8s %(message)s') is None
+        assert compile_format('%(lineno)d') is None
+        assert compile_format('%% %(message)s') is None
+    
+    def test_formats_record_once(self):
+        """Test that handlers sharing the formatter reuse the line for the same record."""
+        formatter = FastFormatter('%(levelname)s %(message)s')
+        record = make_record()
+        
+        first = formatter.format(record)
+        assert formatter.format(record) is first
+        assert formatter.format(make_record(args=("again",))) == "WARNING hello again"
+    
+    def test_exception_info(self):
+        """Test that records with exception information include the traceback."""
+        formatter = FastFormatter('%(levelname)s %(message)s')
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record(exc_info=sys.exc_info())
+        
+        text = formatter.format(record)
+        assert text.startswith("WARNING hello world\nTraceback")
+        assert "ValueError: boom" in text
+
+
+class TestJsonLines:
+    """Test suite for the JSON Lines encoder and formatter."""
+    
+    def test_record_schema(self):
+        """Test key order, timestamp and escaping of a log record."""
+        formatter = JsonLinesFormatter(tz=timezone(timedelta(hours=9)))
+        line = formatter.format(make_record('say "%s"\n\tdone \u00e9', ("hi",)))
+        
+        assert "\n" not in line
+        data = json.loads(line)
+        assert list(data) == ["time", "level", "logger", "stream", "message"]
+        assert data == {
+            "time": "2023-11-15T07:13:20.500+09:00",
+            "level": "WARNING",
+            "logger": "app.worker",
+            "stream": "log",
+            "message": 'say "hi"\n\tdone \u00e9',
+        }
+    
+    def test_extra_and_context(self):
+        """Test that extra= fields and context fields are written after the message."""
+        formatter = JsonLinesFormatter(context={"service": "api", "build": 7})
+        record = make_record()
+        record.request_id = "abc"
+        record.user = {"id": 1}
+        record.opaque = object()
+        
+        data = json.loads(formatter.format(record))
+        assert list(data) == ["time", "level", "logger", "stream", "message", "extra", "context"]
+        assert list(data["extra"]) == ["opaque", "request_id", "user"]
+        assert data["extra"]["user"] == {"id": 1}
+        assert data["extra"]["opaque"].startswith("<object object")
+        assert data["context"] == {"service": "api", "build": 7}
+    
+    def test_exception(self):
+        """Test that the traceback is written as a field."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record(exc_info=sys.exc_info())
+        
+        data = json.loads(JsonLinesFormatter().format(record))
+        assert data["message"] == "hello world"
+        assert data["exception"].startswith("Traceback")
+        assert "ValueError: boom" in data["exception"]
+    
+    def test_captured_line(self):
+        """Test that captured lines use the same schema with the stream label."""
+        encoder = JsonLinesEncoder(context={"service": "api"})
+        
+        data = json.loads(encoder.encode_capture(1700000000.25, "STDERR", "warning: \x1b"))
+        assert data == {
+            "time": "2023-11-14T22:13:20.250+00:00",
+            "level": None,
+            "logger": None,
+            "stream": "stderr",
+            "message": "warning: \x1b",
+            "context": {"service": "api"},
+        }
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""Tests for the import cost of the package."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).parent.parent
+
+# Cumulative microseconds `import simple_global_logging` may take; it imports
+# nothing but the package itself, so this leaves ample room for slow machines
+IMPORT_BUDGET_US = 25000
+
+# Modules only the optional features need
+OPTIONAL_MODULES = {
+    "gzip", "lzma", "logging.handlers", "pickle", "socket",
+    "simple_global_logging.binary", "simple_global_logging.collector", "simple_global_logging.compression",
+    "simple_global_logging.fdcapture", "simple_global_logging.handlers", "simple_global_logging.ratelimit",
+    "simple_global_logging.retention", "simple_global_logging.rotation", "simple_global_logging.utils",
+}
+
+
+def import_times(statement):
+    """Run statement in a new interpreter with -X importtime.
+    
+    Returns:
+        Dictionary of imported module -> cumulative microseconds
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        _, _, fields = line.partition("import time:")
+        _, cumulative, name = (field.strip() for field in fields.split("|"))
+        if cumulative.isdigit():
+            times[name] = int(cumulative)
+    return times
+
+
+class TestImportCost:
+    """Test suite for lazy imports."""
+    
+    def test_package_import_is_lazy(self):
+        """Test that importing the package imports none of its modules and stays within budget."""
+        best = None
+        for _ in range(3):
+            times = import_times("import simple_global_logging")
+            assert [name for name in times if name.startswith("simple_global_logging")] == ["simple_global_logging"]
+            assert "logging" not in times
+            best = times["simple_global_logging"] if best is None else min(best, times["simple_global_logging"])
+        assert best < IMPORT_BUDGET_US
+    
+    def test_setup_logging_skips_optional_modules(self):
+        """Test that the modules behind optional features are imported only when used."""
+        times = import_times("from simple_global_logging import setup_logging, get_logger")
+        
+        assert "simple_global_logging.core" in times
+        assert not OPTIONAL_MODULES & set(times)
+    
+    def test_exports(self):
+        """Test that every export resolves on first access and unknown names still fail."""
+        statement = (
+            "import simple_global_logging as sgl\n"
+            "assert all(callable(getattr(sgl, name)) for name in sgl.__all__ if name != '__version__')\n"
+            "assert set(sgl.__all__) <= set(dir(sgl))\n"
+            "try:\n"
+            "    sgl.missing\n"
+            "except AttributeError:\n"
+            "    pass\n"
+            "else:\n"
+            "    raise AssertionError\n"
+            "from simple_global_logging.capture import ANSI_ESCAPE\n"
+            "assert ANSI_ESCAPE.sub('', '\\x1b[31mred\\x1b[0m') == 'red'\n"
+        )
+        subprocess.run([sys.executable, "-c", statement], cwd=ROOT, check=True)
@@ -0,0 +1,128 @@
+"""Tests for the child logger policy."""
+
+import logging
+
+import pytest
+
+from simple_global_logging.loggers import LoggerPolicy, PolicyLogger
+
+
+class TestLoggerPolicy:
+    """Test suite for LoggerPolicy."""
+    
+    def setup_method(self):
+        """Create a logger registry of the test's own."""
+        self.manager = logging.Manager(logging.RootLogger(logging.WARNING))
+    
+    def logger(self, name, handler=False):
+        """Create a logger, optionally with a handler and without propagation."""
+        logger = self.manager.getLogger(name)
+        if handler:
+            logger.addHandler(logging.NullHandler())
+            logger.propagate = False
+        return logger
+    
+    def test_eager(self):
+        """Test that existing loggers are normalised and overrides keep their handlers."""
+        child = self.logger("app.db", handler=True)
+        urllib3 = self.logger("urllib3", handler=True)
+        pool = self.logger("urllib3.connectionpool", handler=True)
+        
+        LoggerPolicy().apply(self.manager)
+        
+        assert child.handlers == [] and child.propagate
+        assert pool.handlers == [] and pool.propagate
+        assert len(urllib3.handlers) == 1 and not urllib3.propagate
+        assert urllib3.level == logging.INFO
+        # The placeholder of "app" stays a placeholder
+        assert isinstance(self.manager.loggerDict["app"], logging.PlaceHolder)
+    
+    def test_levels(self):
+        """Test that configured levels replace the default and apply below the configured name."""
+        LoggerPolicy(levels={"botocore": "warning", "app": logging.DEBUG}).apply(self.manager)
+        
+        assert self.logger("botocore.hooks").getEffectiveLevel() == logging.WARNING
+        assert self.logger("app").level == logging.DEBUG
+        assert "urllib3" not in self.manager.loggerDict
+    
+    def test_lazy(self):
+        """Test that lazy mode leaves existing loggers until first use and keeps the rules for later changes."""
+        existing = self.logger("app.db", handler=True)
+        unused = self.logger("app.unused", handler=True)
+        urllib3 = self.logger("urllib3", handler=True)
+        call_handlers = logging.Logger.callHandlers
+        policy = LoggerPolicy("lazy")
+        policy.apply(self.manager)
+        
+        # Nothing is walked at setup
+        assert type(existing) is logging.Logger and len(existing.handlers) == 1
+        received = []
+        self.manager.root.addHandler(logging.Handler())
+        self.manager.root.handlers[0].emit = received.append
+        existing.warning("First record")
+        assert [record.getMessage() for record in received] == ["First record"]
+        assert isinstance(existing, PolicyLogger)
+        assert existing.handlers == [] and existing.propagate
+        existing.propagate = False
+        assert existing.propagate
+        
+        created = self.manager.getLogger("app.cache").getChild("redis")
+        assert isinstance(created, PolicyLogger)
+        with pytest.warns(RuntimeWarning, match="not added to logger 'app.cache.redis'"):
+            created.addHandler(logging.NullHandler())
+        assert created.handlers == [] and created.propagate
+        
+        # Level overrides keep their handlers and may get more
+        urllib3.addHandler(logging.NullHandler())
+        urllib3.warning("Override")
+        assert len(urllib3.handlers) == 2 and not urllib3.propagate
+        
+        policy.remove()
+        assert logging.Logger.callHandlers is call_handlers
+        assert type(existing) is logging.Logger and self.manager.loggerClass is None
+        assert type(created) is logging.Logger and created.propagate
+        assert type(unused) is logging.Logger and len(unused.handlers) == 1
+        existing.addHandler(logging.NullHandler())
+        assert len(existing.handlers) == 1
+    
+    def test_lazy_add_handler_warns_once(self):
+        """Test that an existing logger is adopted by addHandler() and warned about once."""
+        existing = self.logger("app.db", handler=True)
+        policy = LoggerPolicy("lazy")
+        policy.apply(self.manager)
+        try:
+            with pytest.warns(RuntimeWarning) as warned:
+                existing.addHandler(logging.NullHandler())
+                existing.addHandler(logging.NullHandler())
+            assert len(warned) == 1
+            assert isinstance(existing, PolicyLogger) and existing.handlers == []
+        finally:
+            policy.remove()
+    
+    def test_lazy_custom_logger_class(self):
+        """Test that loggers of a custom class keep it under the lazy policy and after removal."""
+        class CustomLogger(logging.Logger):
+            pass
+        
+        self.manager.setLoggerClass(CustomLogger)
+        existing = self.logger("app.db", handler=True)
+        policy = LoggerPolicy("lazy")
+        policy.apply(self.manager)
+        created = self.manager.getLogger("app.cache")
+        
+        for logger in (existing, created):
+            with pytest.warns(RuntimeWarning):
+                logger.addHandler(logging.NullHandler())
+            assert isinstance(logger, CustomLogger) and isinstance(logger, PolicyLogger)
+            assert logger.handlers == []
+        
+        policy.remove()
+        assert type(existing) is CustomLogger and type(created) is CustomLogger
+        assert self.manager.loggerClass is CustomLogger
+    
+    def test_invalid(self):
+        """Test that unknown modes and levels are rejected."""
+        with pytest.raises(ValueError, match="logger_policy must be one of"):
+            LoggerPolicy("never")
+        with pytest.raises(ValueError, match="unknown level for 'app'"):
+            LoggerPolicy(levels={"app": "LOUD"})
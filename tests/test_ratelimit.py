@@ -0,0 +1,145 @@
+"""Tests for rate limiting of log records."""
+
+import logging
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from simple_global_logging import ratelimit
+from simple_global_logging.ratelimit import SUMMARY_LOGGER, RateLimit, RateLimitFilter
+
+
+class ListHandler(logging.Handler):
+    """Handler keeping the messages of the records it handles."""
+    
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+    
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TestRateLimitFilter:
+    """Test suite for RateLimit and RateLimitFilter."""
+    
+    def setup_method(self):
+        """Replace the filter's clock and catch summary records."""
+        self.now = 1000.0
+        self.clock = mock.patch.object(ratelimit, "time", SimpleNamespace(monotonic=lambda: self.now))
+        self.clock.start()
+        self.summaries = ListHandler()
+        self.summary_logger = logging.getLogger(SUMMARY_LOGGER)
+        self.summary_logger.addHandler(self.summaries)
+        self.summary_logger.propagate = False
+    
+    def teardown_method(self):
+        """Restore the clock and the summary logger."""
+        self.clock.stop()
+        self.summary_logger.removeHandler(self.summaries)
+        self.summary_logger.propagate = True
+    
+    def passed(self, rate_filter, count, name="app", msg="hot %d", level=logging.WARNING):
+        """Number of count records of a logger and template that pass the filter."""
+        return sum(rate_filter.filter(logging.LogRecord(name, level, __file__, 1, msg, (i,), None))
+                   for i in range(count))
+    
+    def test_token_bucket(self):
+        """Test that a burst passes, the rest is suppressed and tokens refill at the rate."""
+        rate_filter = RateLimitFilter([RateLimit(rate=2, burst=5)])
+        
+        assert self.passed(rate_filter, 100) == 5
+        self.now += 1.0
+        assert self.passed(rate_filter, 100) == 2
+        self.now += 60.0
+        assert self.passed(rate_filter, 100) == 5
+        assert rate_filter.stats() == {"passed": 12, "sampled": 0, "suppressed": 288, "keys": 1}
+    
+    def test_keys(self):
+        """Test that every logger and message template has a bucket of its own."""
+        rate_filter = RateLimitFilter([{"rate": 1, "burst": 1}])
+        
+        assert self.passed(rate_filter, 10, msg="first %d") == 1
+        assert self.passed(rate_filter, 10, msg="second %d") == 1
+        assert self.passed(rate_filter, 10, name="other") == 1
+        assert self.passed(rate_filter, 10, msg=ValueError("boom")) == 1
+        assert rate_filter.stats()["keys"] == 4
+    
+    def test_prefix_and_level(self):
+        """Test that the most specific limit applies and records above its level pass."""
+        rate_filter = RateLimitFilter([
+            RateLimit(prefix="app", rate=1, burst=3),
+            RateLimit(prefix="app.db", rate=1, burst=1, level="INFO"),
+            RateLimit(prefix="app.db", rate=1, burst=2, level="WARNING"),
+        ])
+        
+        assert self.passed(rate_filter, 10, name="app.web") == 3
+        assert self.passed(rate_filter, 10, name="app.db.pool", msg="info %d", level=logging.INFO) == 1
+        assert self.passed(rate_filter, 10, name="app.db.pool") == 2
+        assert self.passed(rate_filter, 10, name="app.db.pool", level=logging.ERROR) == 10
+        assert self.passed(rate_filter, 10, name="application") == 10
+    
+    def test_sample(self):
+        """Test that one in sample suppressed records is kept."""
+        rate_filter = RateLimitFilter([RateLimit(rate=1, burst=1, sample=10)])
+        
+        assert self.passed(rate_filter, 101) == 1 + 10
+        assert rate_filter.stats()["sampled"] == 10
+    
+    def test_bounded_keys_and_summary(self):
+        """Test LRU eviction and that the summary counts suppressed records, evicted keys included."""
+        rate_filter = RateLimitFilter([RateLimit(rate=1, burst=1)], max_keys=2, summary_interval=60)
+        self.passed(rate_filter, 4, msg="a %d")
+        self.passed(rate_filter, 3, msg="b %d")
+        self.passed(rate_filter, 2, msg="c %d")
+        
+        assert rate_filter.stats()["keys"] == 2
+        assert self.summaries.messages == []
+        
+        self.now += 60
+        assert self.passed(rate_filter, 1, msg="c %d") == 1
+        
+        assert self.summaries.messages == [
+            "Rate limit suppressed 6 records in the last 60s; most from app: 'b %d' (2), app: 'c %d' (1)"]
+    
+    def test_summary_while_suppressed(self):
+        """Test that the summary is logged even if no record passes after the interval."""
+        rate_filter = RateLimitFilter([RateLimit(rate=0.001, burst=1)], summary_interval=60)
+        self.passed(rate_filter, 5)
+        self.now += 60
+        
+        assert self.passed(rate_filter, 1) == 0
+        assert self.summaries.messages == ["Rate limit suppressed 5 records in the last 60s; most from app: 'hot %d' (5)"]
+    
+    def test_interleaved_records(self):
+        """Test that records whose handlers interleave with another thread's records are counted once."""
+        rate_filter = RateLimitFilter([RateLimit(rate=1, burst=2)])
+        records = [logging.LogRecord("app", logging.WARNING, __file__, 1, "hot %d", (i,), None) for i in range(3)]
+        
+        # The console handler of each record runs before the file handler of any
+        assert [rate_filter.filter(record) for record in records * 2] == [True, True, False] * 2
+        assert rate_filter.stats() == {"passed": 2, "sampled": 0, "suppressed": 1, "keys": 1}
+    
+    def test_shared_by_handlers(self):
+        """Test that a record reaching several handlers uses one token."""
+        rate_filter = RateLimitFilter([RateLimit(rate=1, burst=2)])
+        logger = logging.Logger("shared")
+        handlers = [ListHandler(), ListHandler()]
+        for handler in handlers:
+            handler.addFilter(rate_filter)
+            logger.addHandler(handler)
+        
+        for i in range(5):
+            logger.warning("hot %d", i)
+        
+        assert handlers[0].messages == handlers[1].messages == ["hot 0", "hot 1"]
+    
+    def test_invalid(self):
+        """Test that invalid limits are rejected."""
+        with pytest.raises(ValueError, match="rate must be positive"):
+            RateLimit(rate=0)
+        with pytest.raises(ValueError, match="level must be a logging level"):
+            RateLimitFilter([{"level": "LOUD"}])
+        with pytest.raises(ValueError, match="max_keys must be positive"):
+            RateLimitFilter(max_keys=0)
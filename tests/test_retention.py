@@ -0,0 +1,164 @@
+"""Tests for log file retention."""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from simple_global_logging.retention import LogPruner, prune
+
+
+DAY = 86400
+
+
+class TestRetention:
+    """Test suite for prune and LogPruner."""
+    
+    def setup_method(self):
+        """Create a temporary log directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.pruners = []
+    
+    def teardown_method(self):
+        """Stop pruners and remove the directory."""
+        for pruner in self.pruners:
+            pruner.stop()
+        self.temp_dir.cleanup()
+    
+    def log_file(self, name, size=100, age=3600.0):
+        """Write a log file and backdate its modification time."""
+        path = self.base_dir / name
+        path.write_bytes(b"x" * size)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+    
+    def names(self):
+        """Sorted names of the files left in the directory."""
+        return sorted(p.name for p in self.base_dir.iterdir())
+    
+    def pruner(self, **kwargs):
+        """Create a pruner."""
+        pruner = LogPruner(self.base_dir, **kwargs)
+        self.pruners.append(pruner)
+        return pruner
+    
+    def test_max_files(self):
+        """Test that the oldest serials are removed first, including archives and per-PID files."""
+        self.log_file("20240502-0000001.log")
+        self.log_file("20240501-0000002.log.gz")
+        self.log_file("20240501-0000001.4242.log")
+        self.log_file("20240501-0000001.log")
+        
+        removed = prune(self.base_dir, max_files=2)
+        
+        assert sorted(p.name for p in removed) == ["20240501-0000001.4242.log", "20240501-0000001.log"]
+        assert self.names() == ["20240501-0000002.log.gz", "20240502-0000001.log"]
+    
+    def test_max_age_days(self):
+        """Test that files older than the limit are removed regardless of their serial."""
+        self.log_file("20240501-0000001.log", age=1 * DAY)
+        self.log_file("20240501-0000002.log", age=10 * DAY)
+        self.log_file("20240501-0000003.log", age=3 * DAY)
+        
+        prune(self.base_dir, max_age_days=2)
+        
+        assert self.names() == ["20240501-0000001.log"]
+    
+    def test_max_total_bytes(self):
+        """Test that files are removed until the rest fits in the byte limit."""
+        for serial in range(1, 5):
+            self.log_file(f"20240501-{serial:07d}.log", size=1000)
+        
+        prune(self.base_dir, max_total_bytes=2500)
+        
+        assert self.names() == ["20240501-0000003.log", "20240501-0000004.log"]
+    
+    def test_protected_files_are_kept(self):
+        """Test that excluded, recently modified and foreign files are never removed."""
+        active = self.log_file("20240501-0000001.log")
+        self.log_file("20240501-0000002.log", age=0)
+        self.log_file("20240501-0000003.log")
+        self.log_file("app.log")
+        self.log_file(".simple_global_logging.serial")
+        self.log_file("20240501-0000004.log.gz.tmp")
+        
+        removed = prune(self.base_dir, max_files=1, exclude=[active])
+        
+        assert [p.name for p in removed] == ["20240501-0000003.log"]
+        assert self.names() == [".simple_global_logging.serial", "20240501-0000001.log", "20240501-0000002.log",
+                                "20240501-0000004.log.gz.tmp", "app.log"]
+    
+    def test_invalid_limits(self):
+        """Test that non-positive limits are rejected."""
+        with pytest.raises(ValueError, match="max_files must be positive"):
+            prune(self.base_dir, max_files=0)
+        with pytest.raises(ValueError, match="max_total_bytes must be positive"):
+            LogPruner(self.base_dir, max_total_bytes=-1)
+    
+    def test_pruner_in_batches(self):
+        """Test that the pruner checks at startup and on request, skipping files in use."""
+        for serial in range(1, 11):
+            self.log_file(f"20240501-{serial:07d}.log")
+        in_use = {self.base_dir / "20240501-0000001.log"}
+        pruner = self.pruner(max_files=3, exclude=lambda: in_use, batch_size=2)
+        
+        assert pruner.wait(5)
+        assert self.names() == ["20240501-0000001.log", "20240501-0000009.log", "20240501-0000010.log"]
+        
+        in_use = set()
+        pruner.update(self.log_file("20240501-0000011.log"))
+        pruner.request()
+        assert pruner.wait(5)
+        
+        assert self.names() == ["20240501-0000009.log", "20240501-0000010.log", "20240501-0000011.log"]
+        assert pruner.stats() == {"checks": 2, "scans": 1, "removed_files": 8, "removed_bytes": 800}
+    
+    def test_pruner_index(self):
+        """Test that checks between rescans use the index, updated for new, grown and removed files."""
+        for serial in range(1, 4):
+            self.log_file(f"20240501-{serial:07d}.log", size=1000)
+        current = self.base_dir / "20240501-0000004.log"
+        in_use = {current}
+        pruner = self.pruner(max_total_bytes=3000, exclude=lambda: in_use)
+        assert pruner.wait(5)
+        assert self.names() == ["20240501-0000001.log", "20240501-0000002.log", "20240501-0000003.log"]
+        
+        # Unknown to the index until the next rescan
+        self.log_file("20240501-0000000.log", size=1000)
+        # The file in use is looked at on every check, even before anything reports it
+        self.log_file(current.name, size=1000)
+        # Replaced by its archive, as reported by compression
+        (self.base_dir / "20240501-0000002.log").unlink()
+        pruner.update(self.base_dir / "20240501-0000002.log")
+        pruner.update(self.log_file("20240501-0000002.log.gz", size=100))
+        pruner.request()
+        assert pruner.wait(5)
+        
+        # 20240501-0000001.log made room; the unknown file was not counted
+        assert self.names() == ["20240501-0000000.log", "20240501-0000002.log.gz", "20240501-0000003.log",
+                                "20240501-0000004.log"]
+        assert pruner.stats()["scans"] == 1
+        
+        pruner.rescan_interval = 0
+        pruner.request()
+        assert pruner.wait(5)
+        
+        assert self.names() == ["20240501-0000002.log.gz", "20240501-0000003.log", "20240501-0000004.log"]
+        assert pruner.stats()["scans"] == 2
+    
+    def test_update_ignores_other_files(self):
+        """Test that update() only indexes log files of the pruner's directory."""
+        pruner = self.pruner(max_files=1, interval=3600)
+        assert pruner.wait(5)
+        
+        with tempfile.TemporaryDirectory() as other:
+            foreign = Path(other) / "20240501-0000001.log"
+            foreign.write_bytes(b"x")
+            pruner.update(foreign)
+            pruner.update(self.log_file("app.log"))
+        
+        assert pruner._names == []
@@ -0,0 +1,180 @@
+"""Tests for log file rotation."""
+
+import io
+import logging
+import tempfile
+import time
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+from simple_global_logging import rotation
+from simple_global_logging.binary import BinaryLogHandler, decode_to_text, header_record
+from simple_global_logging.handlers import RotatingLogFileHandler
+from simple_global_logging.rotation import LogRotator, next_local_midnight
+from simple_global_logging.utils import claim_log_file
+from simple_global_logging.writers import BufferedLogWriter
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll until condition() is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for the rotator")
+        time.sleep(0.005)
+
+
+def make_record(msg, *args):
+    """Create a log record."""
+    return logging.LogRecord("app", logging.INFO, __file__, 1, msg, args, None)
+
+
+class TestNextLocalMidnight:
+    """Test suite for next_local_midnight."""
+    
+    def test_fixed_offset(self):
+        """Test midnight in a fixed-offset zone."""
+        jst = timezone(timedelta(hours=9))
+        now = datetime(2024, 5, 1, 23, 59, 59, tzinfo=jst).timestamp()
+        assert next_local_midnight(now, jst) == datetime(2024, 5, 2, tzinfo=jst).timestamp()
+        assert next_local_midnight(now + 1, jst) == datetime(2024, 5, 3, tzinfo=jst).timestamp()
+    
+    def test_defaults_to_utc(self):
+        """Test that the default timezone is UTC."""
+        assert next_local_midnight(3600.0) == 86400.0
+    
+    def test_dst_transition_day(self):
+        """Test that a 23-hour day ends at the real local midnight."""
+        zoneinfo = pytest.importorskip("zoneinfo")
+        try:
+            new_york = zoneinfo.ZoneInfo("America/New_York")
+        except zoneinfo.ZoneInfoNotFoundError:
+            pytest.skip("tz database has no America/New_York")
+        
+        now = datetime(2024, 3, 10, 0, 30, tzinfo=new_york).timestamp()
+        midnight = next_local_midnight(now, new_york)
+        assert midnight - datetime(2024, 3, 10, tzinfo=new_york).timestamp() == 23 * 3600
+        assert datetime.fromtimestamp(midnight, new_york).strftime("%Y-%m-%d %H:%M") == "2024-03-11 00:00"
+
+
+class TestLogRotator:
+    """Test suite for LogRotator and the writers following it."""
+    
+    def setup_method(self):
+        """Create a temporary log directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = self.temp_dir.name
+        self.path = claim_log_file(self.base_dir)
+        self.rotators = []
+    
+    def teardown_method(self):
+        """Stop rotators and remove the directory."""
+        for rotator in self.rotators:
+            rotator.stop()
+        self.temp_dir.cleanup()
+    
+    def rotator(self, **kwargs):
+        """Create a rotator for the current log file."""
+        rotator = LogRotator(self.path, self.base_dir, **kwargs)
+        self.rotators.append(rotator)
+        return rotator
+    
+    def test_rolls_over_by_size_to_next_serial(self):
+        """Test that writers switch to the next serial after max_bytes."""
+        rotator = self.rotator(max_bytes=100)
+        writer = BufferedLogWriter(self.path, rotator=rotator)
+        
+        writer.write(b"x" * 99 + b"\n")
+        wait_for(lambda: writer.rotation_pending)
+        assert writer.path == self.path
+        writer.write(b"second\n")
+        
+        assert writer.path == rotator.path
+        assert writer.path.name == self.path.name[:-11] + "0000002.log"
+        writer.close()
+        rotator.stop()
+        assert self.path.read_bytes() == b"x" * 99 + b"\n"
+        assert rotator.path.read_bytes() == b"second\n"
+        assert rotator.rotations == 1
+    
+    def test_prepares_file_for_every_writer(self):
+        """Test that the capture writer and the logging handler share the new file."""
+        rotations = []
+        rotator = self.rotator(max_bytes=1000, on_rotate=rotations.append)
+        writer = BufferedLogWriter(self.path, rotator=rotator)
+        handler = RotatingLogFileHandler(self.path, rotator, encoding='utf-8')
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        
+        handler.handle(make_record("before"))
+        rotator.request_rollover()
+        wait_for(lambda: rotations)
+        handler.handle(make_record("after %d", 1))
+        writer.write(b"captured\n")
+        handler.close()
+        writer.close()
+        
+        assert rotations == [rotator.path]
+        assert handler.baseFilename == str(rotator.path.absolute())
+        assert self.path.read_text() == "before\n"
+        assert rotator.path.read_text() == "after 1\ncaptured\n"
+    
+    def test_rolls_over_at_midnight(self, monkeypatch):
+        """Test the midnight rollover with a deadline that has already passed."""
+        monkeypatch.setattr(rotation, "next_local_midnight", lambda now, tz: now - 1 if now < limit else now + 3600)
+        limit = time.time() + 0.1
+        rotator = self.rotator(at_midnight=True)
+        writer = BufferedLogWriter(self.path, rotator=rotator)
+        
+        wait_for(lambda: writer.rotation_pending)
+        writer.write(b"next day\n")
+        writer.close()
+        assert rotator.path != self.path
+        assert rotator.path.read_bytes() == b"next day\n"
+    
+    def test_binary_files_start_with_header(self):
+        """Test that every rotated binary file decodes on its own."""
+        rotator = self.rotator(max_bytes=200, preamble=lambda: header_record(timezone.utc))
+        handler = BinaryLogHandler(self.path, rotator=rotator)
+        paths = {self.path}
+        
+        for i in range(50):
+            handler.handle(make_record("request %d handled", i))
+            paths.add(handler.path)
+            wait_for(lambda: rotator.size < 200 or handler.writer.rotation_pending)
+        handler.close()
+        
+        lines = []
+        for path in sorted(paths):
+            assert path.read_bytes().count(header_record(timezone.utc)) == 1
+            output = io.StringIO()
+            decode_to_text(path, output)
+            lines.extend(output.getvalue().splitlines())
+        assert len(paths) > 2
+        assert [line.split(" - ")[-1] for line in lines] == [f"request {i} handled" for i in range(50)]
+    
+    def test_invalid_max_bytes(self):
+        """Test that a non-positive size limit is rejected."""
+        with pytest.raises(ValueError, match="max_bytes"):
+            LogRotator(self.path, self.base_dir, max_bytes=0)
+    
+    def test_reports_finished_files(self):
+        """Test that a previous file is reported once every writer switched away from it."""
+        finished = []
+        rotator = self.rotator(on_finished=finished.append)
+        writer = BufferedLogWriter(self.path, rotator=rotator)
+        idle_writer = BufferedLogWriter(self.path, rotator=rotator)
+        writer.write(b"first\n")
+        
+        rotator.request_rollover()
+        wait_for(lambda: writer.rotation_pending)
+        writer.write(b"second\n")
+        time.sleep(0.05)
+        assert finished == []
+        
+        idle_writer.close()
+        wait_for(lambda: finished)
+        assert finished == [self.path]
+        writer.close()
+        rotator.stop()
+        assert finished == [self.path]
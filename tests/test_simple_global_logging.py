@@ -35,8 +35,18 @@ class TestSimpleGlobalLogging:
     
     def teardown_method(self):
         """Cleanup test environment."""
-        # Restore stdout
+        # Restore stdout and stop async logging
         simple_global_logging.restore_stdout()
+        simple_global_logging.stop_logging()
+        if core._rotator is not None:
+            core._rotator.stop()
+            core._rotator = None
+        if core._compressor is not None:
+            core._compressor.stop()
+            core._compressor = None
+        if core._pruner is not None:
+            core._pruner.stop()
+            core._pruner = None
         
         # Clear logging handlers
         logging.getLogger().handlers.clear()
@@ -270,4 +280,782 @@ class TestSimpleGlobalLogging:
         # Verify filename format
         utc = timezone.utc
         today = datetime.now(utc).strftime("%Y%m%d")
-        assert re.match(rf"{today}-\d{{7}}\.log", log_files[0].name) 
\ No newline at end of file
+        assert re.match(rf"{today}-\d{{7}}\.log", log_files[0].name)
+    
+    def test_stdout_capture_keeps_log_file_open(self):
+        """Test that captured output reuses one long-lived log file handle."""
+        simple_global_logging.setup_logging_with_stdout_capture(base_dir=str(self.temp_dir))
+        
+        print("First line")
+        writer = sys.stdout.writer
+        handle = writer._file
+        print("Second line")
+        
+        assert handle is not None
+        assert writer._file is handle
+        
+        simple_global_logging.restore_stdout()
+        assert writer.closed
+        assert handle.closed
+    
+    def test_stdout_capture_interval_flush_policy(self):
+        """Test that the interval flush policy buffers output until flushed."""
+        simple_global_logging.setup_logging_with_stdout_capture(
+            base_dir=str(self.temp_dir),
+            capture={"flush_policy": "interval", "flush_interval": 3600}
+        )
+        log_file = simple_global_logging.get_current_log_file()
+        
+        print("Buffered line")
+        sys.stdout.writer._last_flush = float("-inf")
+        print("Triggers flush")
+        print("Stays buffered")
+        
+        content = log_file.read_text(encoding='utf-8')
+        assert "STDOUT: Triggers flush" in content
+        assert "Stays buffered" not in content
+        
+        # restore_stdout() flushes and closes the writer
+        simple_global_logging.restore_stdout()
+        content = log_file.read_text(encoding='utf-8')
+        assert "STDOUT: Stays buffered" in content
+    
+    def test_stdout_capture_size_flush_policy(self):
+        """Test that the size flush policy flushes once the threshold is reached."""
+        simple_global_logging.setup_logging_with_stdout_capture(
+            base_dir=str(self.temp_dir),
+            capture={"flush_policy": "size", "flush_threshold": 200}
+        )
+        log_file = simple_global_logging.get_current_log_file()
+        
+        print("x" * 10)
+        assert "xxxxxxxxxx" not in log_file.read_text(encoding='utf-8')
+        
+        print("y" * 200)
+        content = log_file.read_text(encoding='utf-8')
+        assert "xxxxxxxxxx" in content
+        assert "y" * 200 in content
+    
+    def test_invalid_flush_policy(self):
+        """Test that an unknown flush policy is rejected."""
+        with pytest.raises(ValueError):
+            simple_global_logging.setup_logging_with_stdout_capture(
+                base_dir=str(self.temp_dir),
+                capture={"flush_policy": "never"}
+            )
+    
+    def test_async_stdout_capture(self):
+        """Test that async capture writes queued output in order on restore."""
+        simple_global_logging.setup_logging_with_stdout_capture(
+            base_dir=str(self.temp_dir),
+            capture={"async_capture": True}
+        )
+        log_file = simple_global_logging.get_current_log_file()
+        async_writer = sys.stdout.async_writer
+        
+        for i in range(500):
+            print(f"Async line {i}")
+        
+        # restore_stdout() drains the queue before closing the file
+        simple_global_logging.restore_stdout()
+        assert async_writer.closed
+        
+        content = log_file.read_text(encoding='utf-8')
+        positions = [content.index(f"STDOUT: Async line {i}\n") for i in range(500)]
+        assert positions == sorted(positions)
+    
+    def test_async_stdout_capture_flush(self):
+        """Test that AsyncLogWriter.flush() waits for queued records."""
+        simple_global_logging.setup_logging_with_stdout_capture(
+            base_dir=str(self.temp_dir),
+            capture={"async_capture": True, "flush_policy": "interval", "flush_interval": 3600}
+        )
+        log_file = simple_global_logging.get_current_log_file()
+        
+        print("Queued line")
+        assert sys.stdout.async_writer.flush(timeout=5)
+        
+        assert "STDOUT: Queued line" in log_file.read_text(encoding='utf-8')
+    
+    def test_stderr_capture_shares_sink(self):
+        """Test that stdout and stderr share one sink and are labelled correctly."""
+        simple_global_logging.setup_logging_with_stdout_capture(base_dir=str(self.temp_dir))
+        log_file = simple_global_logging.get_current_log_file()
+        
+        assert sys.stdout.sink is sys.stderr.sink
+        assert sys.stdout.lock is sys.stderr.lock
+        
+        print("To stdout")
+        print("To stderr", file=sys.stderr)
+        
+        content = log_file.read_text(encoding='utf-8')
+        assert "STDOUT: To stdout" in content
+        assert "STDERR: To stderr" in content
+        assert "STDOUT: To stderr" not in content
+    
+    def test_shared_sink_threads_do_not_tear_lines(self):
+        """Test that concurrent stdout/stderr writers never interleave within a line."""
+        import threading
+        
+        simple_global_logging.setup_logging_with_stdout_capture(base_dir=str(self.temp_dir), capture={"flush_policy": "size"})
+        log_file = simple_global_logging.get_current_log_file()
+        
+        def worker(stream, label):
+            for i in range(200):
+                stream.write(f"{label}-{i}-" + label * 50 + "\n")
+        
+        threads = [
+            threading.Thread(target=worker, args=(sys.stdout, "o")),
+            threading.Thread(target=worker, args=(sys.stderr, "e")),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        simple_global_logging.restore_stdout()
+        
+        lines = [line for line in log_file.read_text(encoding='utf-8').splitlines() if "STD" in line]
+        assert len(lines) == 400
+        for line in lines:
+            assert re.match(r"\[[^\]]+\] STDOUT: o-\d+-o{50}$", line) or re.match(r"\[[^\]]+\] STDERR: e-\d+-e{50}$", line)
+    
+    def test_stdout_capture_assembles_print_fragments(self):
+        """Test that print() fragments become one record per line."""
+        simple_global_logging.setup_logging_with_stdout_capture(base_dir=str(self.temp_dir))
+        log_file = simple_global_logging.get_current_log_file()
+        
+        print("a", "b", "c")
+        sys.stdout.write("multi\nline\n")
+        
+        lines = [line for line in log_file.read_text(encoding='utf-8').splitlines() if "STDOUT" in line]
+        assert len(lines) == 3
+        assert lines[0].endswith("STDOUT: a b c")
+        assert lines[1].endswith("STDOUT: multi")
+        assert lines[2].endswith("STDOUT: line")
+    
+    def test_stdout_capture_partial_line_on_flush(self):
+        """Test that an unterminated line is written on flush()."""
+        simple_global_logging.setup_logging_with_stdout_capture(base_dir=str(self.temp_dir))
+        log_file = simple_global_logging.get_current_log_file()
+        
+        sys.stdout.write("Progress: ")
+        sys.stdout.write("50%")
+        assert "Progress" not in log_file.read_text(encoding='utf-8')
+        
+        sys.stdout.flush()
+        assert "STDOUT: Progress: 50%" in log_file.read_text(encoding='utf-8')
+    
+    def test_stdout_capture_partial_line_timeout(self):
+        """Test that a stale unterminated line is written as its own record."""
+        simple_global_logging.setup_logging_with_stdout_capture(
+            base_dir=str(self.temp_dir),
+            capture={"partial_line_timeout": 0.0}
+        )
+        log_file = simple_global_logging.get_current_log_file()
+        
+        sys.stdout.write("Dangling")
+        print("Next line", file=sys.stderr)
+        
+        content = log_file.read_text(encoding='utf-8')
+        assert "STDOUT: Dangling\n" in content
+        assert "STDERR: Next line" in content
+    
+    def test_stdout_capture_partial_line_timeout_without_writes(self):
+        """Test that a stale unterminated line is written in sync mode without any further writes."""
+        import time
+        
+        simple_global_logging.setup_logging_with_stdout_capture(
+            base_dir=str(self.temp_dir),
+            capture={"partial_line_timeout": 0.05}
+        )
+        log_file = simple_global_logging.get_current_log_file()
+        
+        sys.stdout.write("Waiting for input")
+        assert "Waiting for input" not in log_file.read_text(encoding='utf-8')
+        time.sleep(0.1)
+        deadline = time.monotonic() + 5
+        while "Waiting for input" not in log_file.read_text(encoding='utf-8') and time.monotonic() < deadline:
+            time.sleep(0.02)
+        
+        assert "STDOUT: Waiting for input\n" in log_file.read_text(encoding='utf-8')
+    
+    def test_async_stdout_capture_partial_line_timeout(self):
+        """Test that the async writer thread writes stale unterminated lines while idle."""
+        import time
+        
+        simple_global_logging.setup_logging_with_stdout_capture(
+            base_dir=str(self.temp_dir),
+            capture={"async_capture": True, "partial_line_timeout": 0.05}
+        )
+        log_file = simple_global_logging.get_current_log_file()
+        
+        sys.stdout.write("Waiting for input")
+        deadline = time.monotonic() + 5
+        while "Waiting for input" not in log_file.read_text(encoding='utf-8') and time.monotonic() < deadline:
+            time.sleep(0.02)
+        
+        assert "STDOUT: Waiting for input" in log_file.read_text(encoding='utf-8')
+    
+    def test_stdout_capture_removes_ansi_codes(self):
+        """Test that ANSI escape sequences are removed from the log file only."""
+        simple_global_logging.setup_logging_with_stdout_capture(base_dir=str(self.temp_dir))
+        log_file = simple_global_logging.get_current_log_file()
+        
+        print("\x1b[32mGreen\x1b[0m and plain")
+        
+        content = log_file.read_text(encoding='utf-8')
+        assert "STDOUT: Green and plain" in content
+        assert "\x1b" not in content
+    
+    def test_remove_ansi_codes_matches_regex(self):
+        """Test that the ESC fast path gives the same result as the regex."""
+        from simple_global_logging.capture import ANSI_ESCAPE, remove_ansi_codes
+        
+        samples = [
+            "plain text",
+            "",
+            "\x1b[1;31mbold red\x1b[0m",
+            "\r\x1b[K[####....] 50%",
+            "\x1b]0;title\x07 osc",
+            "\x1bM reverse index",
+            "dangling escape \x1b",
+            "\x1b[?25l hidden cursor",
+        ]
+        for text in samples:
+            assert remove_ansi_codes(text) == ANSI_ESCAPE.sub('', text)
+    
+    def test_stream_flush_policies(self):
+        """Test when LogCapture flushes the original stream."""
+        import io
+        from simple_global_logging.capture import LogCapture
+        
+        class CountingStream(io.StringIO):
+            def __init__(self, tty):
+                super().__init__()
+                self.tty = tty
+                self.flushes = 0
+            
+            def isatty(self):
+                return self.tty
+            
+            def flush(self):
+                self.flushes += 1
+                super().flush()
+        
+        log_path = self.temp_dir / "flush.log"
+        
+        def flushes_for(tty, **options):
+            stream = CountingStream(tty)
+            capture = LogCapture(stream, log_path, **options)
+            capture.write("partial")
+            capture.write(" line\n")
+            capture.write("next")
+            capture.close_log()
+            assert stream.getvalue() == "partial line\nnext"
+            return stream.flushes
+        
+        assert flushes_for(tty=True) == 3
+        assert flushes_for(tty=False) == 0
+        assert flushes_for(tty=False, stream_flush="always") == 3
+        assert flushes_for(tty=True, stream_flush="newline") == 1
+        assert flushes_for(tty=False, stream_flush="interval", stream_flush_interval=3600) == 0
+        
+        with pytest.raises(ValueError):
+            LogCapture(CountingStream(False), log_path, stream_flush="sometimes")
+    
+    def test_restore_stdout_flushes_original_streams(self):
+        """Test that restore_stdout() flushes output buffered in the original streams."""
+        import io
+        
+        buffered = io.BufferedWriter(io.BytesIO())
+        real_stdout = sys.stdout
+        sys.stdout = io.TextIOWrapper(buffered, encoding='utf-8')
+        try:
+            simple_global_logging.setup_logging_with_stdout_capture(base_dir=str(self.temp_dir))
+            
+            print("Buffered in pipe")
+            assert buffered.raw.getvalue() == b""
+            
+            simple_global_logging.restore_stdout()
+            assert buffered.raw.getvalue() == b"Buffered in pipe\n"
+        finally:
+            sys.stdout = real_stdout
+            core._original_stdout = real_stdout
+    
+    @pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX echo")
+    def test_fd_capture(self, capfd):
+        """Test that fd capture logs os.write() and child process output and still tees it."""
+        import os
+        import subprocess
+        
+        simple_global_logging.setup_logging_with_stdout_capture(base_dir=str(self.temp_dir), capture={"fd_capture": True})
+        log_file = simple_global_logging.get_current_log_file()
+        
+        os.write(1, b"raw fd write\n")
+        os.write(2, b"raw stderr \x1b[31mwrite\x1b[0m\n")
+        subprocess.run(["echo", "from child process"], check=True)
+        logging.info("Logged once")
+        
+        simple_global_logging.restore_stdout()
+        
+        content = log_file.read_text(encoding='utf-8')
+        assert "STDOUT: raw fd write" in content
+        assert "STDERR: raw stderr write" in content
+        assert "STDOUT: from child process" in content
+        # Console log output is not captured a second time as STDERR
+        assert content.count("Logged once") == 1
+        
+        out, err = capfd.readouterr()
+        assert "raw fd write\n" in out
+        assert "from child process\n" in out
+        assert "raw stderr \x1b[31mwrite\x1b[0m\n" in err
+        
+        # Descriptors are restored
+        os.write(1, b"after restore\n")
+        assert "after restore" not in log_file.read_text(encoding='utf-8')
+    
+    def test_capture_buffer_writes_bytes(self):
+        """Test that the binary buffer tees bytes-like objects to the original buffer and the log."""
+        import io
+        from simple_global_logging.capture import LogCapture
+        
+        raw = io.BytesIO()
+        original = io.TextIOWrapper(raw, encoding='utf-8')
+        log_path = self.temp_dir / "binary.log"
+        capture = LogCapture(original, log_path)
+        
+        capture.write("text first ")
+        assert capture.buffer.write(b"bytes payload\n") == 14
+        capture.buffer.write(bytearray(b"bytearray payload"))
+        capture.buffer.write(memoryview(b"xx memoryview \x1b[1mpayload\x1b[0m\n")[3:])
+        capture.buffer.write(b"\n")
+        capture.buffer.flush()
+        capture.close_log()
+        
+        assert raw.getvalue().endswith(
+            b"bytes payload\nbytearray payloadmemoryview \x1b[1mpayload\x1b[0m\n\n"
+        )
+        lines = log_path.read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 4
+        assert lines[0].endswith("STDOUT: text first ")
+        assert lines[1].endswith("STDOUT: bytes payload")
+        assert lines[2].endswith("STDOUT: bytearray payload")
+        assert lines[3].endswith("STDOUT: memoryview payload")
+    
+    def test_capture_bytes_line_in_one_write(self):
+        """Test that a captured bytes line reaches the file in a single write."""
+        from unittest import mock
+        from simple_global_logging.capture import CaptureSink
+        
+        sink = CaptureSink(self.temp_dir / "bytes.log")
+        sink.writer.open()
+        sink.writer._file = file = mock.Mock(wraps=sink.writer._file)
+        sink.write_bytes("STDOUT", b"x" * 100_000)
+        sink.write_bytes("STDOUT", b"terminated\n")
+        sink.close()
+        
+        lines = [call.args[0] for call in file.write.call_args_list]
+        assert len(lines) == 2
+        assert lines[0].endswith(b"] STDOUT: " + b"x" * 100_000 + b"\n")
+        assert lines[1].endswith(b"] STDOUT: terminated\n")
+    
+    def test_capture_buffer_async(self):
+        """Test that binary writes are copied before being queued in async mode."""
+        import io
+        from simple_global_logging.capture import LogCapture
+        
+        log_path = self.temp_dir / "binary_async.log"
+        capture = LogCapture(io.TextIOWrapper(io.BytesIO(), encoding='utf-8'), log_path, async_capture=True)
+        
+        data = bytearray(b"first payload")
+        capture.buffer.write(data)
+        data[:] = b"reused buffer"
+        capture.close_log()
+        
+        assert "STDOUT: first payload" in log_path.read_text(encoding='utf-8')
+    
+    def test_capture_buffer_unavailable(self):
+        """Test that .buffer is missing when the original stream has none."""
+        import io
+        from simple_global_logging.capture import LogCapture
+        
+        capture = LogCapture(io.StringIO(), self.temp_dir / "nobuffer.log")
+        assert not hasattr(capture, 'buffer')
+        capture.close_log()
+    
+    def test_capture_stats(self):
+        """Test capture counters and that drop policies enable async capture."""
+        assert simple_global_logging.get_capture_stats() is None
+        
+        simple_global_logging.setup_logging_with_stdout_capture(
+            base_dir=str(self.temp_dir),
+            capture={"overload": "drop-oldest"}
+        )
+        assert sys.stdout.async_writer is not None
+        
+        print("Counted line")
+        assert sys.stdout.async_writer.flush(timeout=5)
+        
+        stats = simple_global_logging.get_capture_stats()
+        assert stats["written_records"] >= 1
+        assert stats["dropped_records"] == 0
+        assert stats["write_errors"] == 0
+        
+        simple_global_logging.restore_stdout()
+        assert simple_global_logging.get_capture_stats() is None
+    
+    def test_async_logging(self):
+        """Test that async mode routes records through a queue to the file."""
+        from logging.handlers import QueueHandler
+        
+        logger = simple_global_logging.setup_logging(base_dir=str(self.temp_dir), async_mode=True)
+        assert len(logger.handlers) == 1
+        assert isinstance(logger.handlers[0], QueueHandler)
+        
+        worker_logger = simple_global_logging.get_logger("worker")
+        for i in range(100):
+            worker_logger.info(f"Async message {i}")
+        assert simple_global_logging.flush_logging(timeout=5)
+        
+        content = Path(simple_global_logging.get_current_log_file()).read_text(encoding='utf-8')
+        assert "Async message 0" in content
+        assert "Async message 99" in content
+    
+    def test_async_jsonl_exception(self):
+        """Test that async mode keeps the message and the exception apart in JSON Lines."""
+        import json
+        
+        simple_global_logging.setup_logging(base_dir=str(self.temp_dir), async_mode=True, file_format="jsonl")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            simple_global_logging.get_logger("worker").exception("Failed %d of %s", 1, "many")
+        assert simple_global_logging.flush_logging(timeout=5)
+        
+        lines = Path(simple_global_logging.get_current_log_file()).read_text(encoding='utf-8').splitlines()
+        failed = next(json.loads(line) for line in lines if "Failed" in line)
+        assert failed["message"] == "Failed 1 of many"
+        assert failed["exception"].startswith("Traceback")
+        assert failed["exception"].endswith("ValueError: boom")
+    
+    def test_async_mutable_arguments(self):
+        """Test that async mode queues the message as it was when a mutable argument was logged."""
+        import queue
+        from simple_global_logging.handlers import BlockingQueueHandler
+        
+        handler = BlockingQueueHandler(queue.Queue())
+        logger = logging.getLogger("async_mutable")
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            items = ["first"]
+            logger.warning("Items: %s", items)
+            items.append("second")
+            logger.warning("Count: %d of %s", 2, "items")
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
+        
+        mutable, scalars = handler.queue.get(), handler.queue.get()
+        assert mutable.getMessage() == "Items: ['first']" and mutable.args is None
+        # Records with scalar arguments keep their template
+        assert scalars.msg == "Count: %d of %s" and scalars.args == (2, "items")
+    
+    def test_async_binary_exception(self):
+        """Test that async mode keeps templates, arguments and exceptions in binary files."""
+        import io
+        from simple_global_logging.binary import decode_to_text
+        
+        simple_global_logging.setup_logging(base_dir=str(self.temp_dir), async_mode=True, file_format="binary")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            simple_global_logging.get_logger("worker").exception("Failed %d of %s", 1, "many")
+        assert simple_global_logging.flush_logging(timeout=5)
+        
+        log_file = simple_global_logging.get_current_log_file()
+        assert b"Failed %d of %s" in log_file.read_bytes()
+        output = io.StringIO()
+        decode_to_text(log_file, output)
+        content = output.getvalue()
+        assert " - ERROR - worker - Failed 1 of many\nTraceback" in content
+        assert "ValueError: boom\n" in content
+    
+    def test_stop_logging_restores_direct_handlers(self):
+        """Test that stop_logging drains the queue and logs synchronously afterwards."""
+        from logging.handlers import QueueHandler
+        
+        logger = simple_global_logging.setup_logging(base_dir=str(self.temp_dir), async_mode=True)
+        logger.info("Queued before stop")
+        simple_global_logging.stop_logging()
+        
+        assert len(logger.handlers) == 2
+        assert not any(isinstance(h, QueueHandler) for h in logger.handlers)
+        assert core._queue_listener is None
+        
+        logger.info("Direct after stop")
+        for handler in logger.handlers:
+            handler.flush()
+        content = Path(simple_global_logging.get_current_log_file()).read_text(encoding='utf-8')
+        assert "Queued before stop" in content
+        assert "Direct after stop" in content
+        
+        # Stopping again is a no-op
+        simple_global_logging.stop_logging()
+    
+    def test_jsonl_file_format(self):
+        """Test JSON Lines output for log records and captured output in one file."""
+        import json
+        
+        simple_global_logging.setup_logging_with_stdout_capture(
+            base_dir=str(self.temp_dir),
+            file_format="jsonl",
+            context={"service": "test"}
+        )
+        simple_global_logging.get_logger("worker").info("Logged %d", 1, extra={"request_id": "r1"})
+        print("Captured line")
+        simple_global_logging.restore_stdout()
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+        
+        lines = Path(simple_global_logging.get_current_log_file()).read_text(encoding='utf-8').splitlines()
+        records = [json.loads(line) for line in lines]
+        assert all(list(r)[:5] == ["time", "level", "logger", "stream", "message"] for r in records)
+        assert all(r["context"] == {"service": "test"} for r in records)
+        
+        logged = next(r for r in records if r["message"] == "Logged 1")
+        assert logged["logger"] == "worker"
+        assert logged["stream"] == "log"
+        assert logged["extra"] == {"request_id": "r1"}
+        
+        captured = next(r for r in records if r["message"] == "Captured line")
+        assert captured["stream"] == "stdout"
+        assert captured["level"] is None
+    
+    def test_invalid_file_format(self):
+        """Test that an unknown file format is rejected."""
+        with pytest.raises(ValueError):
+            simple_global_logging.setup_logging(base_dir=str(self.temp_dir), file_format="xml")
+    
+    def test_binary_file_format(self):
+        """Test binary log files written by setup_logging and stdout capture."""
+        import io
+        from simple_global_logging.binary import decode_to_text
+        
+        simple_global_logging.setup_logging_with_stdout_capture(base_dir=str(self.temp_dir), file_format="binary")
+        simple_global_logging.get_logger("worker").info("Logged %d of %s", 1, "many")
+        print("Captured line")
+        simple_global_logging.restore_stdout()
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+        
+        output = io.StringIO()
+        decode_to_text(simple_global_logging.get_current_log_file(), output)
+        content = output.getvalue()
+        assert " - INFO - worker - Logged 1 of many\n" in content
+        assert "] STDOUT: Captured line\n" in content
+    
+    def test_size_rotation(self):
+        """Test that logs and captured output follow a size-based rollover."""
+        import time
+        
+        simple_global_logging.setup_logging_with_stdout_capture(base_dir=str(self.temp_dir), rotation={"max_bytes": 2000})
+        first_file = simple_global_logging.get_current_log_file()
+        logger = simple_global_logging.get_logger("worker")
+        
+        deadline = time.monotonic() + 5
+        count = 0
+        while simple_global_logging.get_current_log_file() == first_file:
+            assert time.monotonic() < deadline
+            logger.info("Message %d", count)
+            count += 1
+            time.sleep(0.001)
+        second_file = simple_global_logging.get_current_log_file()
+        logger.info("After rotation")
+        print("Captured after rotation")
+        simple_global_logging.restore_stdout()
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+        
+        assert first_file.name.endswith("0000001.log")
+        assert second_file.name.endswith("0000002.log")
+        content = second_file.read_text()
+        assert " - INFO - worker - After rotation\n" in content
+        assert "] STDOUT: Captured after rotation\n" in content
+        assert "Message 0\n" in first_file.read_text()
+    
+    def test_option_groups(self):
+        """Test that option groups are accepted as objects or dictionaries and unknown options are rejected."""
+        from simple_global_logging import CaptureOptions, RetentionOptions, RotationOptions
+        
+        simple_global_logging.setup_logging_with_stdout_capture(
+            base_dir=str(self.temp_dir),
+            capture=CaptureOptions(flush_policy="size", flush_threshold=200),
+            rotation=RotationOptions(max_bytes=100_000),
+            retention=RetentionOptions(max_files=10)
+        )
+        assert sys.stdout.writer.flush_policy == "size"
+        assert core._rotator.max_bytes == 100_000
+        assert core._pruner is not None
+        simple_global_logging.restore_stdout()
+        
+        with pytest.raises(TypeError, match="max_byte"):
+            simple_global_logging.setup_logging(base_dir=str(self.temp_dir), rotation={"max_byte": 1000})
+        with pytest.raises(TypeError, match="CaptureOptions"):
+            simple_global_logging.setup_logging_with_stdout_capture(base_dir=str(self.temp_dir), capture=["fd_capture"])
+    
+    def test_rotation_with_filename(self):
+        """Test that rotation is rejected for a custom filename."""
+        with pytest.raises(ValueError, match="filename"):
+            simple_global_logging.setup_logging(base_dir=str(self.temp_dir), filename="app.log", rotation={"max_bytes": 1000})
+    
+    def test_compress_rotated_files(self):
+        """Test that files finished by rotation are compressed in the background."""
+        import gzip
+        import time
+        
+        assert simple_global_logging.get_compression_stats() is None
+        simple_global_logging.setup_logging(base_dir=str(self.temp_dir), rotation={"max_bytes": 2000},
+                                            retention={"compress": "gzip"})
+        first_file = simple_global_logging.get_current_log_file()
+        logger = simple_global_logging.get_logger("worker")
+        
+        deadline = time.monotonic() + 5
+        count = 0
+        while simple_global_logging.get_compression_stats()["compressed_files"] == 0:
+            assert time.monotonic() < deadline
+            logger.info("Message %d", count)
+            count += 1
+            time.sleep(0.001)
+        
+        stats = simple_global_logging.get_compression_stats()
+        assert stats["failed_files"] == 0
+        assert stats["bytes_out"] < stats["bytes_in"]
+        assert not first_file.exists()
+        archive = first_file.with_name(first_file.name + ".gz")
+        assert " - INFO - worker - Message 0\n" in gzip.decompress(archive.read_bytes()).decode()
+    
+    def test_invalid_compression(self):
+        """Test that an unknown compression format is rejected."""
+        with pytest.raises(ValueError, match="compress must be one of"):
+            simple_global_logging.setup_logging(base_dir=str(self.temp_dir), retention={"compress": "zip"})
+    
+    def test_retention_removes_oldest_files(self):
+        """Test that old log files beyond max_files are removed but the current one is kept."""
+        import os
+        import time
+        
+        old = time.time() - 3600
+        for serial in range(1, 6):
+            path = self.temp_dir / f"20240501-{serial:07d}.log"
+            path.write_text("old\n")
+            os.utime(path, (old, old))
+        
+        simple_global_logging.setup_logging(base_dir=str(self.temp_dir), retention={"max_files": 2})
+        assert core._pruner.wait(5)
+        
+        current = simple_global_logging.get_current_log_file()
+        assert sorted(p.name for p in self.temp_dir.glob("*.log")) == ["20240501-0000005.log", current.name]
+        assert core._pruner.stats()["removed_files"] == 4
+    
+    def test_invalid_retention(self):
+        """Test that non-positive retention limits are rejected."""
+        with pytest.raises(ValueError, match="max_files must be positive"):
+            simple_global_logging.setup_logging(base_dir=str(self.temp_dir), retention={"max_files": 0})
+    
+    def test_mmap_file_of_another_process(self):
+        """Test that a file another process has mapped is refused instead of truncated under it."""
+        import subprocess
+        
+        script = (
+            "import logging, sys\n"
+            "import simple_global_logging\n"
+            "simple_global_logging.setup_logging(base_dir=sys.argv[1], filename='app.log', file_writer='mmap')\n"
+            "print('ready', flush=True)\n"
+            "sys.stdin.readline()\n"
+            "logging.info('Still mapped')\n"
+        )
+        child = subprocess.Popen([sys.executable, "-c", script, str(self.temp_dir)], cwd=Path(__file__).parent.parent,
+                                 stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        try:
+            assert child.stdout.readline() == "ready\n"
+            with pytest.raises(RuntimeError, match="already open in another process"):
+                simple_global_logging.setup_logging(base_dir=str(self.temp_dir), filename="app.log",
+                                                    file_writer="mmap")
+            child.communicate("\n", timeout=30)
+        finally:
+            if child.poll() is None:
+                child.kill()
+        
+        assert child.returncode == 0
+        content = (self.temp_dir / "app.log").read_bytes()
+        assert b"Still mapped" in content and b"\0" not in content
+    
+    def test_lazy_logger_policy(self):
+        """Test that lazy mode clears loggers created before setup on first use and keeps them clear."""
+        library = logging.getLogger("lazy_policy.library")
+        library.addHandler(logging.StreamHandler())
+        library.propagate = False
+        
+        simple_global_logging.setup_logging(base_dir=str(self.temp_dir), logger_policy="lazy",
+                                            logger_levels={"lazy_policy.noisy": "ERROR"})
+        try:
+            # The library logger is cleared on its first use after setup
+            with pytest.warns(RuntimeWarning):
+                library.addHandler(logging.FileHandler(self.temp_dir / "library.log", delay=True))
+            assert library.handlers == [] and library.propagate
+            library.propagate = False
+            later = logging.getLogger("lazy_policy.later")
+            with pytest.warns(RuntimeWarning):
+                later.addHandler(logging.FileHandler(self.temp_dir / "later.log", delay=True))
+            library.warning("From the library")
+            later.warning("From a later logger")
+            assert logging.getLogger("lazy_policy.noisy.child").getEffectiveLevel() == logging.ERROR
+        finally:
+            core._logger_policy.remove()
+        
+        content = simple_global_logging.get_current_log_file().read_text()
+        assert "From the library" in content and "From a later logger" in content
+        assert not (self.temp_dir / "library.log").exists() and not (self.temp_dir / "later.log").exists()
+    
+    def test_rate_limits(self):
+        """Test that records beyond a rate limit are not written, and errors still are."""
+        assert simple_global_logging.get_rate_limit_stats() is None
+        simple_global_logging.setup_logging(base_dir=str(self.temp_dir), async_mode=True, file_format="jsonl",
+                                            rate_limits=[{"prefix": "flood", "rate": 1, "burst": 3}])
+        log_file = simple_global_logging.get_current_log_file()
+        logger = simple_global_logging.get_logger("flood.worker")
+        for i in range(100):
+            logger.warning("Retrying %d", i)
+        logger.error("Gave up")
+        simple_global_logging.get_logger("calm").warning("Not limited")
+        simple_global_logging.stop_logging()
+        
+        content = log_file.read_text()
+        assert content.count("Retrying") == 3
+        assert "Gave up" in content and "Not limited" in content
+        # The filter's decision is not written as a field passed with extra=
+        assert '"extra"' not in content
+        assert simple_global_logging.get_rate_limit_stats() == {"passed": 3, "sampled": 0, "suppressed": 97, "keys": 1}
+    
+    def test_mmap_file_writer(self):
+        """Test that logs and captured output share a memory-mapped log file."""
+        simple_global_logging.setup_logging_with_stdout_capture(base_dir=str(self.temp_dir), file_writer="mmap")
+        log_file = simple_global_logging.get_current_log_file()
+        simple_global_logging.get_logger("worker").info("Logged through mmap")
+        print("Captured through mmap")
+        simple_global_logging.restore_stdout()
+        
+        # The file is preallocated until every writer has closed it
+        assert log_file.read_bytes().endswith(b"\0")
+        core._file_handler.close()
+        content = log_file.read_text()
+        assert "\0" not in content
+        assert " - INFO - worker - Logged through mmap\n" in content
+        assert "] STDOUT: Captured through mmap\n" in content
+        assert content.endswith(" - INFO - root - Standard output capture disabled\n")
+    
+    def test_mmap_file_writer_binary(self):
+        """Test that the mmap writer is rejected for binary files."""
+        with pytest.raises(ValueError, match="binary"):
+            simple_global_logging.setup_logging(base_dir=str(self.temp_dir), file_format="binary", file_writer="mmap")
@@ -0,0 +1,121 @@
+"""Tests for cached timestamp formatting."""
+
+import logging
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+from simple_global_logging.formatters import TimezoneFormatter
+from simple_global_logging.timestamps import TimestampCache, TimezoneConverter, get_timestamp_cache
+
+
+def zone(name):
+    """Get a zoneinfo timezone, skipping the test when no tz database is available."""
+    zoneinfo = pytest.importorskip("zoneinfo")
+    try:
+        return zoneinfo.ZoneInfo(name)
+    except zoneinfo.ZoneInfoNotFoundError:
+        pytest.skip(f"tz database has no {name}")
+
+
+# New York DST transitions in 2024: clocks go forward at 07:00 UTC, back at 06:00 UTC
+SPRING_FORWARD = datetime(2024, 3, 10, 7, 0, tzinfo=timezone.utc).timestamp()
+FALL_BACK = datetime(2024, 11, 3, 6, 0, tzinfo=timezone.utc).timestamp()
+
+
+class TestTimestampCache:
+    """Test suite for TimestampCache."""
+    
+    def test_matches_datetime_strftime(self):
+        """Test that cached output matches a freshly formatted datetime."""
+        jst = timezone(timedelta(hours=9))
+        cache = TimestampCache(jst)
+        
+        for created in (0.0, 1.5, 1700000000.25, 1700000000.999, 1700000001.0, 1700086399.5):
+            expected = datetime.fromtimestamp(int(created), jst).strftime("%Y-%m-%d %H:%M:%S")
+            assert cache.format(created) == expected
+    
+    def test_reuses_string_within_second(self):
+        """Test that the formatted string is reused within the same second."""
+        cache = TimestampCache(timezone.utc)
+        
+        first = cache.format(1700000000.1)
+        assert cache.format(1700000000.9) is first
+        assert cache.format(1700000001.0) is not first
+    
+    def test_format_ms(self):
+        """Test millisecond formatting."""
+        cache = TimestampCache(timezone.utc)
+        
+        assert cache.format_ms(1700000000.042) == "2023-11-14 22:13:20.042"
+        assert cache.format_ms(1700000000.5, separator=",") == "2023-11-14 22:13:20,500"
+    
+    def test_shared_cache_per_timezone_and_format(self):
+        """Test that caches are shared per timezone and format."""
+        jst = timezone(timedelta(hours=9))
+        
+        assert get_timestamp_cache(jst) is get_timestamp_cache(timezone(timedelta(hours=9)))
+        assert get_timestamp_cache(jst) is not get_timestamp_cache(timezone.utc)
+        assert get_timestamp_cache(jst) is not get_timestamp_cache(jst, "%H:%M:%S")
+        assert get_timestamp_cache() is get_timestamp_cache(timezone.utc)
+
+
+class TestTimezoneConverter:
+    """Test suite for TimezoneConverter."""
+    
+    def test_fixed_offset(self):
+        """Test conversion in a fixed-offset timezone."""
+        jst = timezone(timedelta(hours=9))
+        converter = TimezoneConverter(jst)
+        
+        for created in (0.0, 1700000000.5, 1700050000.999, -1.5):
+            assert converter(created) == datetime.fromtimestamp(created, jst).timetuple()
+    
+    @pytest.mark.parametrize("transition", [SPRING_FORWARD, FALL_BACK])
+    def test_dst_boundaries(self, transition):
+        """Test conversion on both sides of DST transitions, in order and out of order."""
+        new_york = zone("America/New_York")
+        converter = TimezoneConverter(new_york)
+        
+        around = [transition + delta for delta in (-86400, -3600, -1.5, -1, -0.001, 0, 0.5, 1, 3600, 86400)]
+        for created in around + around[::-1]:
+            assert converter(created) == datetime.fromtimestamp(created, new_york).timetuple(), created
+    
+    def test_offset_cached_until_transition(self):
+        """Test that the cached offset span ends exactly at the next transition."""
+        converter = TimezoneConverter(zone("America/New_York"))
+        
+        converter(SPRING_FORWARD - 3600)
+        start, end, offset, isdst = converter._span
+        assert end == SPRING_FORWARD
+        assert start <= SPRING_FORWARD - 3600
+        assert (offset, isdst) == (-5 * 3600, 0)
+        
+        assert converter(SPRING_FORWARD).tm_hour == 3
+        assert converter(SPRING_FORWARD).tm_isdst == 1
+        assert converter._span[0] == SPRING_FORWARD
+    
+    def test_uses_created_not_now(self):
+        """Test that the formatter converter honours the record time, e.g. for queued records."""
+        formatter = TimezoneFormatter('%(asctime)s %(message)s', tz=timezone.utc)
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "queued", None, None)
+        record.created = 1700000000.25
+        record.msecs = 250.0
+        
+        assert formatter.format(record) == "2023-11-14 22:13:20,250 queued"
+
+
+class TestTimezoneFormatter:
+    """Test suite for TimezoneFormatter."""
+    
+    def test_asctime_uses_record_time_and_timezone(self):
+        """Test that asctime is the record's creation time in the formatter timezone."""
+        formatter = TimezoneFormatter(
+            '%(asctime)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S',
+            tz=timezone(timedelta(hours=9))
+        )
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "hello", None, None)
+        record.created = 1700000000.5
+        
+        assert formatter.format(record) == "2023-11-15 07:13:20 - hello"
@@ -0,0 +1,98 @@
+"""Tests for log file name allocation."""
+
+import multiprocessing
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from simple_global_logging.utils import MAX_SERIAL_PROBES, SERIAL_FILE, claim_log_file, generate_log_filename
+
+
+def allocate(base_dir, count):
+    """Worker process: allocate log file names."""
+    return [claim_log_file(base_dir).name for _ in range(count)]
+
+
+class TestClaimLogFile:
+    """Test suite for claim_log_file and generate_log_filename."""
+    
+    def setup_method(self):
+        """Create a temporary log directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.today = datetime.now(timezone.utc).strftime("%Y%m%d")
+    
+    def teardown_method(self):
+        """Remove the directory."""
+        self.temp_dir.cleanup()
+    
+    def touch(self, *names):
+        """Create empty files."""
+        for name in names:
+            (self.base_dir / name).touch()
+    
+    def test_claims_file_and_updates_counter(self):
+        """Test that each call creates the next serial and records it."""
+        first = claim_log_file(str(self.base_dir))
+        second = claim_log_file(str(self.base_dir))
+        
+        assert first.name == f"{self.today}-0000001.log" and first.exists()
+        assert second.name == f"{self.today}-0000002.log" and second.exists()
+        assert (self.base_dir / SERIAL_FILE).read_text() == f"{self.today}-0000002\n"
+    
+    def test_recovers_without_counter(self):
+        """Test that the directory is scanned when there is no counter."""
+        self.touch(f"{self.today}-0000003.log", f"{self.today}-0000007.log.gz", f"{self.today}-0000040.12345.log",
+                   f"{self.today}-0000050.txt", "19990101-0000090.log")
+        
+        assert claim_log_file(str(self.base_dir)).name == f"{self.today}-0000008.log"
+    
+    def test_skips_taken_serials(self):
+        """Test that files created without the counter are never reused."""
+        (self.base_dir / SERIAL_FILE).write_text(f"{self.today}-0000001\n")
+        self.touch(f"{self.today}-0000002.log", f"{self.today}-0000003.log")
+        assert claim_log_file(str(self.base_dir)).name == f"{self.today}-0000004.log"
+        
+        # Far behind: rescans instead of probing one serial at a time
+        (self.base_dir / SERIAL_FILE).write_text(f"{self.today}-0000001\n")
+        self.touch(*(f"{self.today}-{serial:07d}.log" for serial in range(5, MAX_SERIAL_PROBES + 100)))
+        assert claim_log_file(str(self.base_dir)).name == f"{self.today}-{MAX_SERIAL_PROBES + 100:07d}.log"
+    
+    def test_skips_compressed_serials(self):
+        """Test that a serial whose log file only survives as an archive is never reused."""
+        (self.base_dir / SERIAL_FILE).write_text(f"{self.today}-0000001\n")
+        self.touch(f"{self.today}-0000002.log.gz", f"{self.today}-0000003.log.xz")
+        
+        path = claim_log_file(str(self.base_dir))
+        
+        assert path.name == f"{self.today}-0000004.log"
+        assert sorted(p.name for p in self.base_dir.glob("*.log")) == [path.name]
+    
+    def test_name_only(self):
+        """Test that generate_log_filename predicts the next claim without creating anything."""
+        (self.base_dir / SERIAL_FILE).write_text(f"{self.today}-0000001\n")
+        self.touch(f"{self.today}-0000002.log.gz")
+        
+        name = generate_log_filename(str(self.base_dir))
+        
+        assert name.name == f"{self.today}-0000003.log" and not name.exists()
+        assert (self.base_dir / SERIAL_FILE).read_text() == f"{self.today}-0000001\n"
+        assert claim_log_file(str(self.base_dir)) == name
+        assert generate_log_filename(str(self.base_dir / "missing")).name == f"{self.today}-0000001.log"
+        assert not (self.base_dir / "missing").exists()
+    
+    def test_new_day_starts_at_one(self):
+        """Test that a counter from an earlier day starts over."""
+        yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).strftime("%Y%m%d")
+        (self.base_dir / SERIAL_FILE).write_text(f"{yesterday}-0000042\n")
+        
+        assert claim_log_file(str(self.base_dir)).name == f"{self.today}-0000001.log"
+    
+    def test_concurrent_processes_get_distinct_serials(self):
+        """Test that processes allocating at the same time never share a serial."""
+        with multiprocessing.Pool(4) as pool:
+            results = pool.starmap(allocate, [(str(self.base_dir), 50)] * 4)
+        names = [name for result in results for name in result]
+        
+        assert len(set(names)) == 200
+        assert sorted(names) == [f"{self.today}-{serial:07d}.log" for serial in range(1, 201)]
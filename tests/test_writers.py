@@ -0,0 +1,291 @@
+"""Tests for the log file writers."""
+
+import mmap
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from simple_global_logging.writers import (
+    AsyncLogWriter,
+    BufferedLogWriter,
+    MmapFile,
+    open_mmap_file,
+    recover_log_file
+)
+
+
+class GatedWriter:
+    """Writer stand-in that blocks until released and records what it was given."""
+    
+    def __init__(self):
+        self.gate = threading.Event()
+        self.entered = threading.Event()
+        self.chunks = []
+        self.closed = False
+    
+    def writelines(self, chunks):
+        self.entered.set()
+        self.gate.wait(5)
+        self.chunks.extend(chunks)
+    
+    def flush(self):
+        pass
+    
+    def flush_if_due(self):
+        return None
+    
+    def close(self):
+        self.closed = True
+
+
+def format_record(record):
+    return [record.encode('ascii')]
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll until condition() is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def stall(async_writer, writer):
+    """Occupy the writer thread with one record so the queue fills up behind it."""
+    async_writer.submit("stall", 1)
+    assert writer.entered.wait(5)
+
+
+class TestAsyncLogWriterOverload:
+    """Test suite for AsyncLogWriter overload policies."""
+    
+    def make(self, overload, **options):
+        writer = GatedWriter()
+        async_writer = AsyncLogWriter(writer, format_record, max_queue_size=3, overload=overload, **options)
+        stall(async_writer, writer)
+        return writer, async_writer
+    
+    def finish(self, writer, async_writer):
+        writer.gate.set()
+        async_writer.close(timeout=5)
+        assert writer.closed
+        return [chunk.decode('ascii') for chunk in writer.chunks]
+    
+    def test_drop_newest(self):
+        """Test that drop-newest keeps the first records that fit."""
+        writer, async_writer = self.make("drop-newest")
+        for i in range(10):
+            async_writer.submit(f"r{i}", 2)
+        
+        stats = async_writer.stats()
+        assert stats["dropped_records"] == 7
+        assert stats["dropped_bytes"] == 14
+        assert self.finish(writer, async_writer) == ["stall", "r0", "r1", "r2"]
+    
+    def test_drop_oldest(self):
+        """Test that drop-oldest keeps the most recent records."""
+        writer, async_writer = self.make("drop-oldest")
+        for i in range(10):
+            async_writer.submit(f"r{i}", 2)
+        
+        assert async_writer.stats()["dropped_records"] == 7
+        assert self.finish(writer, async_writer) == ["stall", "r7", "r8", "r9"]
+    
+    def test_sample(self):
+        """Test that sample keeps one in sample_rate records while overloaded."""
+        writer, async_writer = self.make("sample", sample_rate=3)
+        for i in range(12):
+            async_writer.submit(f"r{i}", 1)
+        
+        assert self.finish(writer, async_writer) == ["stall", "r5", "r8", "r11"]
+    
+    def test_byte_budget(self):
+        """Test that the byte budget bounds the queue independently of the record count."""
+        writer = GatedWriter()
+        async_writer = AsyncLogWriter(writer, format_record, max_queue_size=100, max_queue_bytes=10,
+                                      overload="drop-newest")
+        stall(async_writer, writer)
+        for i in range(5):
+            async_writer.submit(f"r{i}", 4)
+        
+        assert async_writer.stats()["queued_bytes"] == 8
+        assert self.finish(writer, async_writer) == ["stall", "r0", "r1"]
+    
+    def test_block(self):
+        """Test that block waits for room instead of dropping."""
+        writer, async_writer = self.make("block")
+        for i in range(3):
+            async_writer.submit(f"r{i}", 1)
+        
+        blocked = threading.Thread(target=async_writer.submit, args=("r3", 1))
+        blocked.start()
+        blocked.join(0.1)
+        assert blocked.is_alive()
+        
+        writer.gate.set()
+        blocked.join(5)
+        assert not blocked.is_alive()
+        assert async_writer.stats()["dropped_records"] == 0
+        assert self.finish(writer, async_writer) == ["stall", "r0", "r1", "r2", "r3"]
+    
+    def test_drop_summary(self):
+        """Test that a summary record reports the dropped records."""
+        writer, async_writer = self.make(
+            "drop-newest",
+            summary_record=lambda records, nbytes, seconds: f"dropped {records}/{nbytes}",
+            summary_interval=3600
+        )
+        for i in range(6):
+            async_writer.submit(f"r{i}", 5)
+        
+        assert self.finish(writer, async_writer)[-1] == "dropped 3/15"
+    
+    def test_invalid_overload(self):
+        """Test that an unknown overload policy is rejected."""
+        with pytest.raises(ValueError):
+            AsyncLogWriter(GatedWriter(), format_record, overload="explode")
+
+
+class TestIntervalFlush:
+    """Test suite for the "interval" flush policy after the last write."""
+    
+    def setup_method(self):
+        """Create a temporary log file path."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "app.log"
+    
+    def teardown_method(self):
+        """Remove the directory."""
+        self.temp_dir.cleanup()
+    
+    def test_flushed_in_background(self):
+        """Test that a writer with a lock is flushed once the interval passed, without another write."""
+        lock = threading.Lock()
+        writer = BufferedLogWriter(self.path, flush_policy="interval", flush_interval=0.5, lock=lock)
+        with lock:
+            writer.write(b"last\n")
+        assert self.path.read_bytes() == b""
+        
+        wait_for(lambda: self.path.read_bytes() == b"last\n")
+        assert writer.flush_if_due() is None
+        writer.close()
+    
+    def test_flushed_by_async_writer(self):
+        """Test that the async writer thread flushes its writer once the interval passed."""
+        writer = BufferedLogWriter(self.path, flush_policy="interval", flush_interval=0.5)
+        async_writer = AsyncLogWriter(writer, format_record)
+        async_writer.submit("last\n")
+        
+        wait_for(lambda: self.path.exists() and self.path.read_bytes() == b"last\n")
+        assert async_writer.stats()["write_errors"] == 0
+        async_writer.close()
+
+
+class TestMmapFile:
+    """Test suite for the memory-mapped log file writer."""
+    
+    def setup_method(self):
+        """Create a temporary log directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "mmap.log"
+    
+    def teardown_method(self):
+        """Remove the directory."""
+        self.temp_dir.cleanup()
+    
+    def test_preallocates_and_truncates_on_close(self):
+        """Test that the file is padded while open and has its real length after close."""
+        file = MmapFile(self.path)
+        file.write(b"first line\n")
+        file.write(b"second line\n")
+        
+        assert self.path.stat().st_size == file.chunk_size
+        assert self.path.read_bytes().startswith(b"first line\nsecond line\n\0")
+        file.close()
+        assert self.path.read_bytes() == b"first line\nsecond line\n"
+        with pytest.raises(ValueError):
+            file.write(b"late\n")
+    
+    def test_writes_across_chunks(self):
+        """Test records larger than a chunk and records spanning chunk boundaries."""
+        granularity = mmap.ALLOCATIONGRANULARITY
+        file = MmapFile(self.path, chunk_size=granularity)
+        chunks = [b"a" * 1000 + b"\n", b"b" * (granularity * 3) + b"\n", b"c" * (granularity - 7) + b"\n"] * 3
+        for chunk in chunks:
+            file.write(chunk)
+        assert file.tell() == sum(map(len, chunks))
+        file.close()
+        assert self.path.read_bytes() == b"".join(chunks)
+    
+    def test_appends_and_recovers_padded_file(self):
+        """Test that a file left padded by a crash is trimmed and appended to."""
+        file = MmapFile(self.path)
+        file.write(b"before crash\n")
+        # Simulate a crash: the mapping goes away without truncating the file
+        file._map.close()
+        file._map = None
+        os.close(file._fd)
+        assert self.path.stat().st_size > len(b"before crash\n")
+        
+        reopened = MmapFile(self.path)
+        reopened.write(b"after restart\n")
+        reopened.close()
+        assert self.path.read_bytes() == b"before crash\nafter restart\n"
+        assert recover_log_file(self.path) == len(b"before crash\nafter restart\n")
+    
+    def test_shared_between_writers(self):
+        """Test that writers of one path share the mapping until the last one closes."""
+        first = BufferedLogWriter(self.path, file_writer="mmap")
+        second = BufferedLogWriter(self.path, file_writer="mmap")
+        first.write(b"from the handler\n")
+        second.write(b"from the capture sink\n")
+        assert first._file is second._file
+        
+        first.close()
+        assert self.path.stat().st_size > 40
+        second.write(b"still open\n")
+        second.close()
+        assert self.path.read_bytes() == b"from the handler\nfrom the capture sink\nstill open\n"
+        
+        third = open_mmap_file(self.path)
+        assert third is not first._file
+        third.close()
+    
+    def test_refuses_file_open_elsewhere(self):
+        """Test that a second instance is refused while the first one keeps the file mapped."""
+        file = MmapFile(self.path)
+        file.write(b"mapped\n")
+        with pytest.raises(RuntimeError, match="already open in another process"):
+            MmapFile(self.path)
+        with pytest.raises(RuntimeError, match="cannot be trimmed"):
+            recover_log_file(self.path)
+        file.write(b"still mapped\n")
+        file.close()
+        assert self.path.read_bytes() == b"mapped\nstill mapped\n"
+    
+    def test_concurrent_writes(self):
+        """Test that concurrent writers never interleave inside a record."""
+        file = open_mmap_file(self.path, chunk_size=mmap.ALLOCATIONGRANULARITY)
+        
+        def write(label):
+            for i in range(2000):
+                file.write(b"%s %04d\n" % (label, i))
+        
+        threads = [threading.Thread(target=write, args=(label,)) for label in (b"a", b"b", b"c")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        file.close()
+        lines = self.path.read_bytes().splitlines()
+        assert len(lines) == 6000
+        assert all(len(line) == 6 for line in lines)
+    
+    def test_invalid_file_writer(self):
+        """Test that unknown file writers are rejected."""
+        with pytest.raises(ValueError, match="file_writer must be one of"):
+            BufferedLogWriter(self.path, file_writer="direct")